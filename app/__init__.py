@@ -6,26 +6,56 @@ from flask import Flask, jsonify, request
 from .config import get_config
 
 
-def create_app(config_class=None):
+def create_app(config_class=None, preload=False):
     """
     Application factory for creating Flask app instance
     
     Args:
         config_class: Configuration class to use (optional)
+        preload: The app is built in the gunicorn master before workers
+            fork (gunicorn.conf.py); the app is warmed up (PDF_WARM_UP)
+            and render pools are started by each worker after the fork
+            instead of here
     
     Returns:
         Flask application instance
     """
     app = Flask(__name__)
     
+    # Parse request bodies and encode jsonify responses with orjson when installed
+    from .utils.json_codec import FastJSONProvider
+    app.json = FastJSONProvider(app)
+    
     # Load configuration
     if config_class is None:
         config_class = get_config()
     app.config.from_object(config_class)
     
+    # gzip/brotli text responses; after_request hooks run in reverse order, so
+    # registering it before logging, tracing and metrics makes it run last, on
+    # the response that already carries their headers
+    from .compression import register_compression
+    register_compression(app)
+    
+    # Leveled text/JSON logs with request ids, written by a background thread
+    from .log import configure_logging, start_log_listener
+    configure_logging(app)
+    
+    # Span tree per request: Server-Timing header and slow request logs
+    from .tracing import register_tracing
+    register_tracing(app)
+    
     # Ensure upload folder exists
     os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
     
+    # Prometheus request/stage metrics at /metrics, summed over gunicorn workers
+    from .metrics import register_metrics
+    register_metrics(app)
+    
+    # asset_urls() template helper for the bundled CSS/JS (flask --app run build-assets)
+    from .assets import register_assets
+    register_assets(app)
+    
     # Register blueprints
     from .routes.main import main_bp
     from .routes.api import api_bp
@@ -37,6 +67,25 @@ def create_app(config_class=None):
     from .routes import legacy
     legacy.register_legacy_routes(app)
     
+    # Register CLI commands (flask --app run batch-pdf ...)
+    from .cli import register_cli
+    register_cli(app)
+    
+    # Start the log writer thread and warm PDF render processes (no-op unless
+    # PDF_RENDER_PROCESSES > 0); a preloading gunicorn master leaves that to
+    # the forked workers
+    if not preload:
+        start_log_listener()
+        from .services import pdf_service
+        pdf_service.start_render_pool()
+    
+    # Import heavy modules, compile templates, parse the CV CSS and register
+    # fonts in the gunicorn master before the fork, shared by all workers;
+    # run.py, tests and flask CLI commands pay these costs on first use
+    if preload and app.config.get('PDF_WARM_UP'):
+        from .warmup import warm_up
+        warm_up(app)
+    
     # ===== JSON ERROR HANDLERS =====
     # Return JSON responses for API errors instead of HTML
     
@@ -0,0 +1,595 @@
+"""
+Static Assets - Bundled, minified, content-hashed CSS/JS for the main page
+`flask --app run build-assets` concatenates and minifies the page stylesheets
+and scripts, trims Font Awesome to the icons the templates and scripts use,
+shrinks the favicon and writes everything under ASSETS_DIR with hashed names
+and precompressed .gz/.br copies. Templates ask asset_urls() for a bundle and
+get the source files instead when nothing has been built.
+"""
+import gzip
+import hashlib
+import io
+import json
+import logging
+import mimetypes
+import os
+import re
+import threading
+
+from flask import abort, request, send_file, url_for
+from werkzeug.security import safe_join
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+
+# Bundles in page order, paths relative to the static folder
+BUNDLES = {
+    'app.css': [
+        'vendor/css/bootstrap.min.css',
+        'vendor/css/fontawesome.min.css',
+        'css/main.css',
+        'css/modern-theme.css',
+    ],
+    'app.js': [
+        'vendor/js/bootstrap.bundle.min.js',
+        'js/utils.js',
+        'js/form.js',
+        'js/upload.js',
+        'js/preview.js',
+        'js/api.js',
+        'js/app.js',
+    ],
+}
+
+# Icons resized from favicon.png: logical name -> edge length in pixels
+ICON_SOURCE = 'favicon.png'
+ICON_SIZES = {'favicon.png': 64, 'apple-touch-icon.png': 180}
+
+# Stylesheet whose icon rules are trimmed to the icons in use
+ICON_FONT_CSS = 'vendor/css/fontawesome.min.css'
+
+MANIFEST_NAME = 'manifest.json'
+IMMUTABLE_MAX_AGE = 365 * 24 * 60 * 60
+
+# Precompressed siblings, in order of preference
+PRECOMPRESSED = (('br', '.br'), ('gzip', '.gz'))
+PRECOMPRESS_EXTENSIONS = ('.css', '.js', '.svg')
+
+
+class AssetManifest:
+    """Maps logical asset names to built files and serves them"""
+
+    def __init__(self, dist_dir: str, bundled: bool = True):
+        self.dist_dir = dist_dir
+        self.bundled = bundled
+        self._manifest = {}
+        self._mtime = None
+        self._lock = threading.Lock()
+
+    def urls(self, name: str) -> list:
+        """
+        Get the URLs to include for a logical asset
+
+        Args:
+            name: Bundle or icon name (app.css, app.js, favicon.png, ...)
+
+        Returns:
+            One hashed /assets/ URL when the asset is built, else the
+            static URLs of its source files
+        """
+        if self.bundled:
+            built = self._load().get(name)
+            if built:
+                return [url_for('main.asset', filename=built)]
+
+        if name in BUNDLES:
+            sources = BUNDLES[name]
+        elif name in ICON_SIZES:
+            sources = [ICON_SOURCE]
+        else:
+            sources = [name]
+        return [url_for('static', filename=path) for path in sources]
+
+    def send(self, filename: str):
+        """Send a built file, precompressed when the client accepts br or gzip"""
+        path = safe_join(self.dist_dir, filename)
+        if path is None or filename == MANIFEST_NAME or not os.path.isfile(path):
+            abort(404)
+
+        available = [encoding for encoding, suffix in PRECOMPRESSED if os.path.isfile(path + suffix)]
+        encoding = request.accept_encodings.best_match(available) if available else None
+        if encoding is not None and request.accept_encodings[encoding] == 0:
+            encoding = None
+
+        mimetype = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+        suffix = dict(PRECOMPRESSED)[encoding] if encoding else ''
+        response = send_file(path + suffix, mimetype=mimetype, max_age=IMMUTABLE_MAX_AGE)
+        if encoding:
+            response.headers['Content-Encoding'] = encoding
+        if available:
+            response.vary.add('Accept-Encoding')
+        response.cache_control.immutable = True
+        return response
+
+    def _load(self) -> dict:
+        """Read the manifest, again whenever build-assets rewrites it"""
+        path = os.path.join(self.dist_dir, MANIFEST_NAME)
+        try:
+            mtime = os.path.getmtime(path)
+        except OSError:
+            return {}
+
+        with self._lock:
+            if mtime != self._mtime:
+                try:
+                    with open(path, encoding='utf-8') as f:
+                        self._manifest = json.load(f).get('assets', {})
+                except (OSError, ValueError) as e:
+                    logger.warning("Could not read asset manifest: %s", e)
+                    self._manifest = {}
+                self._mtime = mtime
+            return self._manifest
+
+
+class AssetBuilder:
+    """Writes the bundles, subset fonts and icons into the dist directory"""
+
+    def __init__(self, static_folder: str, template_folder: str, dist_dir: str):
+        self.static_folder = static_folder
+        self.template_folder = template_folder
+        self.dist_dir = dist_dir
+        self.codepoints = set()
+        self.written = {}
+        self._copied = {}
+
+    def build(self) -> dict:
+        """
+        Build every bundle and icon
+
+        Returns:
+            Manifest dict with 'assets' (logical name -> file name) and
+            'files' (file name -> size, gzip and brotli sizes in bytes)
+        """
+        os.makedirs(self.dist_dir, exist_ok=True)
+        self.used_icons = self._used_icon_names()
+
+        assets = {
+            'app.css': self._write('app.css', self._css_bundle(BUNDLES['app.css']).encode('utf-8')),
+            'app.js': self._write('app.js', self._js_bundle(BUNDLES['app.js']).encode('utf-8')),
+        }
+        for name, size in ICON_SIZES.items():
+            assets[name] = self._write(name, self._icon(size))
+
+        manifest = {'assets': assets, 'files': self.written}
+        tmp_path = os.path.join(self.dist_dir, MANIFEST_NAME + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, os.path.join(self.dist_dir, MANIFEST_NAME))
+
+        self._prune()
+        return manifest
+
+    # ===== CSS =====
+
+    def _css_bundle(self, paths: list) -> str:
+        external_imports = []
+        parts = [self._css_file(path, external_imports) for path in paths]
+        # @import rules are only valid before all other rules
+        return minify_css('\n'.join(external_imports + parts))
+
+    def _css_file(self, path: str, external_imports: list) -> str:
+        """Read a stylesheet with local @imports inlined and url()s pointing into dist"""
+        full_path = os.path.join(self.static_folder, path)
+        with open(full_path, encoding='utf-8') as f:
+            css = _SOURCE_MAP.sub('', f.read())
+        css = _CHARSET.sub('', css)
+        if path == ICON_FONT_CSS:
+            css = self._subset_icon_css(minify_css(css))
+
+        base_dir = os.path.dirname(path)
+
+        def inline_import(match):
+            target = match.group(1)
+            if _is_external(target):
+                external_imports.append(match.group(0))
+                return ''
+            return self._css_file(os.path.normpath(os.path.join(base_dir, target)), external_imports)
+
+        def rewrite_url(match):
+            target = match.group(2)
+            if _is_external(target) or target.startswith('#'):
+                return match.group(0)
+            target_path = os.path.normpath(os.path.join(base_dir, target.split('?')[0].split('#')[0]))
+            return f'url({self._copy_referenced(target_path)})'
+
+        css = _CSS_IMPORT.sub(inline_import, css)
+        return _CSS_URL.sub(rewrite_url, css)
+
+    def _subset_icon_css(self, css: str) -> str:
+        """Drop icon rules nothing uses and remember the code points kept"""
+        kept = []
+        for prelude, body in _css_rules(css):
+            selectors = prelude.split(',')
+            icons = [_ICON_SELECTOR.match(selector) for selector in selectors]
+            if body is None or not all(icons) or 'content:' not in body:
+                kept.append(prelude + (f'{{{body}}}' if body is not None else ''))
+                continue
+
+            used = [sel for sel, icon in zip(selectors, icons) if icon.group(1) in self.used_icons]
+            if used:
+                kept.append(','.join(used) + f'{{{body}}}')
+                self.codepoints.update(_content_codepoints(body))
+        return ''.join(kept)
+
+    def _used_icon_names(self) -> set:
+        """Collect fa-* class names from the templates, scripts and app stylesheets"""
+        sources = []
+        for root, _, files in os.walk(self.template_folder):
+            sources += [os.path.join(root, name) for name in files if name.endswith('.html')]
+        for path in BUNDLES['app.js']:
+            if not path.startswith('vendor/'):
+                sources.append(os.path.join(self.static_folder, path))
+        sources += [os.path.join(self.static_folder, 'css', name)
+                    for name in os.listdir(os.path.join(self.static_folder, 'css'))]
+
+        names = set()
+        for path in sources:
+            with open(path, encoding='utf-8') as f:
+                names.update(_ICON_NAME.findall(f.read()))
+        return names
+
+    def _copy_referenced(self, path: str) -> str:
+        """Write a file referenced from CSS into dist, returning its URL relative to dist"""
+        if path in self._copied:
+            return self._copied[path]
+
+        full_path = os.path.join(self.static_folder, path)
+        if not os.path.isfile(full_path):
+            # Left pointing at the original location, as in the source CSS
+            return os.path.relpath(full_path, self.dist_dir).replace(os.sep, '/')
+
+        with open(full_path, 'rb') as f:
+            data = f.read()
+        if path.endswith('.woff2') and 'webfonts' in path:
+            data = self._subset_font(data, path)
+        self._copied[path] = self._write(os.path.basename(path), data)
+        return self._copied[path]
+
+    def _subset_font(self, data: bytes, path: str) -> bytes:
+        try:
+            # Build-time only dependency, not loaded by the app at startup
+            from fontTools import subset as font_subset
+        except ImportError:
+            logger.warning("fontTools is not installed, %s is copied without subsetting", path)
+            return data
+
+        options = font_subset.Options()
+        options.flavor = 'woff2'
+        options.layout_features = ['*']
+        try:
+            font = font_subset.load_font(io.BytesIO(data), options)
+            subsetter = font_subset.Subsetter(options)
+            subsetter.populate(unicodes=self.codepoints)
+            subsetter.subset(font)
+            output = io.BytesIO()
+            font_subset.save_font(font, output, options)
+        except Exception as e:
+            logger.warning("Could not subset %s, copied as is: %s", path, e)
+            return data
+        return output.getvalue()
+
+    # ===== JS =====
+
+    def _js_bundle(self, paths: list) -> str:
+        parts = []
+        for path in paths:
+            with open(os.path.join(self.static_folder, path), encoding='utf-8') as f:
+                source = _SOURCE_MAP.sub('', f.read())
+            parts.append(source.strip() if path.endswith('.min.js') else minify_js(source))
+        # Scripts may omit their final semicolon
+        return ';\n'.join(parts) + '\n'
+
+    # ===== Icons =====
+
+    def _icon(self, size: int) -> bytes:
+        from PIL import Image
+
+        with Image.open(os.path.join(self.static_folder, ICON_SOURCE)) as image:
+            image = image.convert('RGBA')
+            image.thumbnail((size, size), Image.LANCZOS)
+            output = io.BytesIO()
+            image.save(output, format='PNG', optimize=True)
+        return output.getvalue()
+
+    # ===== Output =====
+
+    def _write(self, name: str, data: bytes) -> str:
+        """Write data under a content-hashed name, with .gz/.br siblings for text"""
+        stem, ext = os.path.splitext(name)
+        filename = f"{stem}.{hashlib.sha256(data).hexdigest()[:10]}{ext}"
+        path = os.path.join(self.dist_dir, filename)
+        with open(path, 'wb') as f:
+            f.write(data)
+
+        sizes = {'size': len(data)}
+        if ext in PRECOMPRESS_EXTENSIONS:
+            sizes['gzip'] = _write_if_smaller(path + '.gz', gzip.compress(data, compresslevel=9, mtime=0), data)
+            if brotli is not None:
+                sizes['br'] = _write_if_smaller(path + '.br', brotli.compress(data, quality=11), data)
+        self.written[filename] = sizes
+        return filename
+
+    def _prune(self) -> None:
+        """Remove files of earlier builds"""
+        keep = {MANIFEST_NAME}
+        for filename in self.written:
+            keep.update([filename, filename + '.gz', filename + '.br'])
+        for entry in os.scandir(self.dist_dir):
+            if entry.is_file() and entry.name not in keep:
+                os.remove(entry.path)
+
+
+def _write_if_smaller(path: str, compressed: bytes, data: bytes) -> int | None:
+    if len(compressed) >= len(data):
+        return None
+    with open(path, 'wb') as f:
+        f.write(compressed)
+    return len(compressed)
+
+
+# ===== Minification =====
+
+_CSS_TOKEN = re.compile(r'("(?:\\.|[^"\\])*"|\'(?:\\.|[^\'\\])*\')|(/\*.*?\*/)', re.S)
+_CSS_IMPORT = re.compile(r'@import\s+(?:url\(\s*)?[\'"]?([^\'")\s]+)[\'"]?\s*\)?[^;]*;')
+_CSS_URL = re.compile(r'url\(\s*([\'"]?)([^\'")]+)\1\s*\)')
+_CHARSET = re.compile(r'@charset\s+[^;]+;')
+_SOURCE_MAP = re.compile(r'/[*/]# sourceMappingURL=[^\n]*')
+_ICON_SELECTOR = re.compile(r'^\.fa-([a-z0-9-]+)::?before$')
+_ICON_NAME = re.compile(r'\bfa-([a-z0-9-]+)')
+
+
+def minify_css(css: str) -> str:
+    """
+    Strip comments and redundant whitespace from CSS
+
+    Strings are left untouched and /*! license comments are kept.
+    """
+    parts = []
+    pos = 0
+    for match in _CSS_TOKEN.finditer(css):
+        parts.append(_squeeze_css(css[pos:match.start()]))
+        if match.group(1):
+            parts.append(match.group(1))
+        elif match.group(2).startswith('/*!'):
+            parts.append(match.group(2) + '\n')
+        pos = match.end()
+    parts.append(_squeeze_css(css[pos:]))
+    return ''.join(parts).strip()
+
+
+def _squeeze_css(text: str) -> str:
+    text = re.sub(r'\s+', ' ', text)
+    text = re.sub(r' ?([{};,>]) ?', r'\1', text)
+    return text.replace(': ', ':').replace(';}', '}')
+
+
+def _css_rules(css: str):
+    """Yield (prelude, body) of top-level rules; body is None for statements like @import"""
+    depth = 0
+    start = 0
+    body_start = None
+    quote = None
+    for pos, char in enumerate(css):
+        if quote:
+            if char == quote and css[pos - 1] != '\\':
+                quote = None
+        elif char in '"\'':
+            quote = char
+        elif char == '{':
+            if depth == 0:
+                body_start = pos
+            depth += 1
+        elif char == '}':
+            depth -= 1
+            if depth == 0:
+                yield css[start:body_start], css[body_start + 1:pos]
+                start = pos + 1
+        elif char == ';' and depth == 0:
+            yield css[start:pos + 1], None
+            start = pos + 1
+    if css[start:].strip():
+        yield css[start:], None
+
+
+def _content_codepoints(body: str) -> set:
+    """Code points of a content: "\\f0e0" declaration"""
+    match = re.search(r'content:\s*(["\'])(.*?)\1', body)
+    if not match:
+        return set()
+    value = match.group(2)
+    escapes = re.findall(r'\\([0-9a-fA-F]{1,6})', value)
+    if escapes:
+        return {int(code, 16) for code in escapes}
+    return {ord(char) for char in value}
+
+
+def _is_external(url: str) -> bool:
+    return url.startswith(('http:', 'https:', '//', 'data:'))
+
+
+# Characters after which a / starts a regular expression rather than a division
+_REGEX_PRECEDERS = set('(,=:[!&|?{};+-*%<>~^')
+_REGEX_KEYWORDS = {'return', 'typeof', 'case', 'do', 'else', 'in', 'of', 'new',
+                   'delete', 'void', 'throw', 'instanceof', 'yield', 'await'}
+_JS_WORD = re.compile(r'[\w$]+')
+_JS_STRING = re.compile(r'"(?:\\.|[^"\\\n])*"|\'(?:\\.|[^\'\\\n])*\'', re.S)
+
+
+def minify_js(source: str) -> str:
+    """
+    Strip comments, indentation and blank lines from JavaScript
+
+    Line breaks are kept so automatic semicolon insertion behaves as in
+    the source; strings, template literals and regular expressions are
+    copied verbatim.
+    """
+    return _JSMinifier(source).run()
+
+
+class _JSMinifier:
+    def __init__(self, source: str):
+        self.src = source
+        self.pos = 0
+        self.out = []
+        self.last = ''          # Last character written
+        self.significant = ''   # Last character written other than a line break
+        self.word = ''          # Last identifier or keyword written
+
+    def run(self) -> str:
+        self._code(until_brace=False)
+        return ''.join(self.out).strip() + '\n'
+
+    def _emit(self, text: str, word: str = '') -> None:
+        self.out.append(text)
+        self.last = text[-1]
+        if not text.isspace():
+            self.significant = text.rstrip()[-1]
+            self.word = word
+
+    def _code(self, until_brace: bool) -> None:
+        src = self.src
+        depth = 0
+        while self.pos < len(src):
+            char = src[self.pos]
+            if char.isspace() or src.startswith(('//', '/*'), self.pos):
+                self._whitespace()
+            elif char in '"\'':
+                match = _JS_STRING.match(src, self.pos)
+                end = match.end() if match else len(src)
+                self._emit(src[self.pos:end])
+                self.pos = end
+            elif char == '`':
+                self._template()
+            elif char == '/' and self._regex_allowed():
+                self._regex()
+            elif char == '_' or char == '$' or char.isalnum():
+                match = _JS_WORD.match(src, self.pos)
+                self._emit(match.group(0), match.group(0))
+                self.pos = match.end()
+            else:
+                if char == '{':
+                    depth += 1
+                elif char == '}':
+                    if until_brace and depth == 0:
+                        self._emit(char)
+                        self.pos += 1
+                        return
+                    depth -= 1
+                self._emit(char)
+                self.pos += 1
+
+    def _whitespace(self) -> None:
+        """Collapse a run of whitespace and comments to one newline, space or nothing"""
+        src = self.src
+        newline = False
+        while self.pos < len(src):
+            if src[self.pos].isspace():
+                newline = newline or src[self.pos] == '\n'
+                self.pos += 1
+            elif src.startswith('//', self.pos):
+                end = src.find('\n', self.pos)
+                self.pos = len(src) if end == -1 else end
+            elif src.startswith('/*', self.pos):
+                end = src.find('*/', self.pos + 2)
+                end = len(src) if end == -1 else end + 2
+                comment = src[self.pos:end]
+                self.pos = end
+                newline = newline or '\n' in comment
+                if comment.startswith('/*!'):
+                    self._emit(comment + '\n')
+                    newline = False
+            else:
+                break
+
+        if not self.out or self.pos >= len(src):
+            return
+        following = src[self.pos]
+        if newline:
+            if self.last != '\n':
+                self._emit('\n')
+        elif ((_is_word_char(self.last) and _is_word_char(following))
+              or (self.last in '+-/' and following == self.last)):
+            self._emit(' ')
+
+    def _regex_allowed(self) -> bool:
+        last = self.significant
+        return not last or last in _REGEX_PRECEDERS or self.word in _REGEX_KEYWORDS
+
+    def _regex(self) -> None:
+        src = self.src
+        pos = self.pos + 1
+        in_class = False
+        while pos < len(src):
+            char = src[pos]
+            if char == '\\':
+                pos += 2
+                continue
+            if char == '\n':
+                # Not a regular expression after all
+                self._emit('/')
+                self.pos += 1
+                return
+            if char == '[':
+                in_class = True
+            elif char == ']':
+                in_class = False
+            elif char == '/' and not in_class:
+                break
+            pos += 1
+        match = _JS_WORD.match(src, pos + 1)
+        end = match.end() if match else pos + 1
+        self._emit(src[self.pos:end])
+        self.pos = end
+
+    def _template(self) -> None:
+        """Copy a template literal, minifying the code inside ${...}"""
+        src = self.src
+        self._emit('`')
+        self.pos += 1
+        start = self.pos
+        while self.pos < len(src):
+            char = src[self.pos]
+            if char == '\\':
+                self.pos += 2
+            elif char == '`':
+                self._emit(src[start:self.pos + 1])
+                self.pos += 1
+                return
+            elif src.startswith('${', self.pos):
+                self._emit(src[start:self.pos + 2])
+                self.pos += 2
+                self._code(until_brace=True)
+                start = self.pos
+            else:
+                self.pos += 1
+        if start < len(src):
+            self._emit(src[start:])
+
+
+def _is_word_char(char: str) -> bool:
+    return char == '_' or char == '$' or char.isalnum()
+
+
+def register_assets(app) -> None:
+    """Expose asset_urls() to templates and keep the manifest in app.extensions"""
+    manifest = AssetManifest(
+        dist_dir=app.config['ASSETS_DIR'],
+        bundled=app.config.get('ASSETS_BUNDLED', True)
+    )
+    app.extensions['assets'] = manifest
+    app.jinja_env.globals['asset_urls'] = manifest.urls
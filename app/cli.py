@@ -0,0 +1,72 @@
+"""
+CLI Commands - Flask command line tools
+Run with: flask --app run <command>
+"""
+import json
+import os
+import sys
+import zipfile
+
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+
+from .assets import AssetBuilder
+from .services import pdf_batch_service
+from .services.pdf_batch import parse_cv_batch, MANIFEST_NAME
+
+
+@click.command('batch-pdf')
+@click.argument('input_file', type=click.File('rb'))
+@click.option('-o', '--output', 'output_path', default='cvs.zip', show_default=True,
+              help='ZIP archive to write')
+@click.option('-w', '--workers', type=int, default=None,
+              help='Concurrent renders (default: PDF_BATCH_WORKERS)')
+@with_appcontext
+def batch_pdf_command(input_file, output_path, workers):
+    """Render every CV in INPUT_FILE (JSON array or JSONL, - for stdin) into a ZIP"""
+    items, error = parse_cv_batch(input_file.read())
+    if error:
+        raise click.ClickException(error)
+    if not items:
+        raise click.ClickException('No CV data provided')
+
+    click.echo(f"Rendering {len(items)} CVs to {output_path}")
+    stream = pdf_batch_service.stream_zip(current_app._get_current_object(), items, workers=workers)
+    with open(output_path, 'wb') as output:
+        for chunk in stream:
+            output.write(chunk)
+
+    with zipfile.ZipFile(output_path) as archive:
+        manifest = json.loads(archive.read(MANIFEST_NAME))
+
+    for item in manifest['items']:
+        if not item['success']:
+            click.echo(f"  #{item['index']}: {item['error']}", err=True)
+    click.echo(f"{manifest['succeeded']} of {manifest['total']} CVs rendered")
+
+    if manifest['failed']:
+        sys.exit(1)
+
+
+@click.command('build-assets')
+@click.option('-o', '--output', 'output_dir', default=None,
+              help='Directory to write (default: ASSETS_DIR)')
+@with_appcontext
+def build_assets_command(output_dir):
+    """Bundle, minify and hash the page CSS/JS and icons for /assets/"""
+    output_dir = output_dir or current_app.config['ASSETS_DIR']
+    template_folder = os.path.join(current_app.root_path, current_app.template_folder)
+    manifest = AssetBuilder(current_app.static_folder, template_folder, output_dir).build()
+
+    for filename, sizes in sorted(manifest['files'].items()):
+        compressed = ', '.join(f"{encoding} {sizes[encoding] / 1024:.1f} KB"
+                               for encoding in ('gzip', 'br') if sizes.get(encoding))
+        click.echo(f"  {filename}: {sizes['size'] / 1024:.1f} KB" + (f" ({compressed})" if compressed else ''))
+    click.echo(f"{len(manifest['files'])} files written to {output_dir}")
+
+
+def register_cli(app) -> None:
+    """Attach the CLI commands to the application"""
+    app.cli.add_command(batch_pdf_command)
+    app.cli.add_command(build_assets_command)
@@ -0,0 +1,188 @@
+"""
+Response Compression - gzip/brotli encoding of text responses
+Compresses HTML, CSS, JS and JSON responses after the view runs, including
+streamed ones, and leaves PDFs, ZIPs and images (already compressed) alone
+"""
+import gzip
+import threading
+import time
+import zlib
+
+from flask import request
+from werkzeug.wsgi import ClosingIterator
+
+from .metrics import count_compression
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+DEFAULT_MIMETYPES = {
+    'text/html', 'text/css', 'text/plain', 'text/xml', 'text/javascript',
+    'application/javascript', 'application/json', 'application/xml', 'image/svg+xml'
+}
+
+
+class ResponseCompressor:
+    """after_request hook encoding allowlisted responses for the client"""
+
+    def __init__(self, mimetypes=None, min_size: int = 1024,
+                 gzip_level: int = 6, brotli_quality: int = 5):
+        self.mimetypes = set(mimetypes or DEFAULT_MIMETYPES)
+        self.min_size = min_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.encodings = ['br', 'gzip'] if brotli is not None else ['gzip']
+        self._lock = threading.Lock()
+        self.stats = {}
+
+    def __call__(self, response):
+        encoding = self._choose_encoding(response)
+        if encoding is None:
+            return response
+
+        response.vary.add('Accept-Encoding')
+        if response.is_streamed or response.direct_passthrough:
+            return self._compress_stream(response, encoding)
+        return self._compress_body(response, encoding)
+
+    def get_stats(self) -> dict:
+        """
+        Get wire size and CPU cost per encoding in this process
+
+        /metrics reports them for all workers (dreamcv_compression_*).
+
+        Returns:
+            Dict of encoding -> responses, bytes_in, bytes_out, ratio and
+            cpu_ms (compression CPU time summed over all responses)
+        """
+        with self._lock:
+            stats = {encoding: dict(values) for encoding, values in self.stats.items()}
+        for values in stats.values():
+            values['ratio'] = round(values['bytes_out'] / values['bytes_in'], 3) if values['bytes_in'] else None
+            values['cpu_ms'] = round(values['cpu_ms'], 1)
+        return stats
+
+    def _choose_encoding(self, response) -> str | None:
+        """Pick br or gzip, or None when the response should stay as it is"""
+        if (response.status_code < 200 or response.status_code in (204, 206, 304)
+                or request.method == 'HEAD'
+                or 'Content-Encoding' in response.headers
+                or response.mimetype not in self.mimetypes):
+            return None
+
+        length = response.content_length
+        if length is not None and length < self.min_size:
+            return None
+
+        encoding = request.accept_encodings.best_match(self.encodings)
+        if encoding is None or request.accept_encodings[encoding] == 0:
+            return None
+        return encoding
+
+    def _compress_body(self, response, encoding: str):
+        data = response.get_data()
+        if len(data) < self.min_size:
+            return response
+
+        started = time.thread_time()
+        if encoding == 'br':
+            compressed = brotli.compress(data, quality=self.brotli_quality)
+        else:
+            compressed = gzip.compress(data, compresslevel=self.gzip_level, mtime=0)
+        self._record(encoding, len(data), len(compressed), time.thread_time() - started)
+
+        if len(compressed) >= len(data):
+            return response
+
+        response.set_data(compressed)
+        response.headers['Content-Encoding'] = encoding
+        self._weaken_etag(response)
+        return response
+
+    def _compress_stream(self, response, encoding: str):
+        """Compress chunk by chunk, flushing so each chunk reaches the client"""
+        source = response.response
+        compressor = self._stream_compressor(encoding)
+
+        def generate():
+            bytes_in = bytes_out = 0
+            cpu = 0.0
+            for chunk in source:
+                if isinstance(chunk, str):
+                    chunk = chunk.encode('utf-8')
+                started = time.thread_time()
+                output = compressor.process(chunk) + compressor.flush()
+                cpu += time.thread_time() - started
+                bytes_in += len(chunk)
+                bytes_out += len(output)
+                if output:
+                    yield output
+            started = time.thread_time()
+            output = compressor.finish()
+            cpu += time.thread_time() - started
+            bytes_out += len(output)
+            self._record(encoding, bytes_in, bytes_out, cpu)
+            yield output
+
+        close = getattr(source, 'close', None)
+        response.response = ClosingIterator(generate(), [close] if close else [])
+        response.direct_passthrough = False
+        response.headers['Content-Encoding'] = encoding
+        response.headers.pop('Content-Length', None)
+        self._weaken_etag(response)
+        return response
+
+    def _stream_compressor(self, encoding: str):
+        if encoding == 'br':
+            return brotli.Compressor(quality=self.brotli_quality)
+        return _GzipStream(self.gzip_level)
+
+    def _weaken_etag(self, response) -> None:
+        """The encoded bytes differ from the identity bytes, so the ETag is only weak"""
+        etag, weak = response.get_etag()
+        if etag and not weak:
+            response.set_etag(etag, weak=True)
+
+    def _record(self, encoding: str, bytes_in: int, bytes_out: int, cpu_seconds: float) -> None:
+        with self._lock:
+            values = self.stats.setdefault(
+                encoding, {'responses': 0, 'bytes_in': 0, 'bytes_out': 0, 'cpu_ms': 0.0}
+            )
+            values['responses'] += 1
+            values['bytes_in'] += bytes_in
+            values['bytes_out'] += bytes_out
+            values['cpu_ms'] += cpu_seconds * 1000
+        count_compression(encoding, bytes_in, bytes_out, cpu_seconds)
+
+
+class _GzipStream:
+    """gzip stream with the same process/flush/finish interface as brotli.Compressor"""
+
+    def __init__(self, level: int):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def process(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush(zlib.Z_FINISH)
+
+
+def register_compression(app) -> None:
+    """Compress responses of this app according to the COMPRESS_* settings"""
+    if not app.config.get('COMPRESS_ENABLED', True):
+        return
+
+    compressor = ResponseCompressor(
+        min_size=app.config.get('COMPRESS_MIN_SIZE', 1024),
+        gzip_level=app.config.get('COMPRESS_GZIP_LEVEL', 6),
+        brotli_quality=app.config.get('COMPRESS_BROTLI_QUALITY', 5)
+    )
+    app.extensions['compression'] = compressor
+    app.after_request(compressor)
@@ -3,6 +3,7 @@ Configuration settings for DREAM CV Generator
 Production-ready configuration for Render deployment
 """
 import os
+import tempfile
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -24,12 +25,96 @@ class Config:
     MAX_CONTENT_LENGTH = int(os.getenv('MAX_CONTENT_LENGTH', 16 * 1024 * 1024))  # 16MB max
     ALLOWED_EXTENSIONS = {'png', 'jpg', 'jpeg'}  # GIF not allowed per test requirements
     RESUME_EXTENSIONS = {'pdf', 'doc', 'docx', 'txt'}
+    MAX_IMAGE_DIMENSION = int(os.getenv('MAX_IMAGE_DIMENSION', 10000))  # pixels, width or height
+    
+    # Resume text extraction settings
+    PDF_TEXT_QUALITY_THRESHOLD = float(os.getenv('PDF_TEXT_QUALITY_THRESHOLD', 0.6))  # 0-1
+    PDF_EXTRACTION_DEADLINE = float(os.getenv('PDF_EXTRACTION_DEADLINE', 10))  # seconds, then engines are killed
+    PDF_EXTRACTION_PROCESSES = int(os.getenv('PDF_EXTRACTION_PROCESSES', 3))  # fallback engines at once per worker
     
     # OpenRouter API settings
     OPENROUTER_API_KEY = os.getenv('OPENROUTER_API_KEY', '')
     OPENROUTER_BASE_URL = 'https://openrouter.ai/api/v1/chat/completions'
     MODEL_NAME = os.getenv('MODEL_NAME', 'openai/gpt-oss-20b:free')
     
+    # Rendered PDF cache settings (disk tier is shared by all gunicorn workers)
+    PDF_CACHE_ENABLED = os.getenv('PDF_CACHE_ENABLED', '1') == '1'
+    PDF_CACHE_DIR = os.getenv('PDF_CACHE_DIR', os.path.join(tempfile.gettempdir(), 'dreamcv-pdf-cache'))
+    PDF_CACHE_MEMORY_ITEMS = int(os.getenv('PDF_CACHE_MEMORY_ITEMS', 64))
+    PDF_CACHE_MEMORY_BYTES = int(os.getenv('PDF_CACHE_MEMORY_BYTES', 32 * 1024 * 1024))  # 32MB per worker
+    PDF_CACHE_DISK_BYTES = int(os.getenv('PDF_CACHE_DISK_BYTES', 256 * 1024 * 1024))  # 256MB shared
+    
+    # Lossless post-render PDF compression (can be overridden per request with ?optimize=)
+    PDF_OPTIMIZE = os.getenv('PDF_OPTIMIZE', '0') == '1'
+    
+    # PDF renderer: 'xhtml2pdf' (HTML template) or 'reportlab' (direct layout);
+    # can be overridden per request with ?backend=
+    PDF_BACKEND = os.getenv('PDF_BACKEND', 'xhtml2pdf')
+    
+    # Cost budget checked by /api/generate_pdf before rendering (0 disables a limit);
+    # over budget the request is warned about, trimmed or rejected
+    PDF_MAX_PAGES = int(os.getenv('PDF_MAX_PAGES', 4))
+    PDF_MAX_RENDER_MS = int(os.getenv('PDF_MAX_RENDER_MS', 0))  # estimated xhtml2pdf time
+    PDF_BUDGET_ACTION = os.getenv('PDF_BUDGET_ACTION', 'warn')  # warn, trim or reject
+    
+    # Response compression of HTML/CSS/JS/JSON (PDFs and images are never compressed)
+    COMPRESS_ENABLED = os.getenv('COMPRESS_ENABLED', '1') == '1'
+    COMPRESS_MIN_SIZE = int(os.getenv('COMPRESS_MIN_SIZE', 1024))  # bytes
+    COMPRESS_GZIP_LEVEL = int(os.getenv('COMPRESS_GZIP_LEVEL', 6))
+    COMPRESS_BROTLI_QUALITY = int(os.getenv('COMPRESS_BROTLI_QUALITY', 5))  # used when Brotli is installed
+    
+    # Bundled, hashed CSS/JS/icons written by `flask --app run build-assets`;
+    # the page falls back to the source files when nothing has been built
+    ASSETS_DIR = os.getenv('ASSETS_DIR', os.path.join(os.path.dirname(__file__), 'static', 'dist'))
+    ASSETS_BUNDLED = os.getenv('ASSETS_BUNDLED', '1') == '1'  # 0 serves the source files while editing them
+    
+    # Logging: level, 'text' or 'json' lines, and the share of DEBUG records
+    # kept (sampled per request); records beyond LOG_QUEUE_SIZE are dropped
+    LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
+    LOG_FORMAT = os.getenv('LOG_FORMAT', 'text')
+    LOG_DEBUG_SAMPLE_RATE = float(os.getenv('LOG_DEBUG_SAMPLE_RATE', 1.0))  # 0-1
+    LOG_QUEUE_SIZE = int(os.getenv('LOG_QUEUE_SIZE', 10000))
+    
+    # Server-Timing header with the request's span durations (tracing.py), and
+    # a warning with the full span tree for requests slower than SLOW_REQUEST_MS
+    SERVER_TIMING_ENABLED = os.getenv('SERVER_TIMING_ENABLED', '1') == '1'
+    SLOW_REQUEST_MS = int(os.getenv('SLOW_REQUEST_MS', 3000))  # 0 disables the log
+    
+    # Prometheus metrics at /metrics (gunicorn.conf.py sets PROMETHEUS_MULTIPROC_DIR)
+    METRICS_ENABLED = os.getenv('METRICS_ENABLED', '1') == '1'
+    
+    # Profile photo normalization before PDF embedding
+    PHOTO_PRINT_DPI = int(os.getenv('PHOTO_PRINT_DPI', 300))
+    PHOTO_JPEG_QUALITY = int(os.getenv('PHOTO_JPEG_QUALITY', 85))
+    PHOTO_CACHE_ITEMS = int(os.getenv('PHOTO_CACHE_ITEMS', 128))  # normalized photos kept per worker
+    
+    # Uploaded photos, stored once and referenced by id (shared by all workers)
+    PHOTO_STORE_DIR = os.getenv('PHOTO_STORE_DIR', os.path.join(tempfile.gettempdir(), 'dreamcv-photos'))
+    PHOTO_STORE_TTL = int(os.getenv('PHOTO_STORE_TTL', 24 * 60 * 60))  # seconds since last use
+    
+    # Rendered CV section HTML kept per worker, reused when a section's data is unchanged
+    CV_FRAGMENT_CACHE_ITEMS = int(os.getenv('CV_FRAGMENT_CACHE_ITEMS', 512))
+    
+    # Pay import/template/CSS/font set-up costs in the gunicorn master before the
+    # fork instead of on the first requests (create_app(preload=True) only)
+    PDF_WARM_UP = os.getenv('PDF_WARM_UP', '1') == '1'
+    
+    # PDF render pool settings (0 processes = render on the request thread)
+    PDF_RENDER_PROCESSES = int(os.getenv('PDF_RENDER_PROCESSES', 0))
+    PDF_RENDER_QUEUE_SIZE = int(os.getenv('PDF_RENDER_QUEUE_SIZE', 8))  # renders waiting for a process
+    PDF_RENDER_QUEUE_TIMEOUT = float(os.getenv('PDF_RENDER_QUEUE_TIMEOUT', 5))  # seconds before 503
+    PDF_RENDER_TIMEOUT = float(os.getenv('PDF_RENDER_TIMEOUT', 30))  # seconds per render
+    
+    # Asynchronous PDF job settings (job files are shared by all workers)
+    PDF_JOB_DIR = os.getenv('PDF_JOB_DIR', os.path.join(tempfile.gettempdir(), 'dreamcv-pdf-jobs'))
+    PDF_JOB_WORKERS = int(os.getenv('PDF_JOB_WORKERS', 2))  # render threads per worker
+    PDF_JOB_QUEUE_SIZE = int(os.getenv('PDF_JOB_QUEUE_SIZE', 32))  # jobs waiting per worker
+    PDF_JOB_TTL = int(os.getenv('PDF_JOB_TTL', 600))  # seconds results are kept
+    
+    # Batch PDF generation (cohort ZIP downloads)
+    PDF_BATCH_MAX_ITEMS = int(os.getenv('PDF_BATCH_MAX_ITEMS', 200))
+    PDF_BATCH_WORKERS = int(os.getenv('PDF_BATCH_WORKERS', 2))  # concurrent renders per batch
+    
     # LLM settings
     LLM_TEMPERATURE = 0.7
     LLM_MAX_TOKENS = 4000
@@ -39,11 +124,13 @@ class Config:
 class DevelopmentConfig(Config):
     """Development configuration"""
     DEBUG = True
+    LOG_LEVEL = os.getenv('LOG_LEVEL', 'DEBUG')
 
 
 class ProductionConfig(Config):
     """Production configuration"""
     DEBUG = False
+    LOG_FORMAT = os.getenv('LOG_FORMAT', 'json')
 
 
 class TestingConfig(Config):
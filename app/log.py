@@ -0,0 +1,195 @@
+"""
+Logging - Leveled, request-tagged log records written off the request thread
+Modules log through logging.getLogger(__name__); configure_logging routes the
+'app' logger to stderr as text or one JSON object per line, through a queue
+drained by a background thread once start_log_listener has run
+"""
+import atexit
+import copy
+import logging
+import os
+import queue
+import random
+import re
+import sys
+import uuid
+import zlib
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+
+from flask import g, has_request_context, request
+
+from .utils import json_codec
+
+
+TEXT_FORMAT = '%(asctime)s %(levelname)s [%(request_id)s] %(name)s: %(message)s'
+
+# Accepted from a proxy's X-Request-ID header; anything else gets a fresh id
+REQUEST_ID_PATTERN = re.compile(r'^[A-Za-z0-9._-]{1,64}$')
+
+# LogRecord attributes that are not extra= fields
+_RECORD_ATTRS = set(vars(logging.makeLogRecord({}))) | {'message', 'asctime', 'request_id'}
+
+
+class RequestIdFilter(logging.Filter):
+    """Tags records with the id of the request being handled ('-' outside requests)"""
+
+    def filter(self, record) -> bool:
+        record.request_id = g.get('request_id', '-') if has_request_context() else '-'
+        return True
+
+
+class DebugSampler(logging.Filter):
+    """
+    Keeps a fraction of DEBUG records
+
+    Sampling is decided per request id, so a request keeps all or none of
+    its debug lines. INFO and above always pass.
+    """
+
+    def __init__(self, rate: float = 1.0):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record) -> bool:
+        if record.levelno > logging.DEBUG or self.rate >= 1:
+            return True
+        request_id = getattr(record, 'request_id', '-')
+        if request_id != '-':
+            return zlib.crc32(request_id.encode('utf-8')) % 10000 < self.rate * 10000
+        return random.random() < self.rate
+
+
+class JSONFormatter(logging.Formatter):
+    """One JSON object per line, including extra= fields and tracebacks"""
+
+    def format(self, record) -> str:
+        entry = {
+            'time': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+            'request_id': getattr(record, 'request_id', '-'),
+            'pid': record.process,
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS:
+                entry[key] = value
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry['exception'] = record.exc_text
+        return json_codec.dumps(entry, default=str).decode('utf-8')
+
+
+class QueueLogHandler(QueueHandler):
+    """
+    Hands records to a listener thread that writes them to the target handler
+
+    Until start() runs in this process (a preloading gunicorn master must
+    not start threads) records are written directly. A full queue drops
+    records instead of blocking the request.
+    """
+
+    def __init__(self, target: logging.Handler, maxsize: int = 10000):
+        super().__init__(queue.Queue(maxsize))
+        self.target = target
+        self.dropped = 0
+        self._listener = None
+        self._pid = None
+
+    def start(self) -> None:
+        """Start the listener thread of this process"""
+        if self._listener is not None and self._pid == os.getpid():
+            return
+        # A queue inherited through fork may hold a lock of the parent's listener
+        self.queue = queue.Queue(self.queue.maxsize)
+        self._listener = QueueListener(self.queue, self.target, respect_handler_level=True)
+        self._listener.start()
+        self._pid = os.getpid()
+        atexit.register(self.stop)
+
+    def stop(self) -> None:
+        """Write out queued records and stop the listener thread"""
+        if self._listener is not None and self._pid == os.getpid():
+            self._listener.stop()
+        self._listener = None
+
+    def emit(self, record) -> None:
+        if self._listener is None or self._pid != os.getpid():
+            self.target.handle(record)
+            return
+        super().emit(record)
+
+    def enqueue(self, record) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def prepare(self, record):
+        """Merge args into the message and render the traceback, keeping both fields"""
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        record.exc_info = None
+        return record
+
+
+def configure_logging(app) -> QueueLogHandler:
+    """
+    Route the 'app' loggers according to the LOG_* settings
+
+    Safe to call for every app created in a process: the handler is
+    installed once and reconfigured.
+
+    Args:
+        app: Flask application
+
+    Returns:
+        The queue handler (also in app.extensions['logging'])
+    """
+    logger = logging.getLogger('app')
+    logger.setLevel(app.config.get('LOG_LEVEL', 'INFO').upper())
+    logger.propagate = False
+
+    handler = next((h for h in logger.handlers if isinstance(h, QueueLogHandler)), None)
+    if handler is None:
+        handler = QueueLogHandler(logging.StreamHandler(sys.stderr), app.config.get('LOG_QUEUE_SIZE', 10000))
+        handler.addFilter(RequestIdFilter())
+        handler.addFilter(DebugSampler())
+        logger.addHandler(handler)
+
+    if app.config.get('LOG_FORMAT', 'text') == 'json':
+        handler.target.setFormatter(JSONFormatter())
+    else:
+        handler.target.setFormatter(logging.Formatter(TEXT_FORMAT))
+    for log_filter in handler.filters:
+        if isinstance(log_filter, DebugSampler):
+            log_filter.rate = app.config.get('LOG_DEBUG_SAMPLE_RATE', 1.0)
+
+    app.extensions['logging'] = handler
+    app.before_request(_assign_request_id)
+    app.after_request(_send_request_id)
+    return handler
+
+
+def start_log_listener() -> None:
+    """Start writing log records from a background thread in this process"""
+    for handler in logging.getLogger('app').handlers:
+        if isinstance(handler, QueueLogHandler):
+            handler.start()
+
+
+def _assign_request_id() -> None:
+    request_id = request.headers.get('X-Request-ID', '')
+    g.request_id = request_id if REQUEST_ID_PATTERN.match(request_id) else uuid.uuid4().hex
+
+
+def _send_request_id(response):
+    if 'request_id' in g:
+        response.headers['X-Request-ID'] = g.request_id
+    return response
@@ -0,0 +1,247 @@
+"""
+Metrics - Prometheus request, stage, error, cache and compression metrics served at /metrics
+Under gunicorn.conf.py every worker and render process writes its samples to
+PROMETHEUS_MULTIPROC_DIR and /metrics adds them up, so whichever worker
+answers reports for the whole server
+"""
+import logging
+import os
+import time
+from contextlib import contextmanager
+
+from flask import Response, g, request
+
+from .tracing import span
+
+try:
+    import prometheus_client
+    from prometheus_client import multiprocess
+except ImportError:
+    prometheus_client = None
+
+logger = logging.getLogger(__name__)
+
+
+# Legacy URLs and alias endpoints are reported under the endpoint they duplicate
+ROUTE_ALIASES = {
+    # Routes without the /api prefix (routes/legacy.py)
+    'legacy_upload_photo': 'api.upload_photo',
+    'legacy_photo_upload': 'api.upload_photo',
+    'legacy_photo_upload_hyphen': 'api.upload_photo',
+    'legacy_photo_upload_underscore': 'api.upload_photo',
+    'legacy_format_section': 'api.format_section',
+    'legacy_format_section_slash': 'api.format_section',
+    'legacy_format_section_hyphen': 'api.format_section',
+    'legacy_get_suggestions': 'api.get_suggestions',
+    'legacy_suggestions': 'api.get_suggestions',
+    'legacy_parse_resume': 'api.parse_resume',
+    'legacy_parse_resume_hyphen': 'api.parse_resume',
+    'legacy_resume_parse': 'api.parse_resume',
+    'legacy_format_natural_language': 'api.format_natural_language',
+    'legacy_generate_pdf': 'api.generate_pdf',
+    'legacy_generate_pdf_hyphen': 'api.generate_pdf',
+    'legacy_pdf_generate': 'api.generate_pdf',
+    'legacy_generate_career_objective': 'api.generate_career_objective',
+    'legacy_generate_career_objective_hyphen': 'api.generate_career_objective',
+    'legacy_career_objective': 'api.generate_career_objective',
+    'legacy_career_objective_underscore': 'api.generate_career_objective',
+    'legacy_generate_planned_skills': 'api.generate_planned_skills',
+    'legacy_generate_planned_skills_hyphen': 'api.generate_planned_skills',
+    'legacy_planned_skills': 'api.generate_planned_skills',
+    'legacy_planned_skills_underscore': 'api.generate_planned_skills',
+    'legacy_planned_skills_suggestions': 'api.generate_planned_skills',
+    # Alias routes in the API blueprint (routes/api.py)
+    'api.photo_upload_alias': 'api.upload_photo',
+    'api.photo_upload_underscore_alias': 'api.upload_photo',
+    'api.format_section_alias': 'api.format_section',
+    'api.suggestions_alias': 'api.get_suggestions',
+    'api.pdf_generate_alias': 'api.generate_pdf',
+    'api.career_objective_alias': 'api.generate_career_objective',
+    'api.planned_skills_alias': 'api.generate_planned_skills',
+    'api.planned_skills_suggestions_alias': 'api.generate_planned_skills',
+}
+
+# Seconds; spans template renders (milliseconds) to LLM calls (up to LLM_TIMEOUT)
+BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+if prometheus_client is not None:
+    REQUESTS = prometheus_client.Counter(
+        'dreamcv_http_requests_total', 'HTTP requests by canonical route, method and status',
+        ['route', 'method', 'status']
+    )
+    REQUEST_SECONDS = prometheus_client.Histogram(
+        'dreamcv_http_request_duration_seconds', 'Time to build the response, by canonical route',
+        ['route', 'method'], buckets=BUCKETS
+    )
+    REQUESTS_IN_FLIGHT = prometheus_client.Gauge(
+        'dreamcv_http_requests_in_flight', 'Requests being handled, by canonical route',
+        ['route'], multiprocess_mode='livesum'
+    )
+    REQUEST_EXCEPTIONS = prometheus_client.Counter(
+        'dreamcv_http_exceptions_total', 'Unhandled exceptions raised while handling a request',
+        ['route']
+    )
+    STAGE_SECONDS = prometheus_client.Histogram(
+        'dreamcv_stage_duration_seconds', 'Duration of a processing stage',
+        ['stage'], buckets=BUCKETS
+    )
+    STAGES_IN_FLIGHT = prometheus_client.Gauge(
+        'dreamcv_stages_in_flight', 'Processing stages currently running',
+        ['stage'], multiprocess_mode='livesum'
+    )
+    STAGE_ERRORS = prometheus_client.Counter(
+        'dreamcv_stage_errors_total', 'Processing stages that raised an exception',
+        ['stage']
+    )
+    UPLOAD_REJECTIONS = prometheus_client.Counter(
+        'dreamcv_upload_rejections_total', 'Uploads rejected by content sniffing, by reason',
+        ['reason']
+    )
+    PDF_CACHE_LOOKUPS = prometheus_client.Counter(
+        'dreamcv_pdf_cache_lookups_total', 'Rendered PDF cache lookups by result (memory_hit, disk_hit, miss)',
+        ['result']
+    )
+    FRAGMENT_CACHE_LOOKUPS = prometheus_client.Counter(
+        'dreamcv_fragment_cache_lookups_total', 'CV section fragment cache lookups by section and result',
+        ['section', 'result']
+    )
+    COMPRESSED_RESPONSES = prometheus_client.Counter(
+        'dreamcv_compressed_responses_total', 'Responses compressed, by encoding',
+        ['encoding']
+    )
+    COMPRESSION_BYTES_IN = prometheus_client.Counter(
+        'dreamcv_compression_bytes_in_total', 'Response bytes before compression, by encoding',
+        ['encoding']
+    )
+    COMPRESSION_BYTES_OUT = prometheus_client.Counter(
+        'dreamcv_compression_bytes_out_total', 'Response bytes sent after compression, by encoding',
+        ['encoding']
+    )
+    COMPRESSION_CPU_SECONDS = prometheus_client.Counter(
+        'dreamcv_compression_cpu_seconds_total', 'CPU time spent compressing responses, by encoding',
+        ['encoding']
+    )
+
+
+@contextmanager
+def stage(name: str):
+    """
+    Time a processing stage and count it as failed if it raises
+
+    Stages: text_extraction, llm_call, json_repair, preprocess,
+    template_render and pisa_create_pdf. Each is also a span of the
+    request trace (tracing.py).
+
+    Args:
+        name: Stage label value
+    """
+    if prometheus_client is None:
+        with span(name):
+            yield
+        return
+
+    in_flight = STAGES_IN_FLIGHT.labels(name)
+    in_flight.inc()
+    started = time.perf_counter()
+    try:
+        with span(name):
+            yield
+    except Exception:
+        STAGE_ERRORS.labels(name).inc()
+        raise
+    finally:
+        STAGE_SECONDS.labels(name).observe(time.perf_counter() - started)
+        in_flight.dec()
+
+
+def count_upload_rejection(reason: str) -> None:
+    """Count an upload rejected by file_signatures.inspect_upload"""
+    if prometheus_client is not None:
+        UPLOAD_REJECTIONS.labels(reason).inc()
+
+
+def count_pdf_cache_lookup(result: str) -> None:
+    """Count a PDFCache lookup: 'memory_hit', 'disk_hit' or 'miss'"""
+    if prometheus_client is not None:
+        PDF_CACHE_LOOKUPS.labels(result).inc()
+
+
+def count_fragment_lookup(section: str, hit: bool) -> None:
+    """Count a FragmentCache lookup of one CV section"""
+    if prometheus_client is not None:
+        FRAGMENT_CACHE_LOOKUPS.labels(section, 'hit' if hit else 'miss').inc()
+
+
+def count_compression(encoding: str, bytes_in: int, bytes_out: int, cpu_seconds: float) -> None:
+    """Count a compressed response, its sizes and the CPU time it took"""
+    if prometheus_client is not None:
+        COMPRESSED_RESPONSES.labels(encoding).inc()
+        COMPRESSION_BYTES_IN.labels(encoding).inc(bytes_in)
+        COMPRESSION_BYTES_OUT.labels(encoding).inc(bytes_out)
+        COMPRESSION_CPU_SECONDS.labels(encoding).inc(cpu_seconds)
+
+
+def forget_process(pid: int) -> None:
+    """Drop the in-flight gauges of a killed process (a render process past its timeout)"""
+    if prometheus_client is not None and 'PROMETHEUS_MULTIPROC_DIR' in os.environ:
+        multiprocess.mark_process_dead(pid)
+
+
+def route_name(endpoint: str | None) -> str:
+    """Canonical route label for a Flask endpoint ('unmatched' for 404/405)"""
+    if endpoint is None:
+        return 'unmatched'
+    return ROUTE_ALIASES.get(endpoint, endpoint)
+
+
+def collect() -> bytes:
+    """Render all metrics in the Prometheus text format"""
+    if 'PROMETHEUS_MULTIPROC_DIR' in os.environ:
+        registry = prometheus_client.CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = prometheus_client.REGISTRY
+    return prometheus_client.generate_latest(registry)
+
+
+def metrics():
+    """Prometheus scrape endpoint"""
+    return Response(collect(), content_type=prometheus_client.CONTENT_TYPE_LATEST)
+
+
+def _start_request() -> None:
+    g.metrics_route = route_name(request.endpoint)
+    g.metrics_started = time.perf_counter()
+    REQUESTS_IN_FLIGHT.labels(g.metrics_route).inc()
+
+
+def _record_status(response):
+    g.metrics_status = response.status_code
+    return response
+
+
+def _finish_request(exc) -> None:
+    """Runs for every request, including ones whose view raised"""
+    route = g.pop('metrics_route', None)
+    if route is None:
+        return
+
+    REQUESTS_IN_FLIGHT.labels(route).dec()
+    REQUEST_SECONDS.labels(route, request.method).observe(time.perf_counter() - g.metrics_started)
+    REQUESTS.labels(route, request.method, str(g.get('metrics_status', 500))).inc()
+    if exc is not None:
+        REQUEST_EXCEPTIONS.labels(route).inc()
+
+
+def register_metrics(app) -> None:
+    """Record request metrics for this app and serve /metrics (METRICS_ENABLED)"""
+    if not app.config.get('METRICS_ENABLED', True):
+        return
+    if prometheus_client is None:
+        logger.warning("prometheus_client is not installed, /metrics is disabled")
+        return
+
+    app.before_request(_start_request)
+    app.after_request(_record_status)
+    app.teardown_request(_finish_request)
+    app.add_url_rule('/metrics', 'metrics', metrics)
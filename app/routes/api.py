@@ -4,22 +4,35 @@ API Routes - API endpoints for CV operations
 import os
 import uuid
 import base64
-from flask import Blueprint, request, jsonify, send_file, current_app
+import logging
+from flask import Blueprint, request, jsonify, send_file, current_app, Response, url_for
 from werkzeug.utils import secure_filename
 
-from ..services import llm_service, pdf_service, resume_parser
+from ..services import (
+    llm_service, pdf_service, pdf_job_service, pdf_batch_service, photo_store, resume_parser
+)
+from ..services.pdf_batch import parse_cv_batch
+from ..services.pdf_estimator import apply_budget, estimate_cv, over_budget
+from ..services.render_pool import RenderPoolBusyError
+from ..tracing import span
 from ..utils.file_handlers import (
     allowed_file, 
     allowed_resume_file, 
-    extract_text_from_file
+    extract_text_from_file,
+    read_image_upload
 )
+from ..utils.file_signatures import UnsupportedFileError
+from ..utils import json_codec
+from ..utils.helpers import validate_cv_data
 
 api_bp = Blueprint('api', __name__)
 
+logger = logging.getLogger(__name__)
+
 
 @api_bp.route('/upload_photo', methods=['POST'])
 def upload_photo():
-    """Handle photo upload for CV - returns base64 encoded image for in-memory use"""
+    """Handle photo upload for CV - stores the image and returns its short photo id"""
     if 'photo' not in request.files:
         return jsonify({'success': False, 'error': 'No photo uploaded'}), 400
     
@@ -35,29 +48,42 @@ def upload_photo():
         }), 400
     
     try:
-        # Read file content into memory
-        file_content = file.read()
+        # Read file content into memory and verify it really is an image
+        file_content, result = read_image_upload(file)
         
-        # Get MIME type based on extension
-        filename = file.filename.lower()
-        if filename.endswith('.png'):
-            mime_type = 'image/png'
-        else:
-            mime_type = 'image/jpeg'
+        if file_content is None:
+            return jsonify({'success': False, 'error': result}), 400
         
-        # Convert to base64 data URL for in-memory use
-        base64_data = base64.b64encode(file_content).decode('utf-8')
-        data_url = f"data:{mime_type};base64,{base64_data}"
+        mime_type = result  # result contains the detected MIME type
+        
+        # Store once; PDF requests then reference the photo by id instead of
+        # posting the image back as a base64 data URL
+        photo_id = photo_store.put(file_content, mime_type)
         
         return jsonify({
             'success': True, 
-            'photo_url': data_url,
-            'is_base64': True
+            'photo_id': photo_id,
+            'photo_url': url_for('api.get_photo', photo_id=photo_id),
+            'is_base64': False
         })
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
 
+@api_bp.route('/photos/<photo_id>', methods=['GET'])
+def get_photo(photo_id):
+    """Serve a stored photo; ids are content hashes, so responses never change"""
+    stored = photo_store.get(photo_id)
+    if stored is None:
+        return jsonify({'success': False, 'error': 'Photo not found or expired'}), 404
+    
+    image_bytes, mime_type = stored
+    response = Response(image_bytes, mimetype=mime_type)
+    response.set_etag(photo_id)
+    response.headers['Cache-Control'] = 'private, max-age=86400, immutable'
+    return response
+
+
 @api_bp.route('/format_section', methods=['POST'])
 def format_section():
     """Format a CV section using AI"""
@@ -91,11 +117,12 @@ def get_suggestions():
 def parse_resume():
     """Parse uploaded resume file using AI with DREAM context"""
     # Accept both 'resume' and 'file' field names for compatibility
-    file = None
-    if 'resume' in request.files:
-        file = request.files['resume']
-    elif 'file' in request.files:
-        file = request.files['file']
+    with span('read_request'):
+        file = None
+        if 'resume' in request.files:
+            file = request.files['resume']
+        elif 'file' in request.files:
+            file = request.files['file']
     
     if file is None:
         return jsonify({
@@ -119,8 +146,7 @@ def parse_resume():
     dream_context = {}
     dream_context_str = request.form.get('dream_context', '{}')
     try:
-        import json
-        dream_context = json.loads(dream_context_str)
+        dream_context = json_codec.loads(dream_context_str)
     except:
         dream_context = {}
     
@@ -144,9 +170,15 @@ def parse_resume():
                 'success': False,
                 'error': 'Failed to parse resume content'
             }), 500
+    
+    except UnsupportedFileError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
             
     except Exception as e:
-        print(f"[ERROR] Resume parsing error: {e}")
+        logger.exception("Resume parsing error: %s", e)
         return jsonify({
             'success': False,
             'error': f'Error processing file: {str(e)}'
@@ -179,43 +211,47 @@ def format_natural_language():
 
 @api_bp.route('/generate_pdf', methods=['POST'])
 def generate_pdf():
-    """Generate PDF CV from form data"""
+    """Generate PDF CV from form data (JSON, or multipart with a binary photo)"""
     try:
-        cv_data = request.json
-        
-        if not cv_data:
+        cv_data, photo, request_error = _read_pdf_request()
+        if request_error:
             return jsonify({
                 'success': False,
-                'error': 'No CV data provided'
+                'error': request_error
             }), 400
         
-        # Validate required fields
-        full_name = cv_data.get('full_name', cv_data.get('personal_info', {}).get('first_name', ''))
-        email = cv_data.get('email', cv_data.get('personal_info', {}).get('email', ''))
-        
-        # Basic email validation
-        if email and not isinstance(email, str):
+        if not cv_data:
             return jsonify({
                 'success': False,
-                'error': 'Invalid email format'
+                'error': 'No CV data provided'
             }), 400
         
-        if email and '@' not in email:
+        validation_error = validate_cv_data(cv_data)
+        if validation_error:
             return jsonify({
                 'success': False,
-                'error': 'Invalid email format'
+                'error': validation_error
             }), 400
         
-        # Check for required sections
-        sections = cv_data.get('sections')
-        if sections is not None and not isinstance(sections, (dict, list)):
-            return jsonify({
-                'success': False,
-                'error': 'Invalid sections format'
-            }), 400
+        optimize = _optimize_requested()
+        backend = _backend_requested()
+        if backend not in pdf_service.backends:
+            return _unknown_backend(backend)
+        
+        # Check the predicted size before committing CPU to the render
+        cv_data, budget_headers, budget_error = _apply_cost_budget(cv_data)
+        if budget_error:
+            return budget_error
+        
+        # Identical CV content renders to identical bytes, so the client can
+        # revalidate a previous download with If-None-Match
+        with span('etag'):
+            etag = pdf_service.cache_key(cv_data, optimize, backend, photo)
+        if request.if_none_match.contains_weak(etag):
+            return _not_modified(etag)
         
         # Generate PDF
-        pdf_buffer, result = pdf_service.generate(cv_data)
+        pdf_buffer, result = pdf_service.generate(cv_data, optimize, backend, photo)
         
         if pdf_buffer is None:
             return jsonify({
@@ -224,23 +260,323 @@ def generate_pdf():
             }), 500
         
         # Send PDF file
-        return send_file(
+        response = send_file(
             pdf_buffer,
             mimetype='application/pdf',
             as_attachment=True,
-            download_name=result  # result contains filename
+            download_name=result,  # result contains filename
+            etag=etag
         )
+        response.headers.update(budget_headers)
+        return response
+    
+    except RenderPoolBusyError as e:
+        return _pdf_renderer_busy(e)
         
     except Exception as e:
-        print(f"[ERROR] PDF generation error: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("PDF generation error: %s", e)
         return jsonify({
             'success': False,
             'error': str(e)
         }), 400
 
 
+@api_bp.route('/pdf/estimate', methods=['POST'])
+def estimate_pdf():
+    """Predict page count and render time of a CV without rendering it"""
+    cv_data = request.get_json(silent=True)
+    
+    if not cv_data or not isinstance(cv_data, dict):
+        return jsonify({
+            'success': False,
+            'error': 'No CV data provided'
+        }), 400
+    
+    estimate = estimate_cv(cv_data)
+    return jsonify({
+        'success': True,
+        'estimate': estimate,
+        'max_pages': current_app.config.get('PDF_MAX_PAGES', 0),
+        'over_budget': over_budget(
+            estimate,
+            current_app.config.get('PDF_MAX_PAGES', 0),
+            current_app.config.get('PDF_MAX_RENDER_MS', 0)
+        )
+    })
+
+
+@api_bp.route('/preview_html', methods=['POST'])
+def preview_html():
+    """Return the exact HTML that PDF generation feeds to xhtml2pdf"""
+    cv_data = request.get_json(silent=True)
+    
+    if not cv_data or not isinstance(cv_data, dict):
+        return jsonify({
+            'success': False,
+            'error': 'No CV data provided'
+        }), 400
+    
+    validation_error = validate_cv_data(cv_data)
+    if validation_error:
+        return jsonify({
+            'success': False,
+            'error': validation_error
+        }), 400
+    
+    # Same inputs as the PDF, so the PDF cache key identifies this HTML too;
+    # prefixed so a cache never answers a PDF request with the HTML or back
+    etag = 'html:' + pdf_service.cache_key(cv_data)
+    if request.if_none_match.contains_weak(etag):
+        return _not_modified(etag)
+    
+    html_content, error = pdf_service.preview_html(cv_data)
+    if html_content is None:
+        return jsonify({
+            'success': False,
+            'error': error
+        }), 500
+    
+    response = Response(html_content, mimetype='text/html')
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
+
+
+@api_bp.route('/pdf/jobs', methods=['POST'])
+def create_pdf_job():
+    """Queue PDF generation and return a job id immediately"""
+    cv_data = request.get_json(silent=True)
+    
+    if not cv_data or not isinstance(cv_data, dict):
+        return jsonify({
+            'success': False,
+            'error': 'No CV data provided'
+        }), 400
+    
+    validation_error = validate_cv_data(cv_data)
+    if validation_error:
+        return jsonify({
+            'success': False,
+            'error': validation_error
+        }), 400
+    
+    cv_data, budget_headers, budget_error = _apply_cost_budget(cv_data)
+    if budget_error:
+        return budget_error
+    
+    job_id, error = pdf_job_service.submit(current_app._get_current_object(), cv_data)
+    
+    if job_id is None:
+        response = jsonify({'success': False, 'error': error})
+        response.status_code = 503
+        response.headers['Retry-After'] = '5'
+        return response
+    
+    status_url = url_for('api.get_pdf_job', job_id=job_id)
+    response = jsonify({
+        'success': True,
+        'job_id': job_id,
+        'status': 'queued',
+        'status_url': status_url,
+        'download_url': url_for('api.download_pdf_job', job_id=job_id)
+    })
+    response.status_code = 202
+    response.headers['Location'] = status_url
+    response.headers.update(budget_headers)
+    return response
+
+
+@api_bp.route('/pdf/jobs/<job_id>', methods=['GET'])
+def get_pdf_job(job_id):
+    """Get the status of a queued PDF job"""
+    status = pdf_job_service.get_status(job_id)
+    
+    if status is None:
+        return jsonify({
+            'success': False,
+            'error': 'PDF job not found or expired'
+        }), 404
+    
+    body = {
+        'success': True,
+        'job_id': job_id,
+        'status': status['status']
+    }
+    if status['status'] == 'done':
+        body['filename'] = status.get('filename')
+        body['download_url'] = url_for('api.download_pdf_job', job_id=job_id)
+    elif status['status'] == 'failed':
+        body['error'] = status.get('error', 'PDF generation failed')
+    
+    return jsonify(body)
+
+
+@api_bp.route('/pdf/jobs/<job_id>/download', methods=['GET'])
+def download_pdf_job(job_id):
+    """Download the PDF produced by a finished job"""
+    pdf_path = pdf_job_service.get_result_path(job_id)
+    
+    if pdf_path is None:
+        status = pdf_job_service.get_status(job_id)
+        if status is None:
+            return jsonify({
+                'success': False,
+                'error': 'PDF job not found or expired'
+            }), 404
+        return jsonify({
+            'success': False,
+            'error': f"PDF job is {status['status']}",
+            'status': status['status']
+        }), 409
+    
+    status = pdf_job_service.get_status(job_id) or {}
+    return send_file(
+        pdf_path,
+        mimetype='application/pdf',
+        as_attachment=True,
+        download_name=status.get('filename') or 'CV.pdf'
+    )
+
+
+@api_bp.route('/pdf/batch', methods=['POST'])
+def generate_pdf_batch():
+    """Render a cohort of CVs and stream them back as a ZIP archive"""
+    if 'file' in request.files:
+        raw = request.files['file'].read()
+    else:
+        raw = request.get_data()
+    
+    items, error = parse_cv_batch(raw)
+    if error is None:
+        error = pdf_batch_service.check_size(items)
+    if error:
+        return jsonify({
+            'success': False,
+            'error': error
+        }), 400
+    
+    stream = pdf_batch_service.stream_zip(current_app._get_current_object(), items)
+    return Response(
+        stream,
+        mimetype='application/zip',
+        headers={
+            'Content-Disposition': 'attachment; filename="cvs.zip"',
+            'X-Batch-Size': str(len(items))
+        }
+    )
+
+
+def _optimize_requested() -> bool:
+    """Read the per-request ?optimize= switch, defaulting to PDF_OPTIMIZE"""
+    value = request.args.get('optimize')
+    if value is None:
+        return current_app.config.get('PDF_OPTIMIZE', False)
+    return value.lower() in ('1', 'true', 'yes')
+
+
+def _read_pdf_request():
+    """
+    Read the CV data and optional binary photo of a PDF request
+    
+    Accepts a JSON body, or multipart/form-data with the CV JSON in a
+    `cv_data` field and the photo as a binary `photo` file part. The photo
+    stays raw bytes (werkzeug spools large parts to a temporary file) and
+    never goes through base64 or the CV text sanitizer.
+    
+    Returns:
+        Tuple of (CV data, photo as (bytes, MIME type) or None, error message or None)
+    """
+    with span('read_request'):
+        if request.mimetype != 'multipart/form-data':
+            return request.json, None, None
+        
+        try:
+            cv_data = json_codec.loads(request.form.get('cv_data') or 'null')
+        except ValueError:
+            return None, None, 'Invalid CV data JSON'
+        
+        photo = None
+        file = request.files.get('photo')
+        if file and file.filename:
+            image_bytes, result = read_image_upload(file)
+            if image_bytes is None:
+                return None, None, result
+            photo = (image_bytes, result)  # result contains the detected MIME type
+        return cv_data, photo, None
+
+
+def _apply_cost_budget(cv_data):
+    """
+    Check the estimated page count and render time against the PDF budget
+    
+    Over budget, PDF_BUDGET_ACTION decides: 'warn' renders anyway, 'trim'
+    drops bullets and entries of the tallest sections until the CV fits,
+    'reject' refuses the render with 413.
+    
+    Returns:
+        Tuple of (CV data to render, extra response headers, error response or None)
+    """
+    with span('cost_budget'):
+        if not isinstance(cv_data, dict):
+            return cv_data, {}, None
+        
+        config = current_app.config
+        cv_data, estimate, reason, notes = apply_budget(
+            cv_data,
+            config.get('PDF_MAX_PAGES', 0),
+            config.get('PDF_MAX_RENDER_MS', 0),
+            config.get('PDF_BUDGET_ACTION', 'warn')
+        )
+        if cv_data is None:
+            logger.warning("PDF rejected: %s", reason)
+            return None, None, (jsonify({
+                'success': False,
+                'error': f"{reason}. Please shorten bullet points or remove older entries.",
+                'estimate': estimate
+            }), 413)
+        
+        headers = {'X-Estimated-Pages': str(estimate['pages'])}
+        if notes:
+            logger.info("CV trimmed to fit the PDF budget: %s", ', '.join(notes))
+            headers['X-CV-Trimmed'] = '; '.join(notes)
+        if reason is not None:
+            logger.warning("%s", reason)
+            headers['X-CV-Budget-Warning'] = reason
+        return cv_data, headers, None
+
+
+def _backend_requested() -> str:
+    """Read the per-request ?backend= renderer choice, defaulting to PDF_BACKEND"""
+    return request.args.get('backend') or current_app.config.get('PDF_BACKEND', 'xhtml2pdf')
+
+
+def _unknown_backend(backend: str):
+    """Build the 400 response for an unsupported ?backend= value"""
+    return jsonify({
+        'success': False,
+        'error': f"Unknown PDF backend '{backend}', expected one of: "
+                 f"{', '.join(sorted(pdf_service.backends))}"
+    }), 400
+
+
+def _not_modified(etag: str) -> Response:
+    """Build a 304 response for a PDF or preview the client already has"""
+    response = Response(status=304)
+    response.set_etag(etag)
+    return response
+
+
+def _pdf_renderer_busy(error: Exception):
+    """Build a 503 response asking the client to retry a PDF render later"""
+    response = jsonify({
+        'success': False,
+        'error': str(error)
+    })
+    response.status_code = 503
+    response.headers['Retry-After'] = '5'
+    return response
+
+
 @api_bp.route('/generate_career_objective', methods=['POST'])
 def generate_career_objective():
     """Generate AI career objective paragraph based on user data"""
@@ -268,7 +604,7 @@ def generate_career_objective():
             }), 500
             
     except Exception as e:
-        print(f"[ERROR] Career objective generation error: {e}")
+        logger.exception("Career objective generation error: %s", e)
         return jsonify({
             'success': False,
             'error': str(e)
@@ -321,7 +657,7 @@ def generate_planned_skills():
             }), 500
             
     except Exception as e:
-        print(f"[ERROR] Planned skills generation error: {e}")
+        logger.exception("Planned skills generation error: %s", e)
         return jsonify({
             'success': False,
             'error': str(e)
@@ -334,7 +670,7 @@ def generate_planned_skills():
 @api_bp.route('/photo/upload', methods=['POST'])
 @api_bp.route('/photo-upload', methods=['POST'])
 def photo_upload_alias():
-    """Alias for upload_photo - returns base64 encoded image"""
+    """Alias for upload_photo - returns base64 encoded image and the stored photo id"""
     if 'photo' not in request.files:
         return jsonify({'success': False, 'error': 'No photo uploaded'}), 400
     
@@ -350,17 +686,18 @@ def photo_upload_alias():
         }), 400
     
     try:
-        file_content = file.read()
-        filename = file.filename.lower()
-        if filename.endswith('.png'):
-            mime_type = 'image/png'
-        else:
-            mime_type = 'image/jpeg'
+        file_content, result = read_image_upload(file)
+        
+        if file_content is None:
+            return jsonify({'success': False, 'error': result}), 400
+        
+        mime_type = result  # result contains the detected MIME type
         
         base64_data = base64.b64encode(file_content).decode('utf-8')
         
         return jsonify({
             'success': True,
+            'photo_id': photo_store.put(file_content, mime_type),
             'base64': base64_data,
             'mime_type': mime_type
         })
@@ -372,7 +709,12 @@ def photo_upload_alias():
 def pdf_generate_alias():
     """Alias for generate_pdf - generates PDF from CV data"""
     try:
-        cv_data = request.json
+        cv_data, photo, request_error = _read_pdf_request()
+        if request_error:
+            return jsonify({
+                'success': False,
+                'error': request_error
+            }), 400
         
         if not cv_data:
             return jsonify({
@@ -380,8 +722,22 @@ def pdf_generate_alias():
                 'error': 'No CV data provided'
             }), 400
         
+        optimize = _optimize_requested()
+        backend = _backend_requested()
+        if backend not in pdf_service.backends:
+            return _unknown_backend(backend)
+        
+        cv_data, budget_headers, budget_error = _apply_cost_budget(cv_data)
+        if budget_error:
+            return budget_error
+        
+        with span('etag'):
+            etag = pdf_service.cache_key(cv_data, optimize, backend, photo)
+        if request.if_none_match.contains_weak(etag):
+            return _not_modified(etag)
+        
         # Generate PDF
-        pdf_buffer, result = pdf_service.generate(cv_data)
+        pdf_buffer, result = pdf_service.generate(cv_data, optimize, backend, photo)
         
         if pdf_buffer is None:
             return jsonify({
@@ -389,15 +745,21 @@ def pdf_generate_alias():
                 'error': result
             }), 500
         
-        return send_file(
+        response = send_file(
             pdf_buffer,
             mimetype='application/pdf',
             as_attachment=True,
-            download_name=result
+            download_name=result,
+            etag=etag
         )
+        response.headers.update(budget_headers)
+        return response
+    
+    except RenderPoolBusyError as e:
+        return _pdf_renderer_busy(e)
         
     except Exception as e:
-        print(f"[ERROR] PDF generation error: {e}")
+        logger.exception("PDF generation error: %s", e)
         return jsonify({
             'success': False,
             'error': str(e)
@@ -456,7 +818,7 @@ def career_objective_alias():
             }), 500
             
     except Exception as e:
-        print(f"[ERROR] Career objective generation error: {e}")
+        logger.exception("Career objective generation error: %s", e)
         return jsonify({
             'success': False,
             'error': str(e)
@@ -542,7 +904,7 @@ def planned_skills_suggestions_alias():
             }), 500
             
     except Exception as e:
-        print(f"[ERROR] Planned skills suggestion error: {e}")
+        logger.exception("Planned skills suggestion error: %s", e)
         return jsonify({
             'success': False,
             'error': str(e)
@@ -567,21 +929,22 @@ def photo_upload_underscore_alias():
         }), 400
     
     try:
-        file_content = file.read()
-        filename = file.filename.lower()
-        if filename.endswith('.png'):
-            mime_type = 'image/png'
-        else:
-            mime_type = 'image/jpeg'
+        file_content, result = read_image_upload(file)
         
-        base64_data = base64.b64encode(file_content).decode('utf-8')
-        data_url = f"data:{mime_type};base64,{base64_data}"
+        if file_content is None:
+            return jsonify({'success': False, 'error': result}), 400
+        
+        mime_type = result  # result contains the detected MIME type
         
+        photo_id = photo_store.put(file_content, mime_type)
+        
+        # The image travels once, as base64; photo_url is the short stored URL
         return jsonify({
             'success': True,
-            'photo_url': data_url,
-            'base64': base64_data,
-            'is_base64': True
+            'photo_id': photo_id,
+            'photo_url': url_for('api.get_photo', photo_id=photo_id),
+            'base64': base64.b64encode(file_content).decode('utf-8'),
+            'is_base64': False
         })
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
@@ -652,7 +1015,7 @@ def planned_skills_alias():
             }), 500
             
     except Exception as e:
-        print(f"[ERROR] Planned skills error: {e}")
+        logger.exception("Planned skills error: %s", e)
         return jsonify({
             'success': False,
             'error': str(e)
@@ -13,6 +13,12 @@ def index():
     return render_template('index.html')
 
 
+@main_bp.route('/assets/<path:filename>')
+def asset(filename):
+    """Serve a built asset with immutable cache headers (names change with content)"""
+    return current_app.extensions['assets'].send(filename)
+
+
 @main_bp.route('/favicon.ico')
 def favicon():
     """Serve favicon if exists, otherwise return empty response"""
@@ -1,8 +1,17 @@
 """
 Services Package - Business logic layer
+
+Importing the package stays cheap: xhtml2pdf, ReportLab's platypus and font
+metrics, requests and PIL are imported by the code that first needs them,
+so health checks, CLI tools and LLM-only requests do not load them
+(python -m benchmarks.startup checks this)
 """
 from .llm_service import llm_service, LLMService
 from .pdf_service import pdf_service, PDFService
+from .photo_service import photo_service, PhotoService
+from .photo_store import photo_store, PhotoStore
+from .pdf_jobs import pdf_job_service, PDFJobService
+from .pdf_batch import pdf_batch_service, PDFBatchService
 from .resume_parser import resume_parser, ResumeParserService
 
 __all__ = [
@@ -10,6 +19,14 @@ __all__ = [
     'LLMService',
     'pdf_service', 
     'PDFService',
+    'photo_service',
+    'PhotoService',
+    'photo_store',
+    'PhotoStore',
+    'pdf_job_service',
+    'PDFJobService',
+    'pdf_batch_service',
+    'PDFBatchService',
     'resume_parser',
     'ResumeParserService'
 ]
@@ -0,0 +1,124 @@
+"""
+CSS Cache - Parse the CV stylesheet once per process and reuse it across renders
+xhtml2pdf re-parses every <style> block and the default CSS for each document,
+then scans every rule for each CSS property lookup. This module caches the parsed
+stylesheets and indexes their rules by property name.
+"""
+import re
+import threading
+
+from xhtml2pdf.context import pisaContext
+from xhtml2pdf.w3c.css import CSSRuleset
+
+
+_COMMENT_RE = re.compile(r'/\*.*?\*/', re.DOTALL)
+
+_original_parse_css = pisaContext.parseCSS
+_parsed_css = {}
+_parsed_css_lock = threading.Lock()
+_max_entries = 8
+
+
+class IndexedCSSRuleset(CSSRuleset):
+    """CSSRuleset that only matches selectors of rules declaring the property"""
+
+    def __init__(self, ruleset: CSSRuleset):
+        super().__init__(ruleset)
+        self._rules_by_attr = {}
+        for node_filter, declarations in ruleset.items():
+            for attr_name in declarations:
+                self._rules_by_attr.setdefault(attr_name, []).append((node_filter, declarations))
+
+    def findCSSRulesFor(self, element, attrName):
+        rule_results = [
+            (node_filter, declarations)
+            for node_filter, declarations in self._rules_by_attr.get(attrName, ())
+            if node_filter.matches(element)
+        ]
+        rule_results.sort()
+        return rule_results
+
+
+def install_css_cache() -> None:
+    """Make every xhtml2pdf render in this process use the parsed-CSS cache"""
+    pisaContext.parseCSS = _cached_parse_css
+
+
+def get_css_cache_size() -> int:
+    """Get the number of distinct stylesheets parsed in this process"""
+    return len(_parsed_css)
+
+
+def _cached_parse_css(context) -> None:
+    """
+    Drop-in replacement for pisaContext.parseCSS
+
+    The first render parses normally and stores the indexed stylesheets.
+    Later renders with the same CSS only re-parse the @-rules, because
+    @page, @frame and @font-face register page templates and fonts on the
+    context being rendered.
+    """
+    if '@import' in context.cssText or '@import' in context.cssDefaultText:
+        _original_parse_css(context)
+        return
+
+    key = (context.cssText, context.cssDefaultText)
+    cached = _parsed_css.get(key)
+
+    if cached is None:
+        _original_parse_css(context)
+        cached = (
+            _index_stylesheet(context.css),
+            _index_stylesheet(context.cssDefault),
+            _extract_at_rules(context.cssText) + _extract_at_rules(context.cssDefaultText)
+        )
+        with _parsed_css_lock:
+            if len(_parsed_css) >= _max_entries:
+                _parsed_css.pop(next(iter(_parsed_css)))
+            _parsed_css[key] = cached
+        context.css, context.cssDefault = cached[0], cached[1]
+        context.cssCascade.user = context.css
+        context.cssCascade.userAgenr = context.cssDefault
+        return
+
+    css, css_default, at_rules = cached
+
+    # Set up parser/builder/cascade exactly as xhtml2pdf does, but with the
+    # stylesheets swapped for the cached ones
+    context.cssText, context.cssDefaultText = at_rules, ''
+    try:
+        _original_parse_css(context)
+    finally:
+        context.cssText, context.cssDefaultText = key
+
+    context.css, context.cssDefault = css, css_default
+    context.cssCascade.user = css
+    context.cssCascade.userAgenr = css_default
+
+
+def _index_stylesheet(stylesheet):
+    """Index the (normal, important) rulesets of a parsed stylesheet"""
+    if isinstance(stylesheet, tuple):
+        return tuple(IndexedCSSRuleset(ruleset) for ruleset in stylesheet)
+    return stylesheet
+
+
+def _extract_at_rules(css_text: str) -> str:
+    """Collect the top-level @-rule blocks (with nested blocks) from CSS text"""
+    css_text = _COMMENT_RE.sub('', css_text)
+    blocks = []
+    depth = 0
+    block_start = 0
+    for index, char in enumerate(css_text):
+        if char == '{':
+            depth += 1
+        elif char == '}':
+            depth -= 1
+            if depth == 0:
+                block = css_text[block_start:index + 1].strip()
+                if block.startswith('@'):
+                    blocks.append(block)
+                block_start = index + 1
+        elif char == ';' and depth == 0:
+            block_start = index + 1
+    return '\n'.join(blocks) + '\n' if blocks else ''
@@ -0,0 +1,123 @@
+"""
+CV Fragments - Per-section rendering of the CV template with a fragment cache
+Each section template only sees the slice of CV data it reads, so a section's
+HTML can be reused whenever that slice is unchanged. Editing one bullet while
+iterating on a CV re-renders one section instead of the whole document.
+"""
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+
+from ..metrics import count_fragment_lookup
+
+
+SECTIONS_TEMPLATE_DIR = 'cv_sections'
+
+# Coding platform profile fields and their labels, in document order
+PLATFORMS = (
+    ('leetcode', 'LeetCode'), ('gfg', 'GeeksforGeeks'), ('interviewbit', 'InterviewBit'),
+    ('codeforces', 'Codeforces'), ('codechef', 'CodeChef'), ('atcoder', 'AtCoder'),
+    ('hackerrank', 'HackerRank'), ('hackerearth', 'HackerEarth'), ('codility', 'Codility'),
+    ('codesignal', 'CodeSignal'), ('kaggle', 'Kaggle'), ('huggingface', 'HuggingFace'),
+    ('github', 'GitHub')
+)
+
+# (section, CV fields the section template reads), in document order
+CV_SECTIONS = (
+    ('header', ('full_name', 'phone', 'email', 'address', 'linkedin', 'github',
+                'portfolio', 'photo_data')),
+    ('dream', ('cohort', 'dream_company', 'target_role', 'target_technology',
+               'expected_package')),
+    ('objective', ('professional_summary', 'cohort', 'dream_company', 'target_role',
+                   'target_technology')),
+    ('education', ('qualifications',)),
+    ('skills', ('prog_languages', 'web_tech', 'databases', 'mobile_tech', 'other_tools',
+                'planned_skills', 'skill_labels')),
+    ('experience', ('experiences',)),
+    ('internships', ('internships',)),
+    ('projects', ('projects',)),
+    ('certifications', ('certifications', 'planned_certifications')),
+    ('responsibilities', ('responsibilities',)),
+    ('digital', tuple(field for field, _ in PLATFORMS) + ('other_platforms', 'tech_events',
+                                                          'community_associations')),
+    ('achievements', ('achievements',)),
+    ('extracurricular', ('community_activities',)),
+    ('languages', ('languages',)),
+)
+
+
+class FragmentCache:
+    """Bounded LRU of rendered section HTML keyed by the hash of its data slice"""
+
+    def __init__(self, max_items: int = 512):
+        self.max_items = max_items
+        self._fragments = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {name: {'hits': 0, 'misses': 0} for name, _ in CV_SECTIONS}
+
+    def render_sections(self, jinja_env, data: dict, version: str = '') -> list[str]:
+        """
+        Render every CV section, reusing cached HTML for unchanged slices
+
+        Args:
+            jinja_env: Jinja environment holding the section templates
+            data: Preprocessed, sanitized CV data
+            version: Render version; changes with the templates and styles
+
+        Returns:
+            Section HTML strings in document order
+        """
+        fragments = []
+        for name, fields in CV_SECTIONS:
+            data_slice = {field: data[field] for field in fields if field in data}
+            key = _slice_key(name, data_slice, version)
+
+            with self._lock:
+                html = self._fragments.get(key)
+                if html is not None:
+                    self._fragments.move_to_end(key)
+                    self._stats[name]['hits'] += 1
+            count_fragment_lookup(name, html is not None)
+
+            if html is None:
+                template = jinja_env.get_template(f"{SECTIONS_TEMPLATE_DIR}/{name}.html")
+                html = template.render(data=data_slice)
+                with self._lock:
+                    self._stats[name]['misses'] += 1
+                    self._fragments[key] = html
+                    while len(self._fragments) > self.max_items:
+                        self._fragments.popitem(last=False)
+
+            fragments.append(html)
+        return fragments
+
+    def get_stats(self) -> dict:
+        """
+        Get hit counts and hit rates per section and overall in this process
+
+        /metrics reports the lookups of all workers
+        (dreamcv_fragment_cache_lookups_total).
+
+        Returns:
+            Dictionary of section name -> {'hits', 'misses', 'hit_rate'},
+            plus a 'total' entry
+        """
+        with self._lock:
+            stats = {name: dict(counts) for name, counts in self._stats.items()}
+        total = {
+            'hits': sum(counts['hits'] for counts in stats.values()),
+            'misses': sum(counts['misses'] for counts in stats.values())
+        }
+        stats['total'] = total
+        for counts in stats.values():
+            lookups = counts['hits'] + counts['misses']
+            counts['hit_rate'] = round(counts['hits'] / lookups, 3) if lookups else 0.0
+        return stats
+
+
+def _slice_key(name: str, data_slice: dict, version: str) -> bytes:
+    """Hash a section's data slice; a single JSON dump keeps this cheap per render"""
+    encoded = json.dumps([version, name, data_slice], separators=(',', ':'),
+                         ensure_ascii=False, default=str)
+    return hashlib.blake2b(encoded.encode('utf-8'), digest_size=16).digest()
@@ -1,10 +1,15 @@
 """
 LLM Service - Handles all AI/LLM interactions
 """
-import requests
 import json
+import logging
 import re
 from ..config import Config
+from ..metrics import stage
+from ..tracing import span
+from ..utils import json_codec
+
+logger = logging.getLogger(__name__)
 
 
 class LLMService:
@@ -36,7 +41,7 @@ Return the response as a JSON object with properly formatted sections."""
             LLM response text or None if failed
         """
         if not self.api_key:
-            print("[ERROR] OPENROUTER_API_KEY not set")
+            logger.error("OPENROUTER_API_KEY not set")
             return None
         
         headers = {
@@ -62,25 +67,33 @@ Return the response as a JSON object with properly formatted sections."""
             "max_tokens": self.max_tokens
         }
         
+        # Imported here so startup and non-LLM paths do not load it
+        import requests
+        
         try:
-            print(f"[DEBUG] Calling OpenRouter API with model: {self.model}")
-            response = requests.post(
-                self.base_url,
-                headers=headers,
-                json=data,
-                timeout=self.timeout
-            )
-            print(f"[DEBUG] API Response Status: {response.status_code}")
-            response.raise_for_status()
-            result = response.json()
-            print("[DEBUG] OpenRouter API response received successfully")
+            logger.debug("Calling OpenRouter API with model %s", self.model)
+            with stage('llm_call'):
+                response = requests.post(
+                    self.base_url,
+                    headers=headers,
+                    json=data,
+                    timeout=self.timeout
+                )
+                logger.debug("OpenRouter API response status %s", response.status_code)
+                response.raise_for_status()
+                result = json_codec.loads(response.content)
             return result['choices'][0]['message']['content']
             
         except requests.exceptions.RequestException as e:
-            print(f"[ERROR] OpenRouter API Error: {e}")
-            if hasattr(e, 'response') and e.response is not None:
-                print(f"[ERROR] Response status: {e.response.status_code}")
-                print(f"[ERROR] Response content: {e.response.text}")
+            # The response body may echo the prompt (user CV data): not logged
+            status = e.response.status_code if getattr(e, 'response', None) is not None else None
+            logger.error("OpenRouter API error (status %s): %s", status, e)
+            return None
+        except ValueError as e:
+            # Body is not JSON (an HTML error page, truncated output); json's and
+            # orjson's JSONDecodeError are both ValueErrors
+            logger.error("OpenRouter API returned a body that is not JSON (status %s): %s",
+                         response.status_code, e)
             return None
     
     def format_section(self, section_name: str, content: str) -> str:
@@ -295,24 +308,26 @@ Write concisely and specifically for the DREAM CV format."""
             Parsed dictionary or None
         """
         try:
-            cleaned = self.clean_json_response(response)
-            return json.loads(cleaned)
+            with span('json_parse'):
+                cleaned = self.clean_json_response(response)
+                return json_codec.loads(cleaned)
         except json.JSONDecodeError as e:
-            print(f"[ERROR] JSON decode error: {e}")
-            print("[DEBUG] Attempting to repair truncated JSON...")
+            logger.warning("LLM returned invalid JSON (%s), attempting repair", e)
             
             try:
                 # Try to repair the JSON
-                cleaned = self.clean_json_response(response)
-                repaired = self.repair_truncated_json(cleaned)
-                result = json.loads(repaired)
-                print("[DEBUG] JSON repair successful!")
+                with stage('json_repair'):
+                    cleaned = self.clean_json_response(response)
+                    repaired = self.repair_truncated_json(cleaned)
+                    result = json_codec.loads(repaired)
+                logger.debug("JSON repair successful")
                 return result
             except json.JSONDecodeError as e2:
-                print(f"[ERROR] JSON repair failed: {e2}")
+                logger.warning("JSON repair failed (%s), extracting partial data", e2)
                 
                 # Last resort: try to extract what we can using regex
-                return self.extract_partial_data(response)
+                with span('json_partial'):
+                    return self.extract_partial_data(response)
     
     def extract_partial_data(self, response: str) -> dict | None:
         """
@@ -324,8 +339,6 @@ Write concisely and specifically for the DREAM CV format."""
         Returns:
             Dictionary with extracted data or None
         """
-        print("[DEBUG] Attempting partial data extraction...")
-        
         data = {}
         
         # Extract simple string fields
@@ -370,12 +383,12 @@ Write concisely and specifically for the DREAM CV format."""
                     array_str = self.repair_truncated_json(array_str)
                 
                 try:
-                    data[field] = json.loads(array_str)
+                    data[field] = json_codec.loads(array_str)
                 except:
                     data[field] = []
         
         if data:
-            print(f"[DEBUG] Partial extraction got {len(data)} fields")
+            logger.debug("Partial extraction got %d fields", len(data))
             return data
         
         return None
@@ -0,0 +1,53 @@
+"""
+PDF Backends - Interchangeable renderers turning CV data into PDF bytes
+"""
+from .render_pool import html_to_pdf
+
+
+class PDFBackend:
+    """
+    Interface for PDF renderers
+
+    build_task runs on the request thread, inside the application context,
+    and returns a picklable (function, args) pair. PDFService calls the
+    function with args + (optimize,), either directly or in a render pool
+    worker process.
+    """
+
+    name = ''
+
+    def build_task(self, processed_data: dict) -> tuple:
+        """
+        Prepare a render
+
+        Args:
+            processed_data: Preprocessed, sanitized CV data
+
+        Returns:
+            Tuple of (module-level render function, argument tuple)
+        """
+        raise NotImplementedError
+
+
+class XHTML2PDFBackend(PDFBackend):
+    """Renders the Jinja CV template and converts the HTML with xhtml2pdf"""
+
+    name = 'xhtml2pdf'
+
+    def __init__(self, render_html):
+        self.render_html = render_html
+
+    def build_task(self, processed_data: dict) -> tuple:
+        return html_to_pdf, (self.render_html(processed_data),)
+
+
+class ReportLabBackend(PDFBackend):
+    """Lays out the CV directly with ReportLab flowables, skipping HTML and CSS"""
+
+    name = 'reportlab'
+
+    def build_task(self, processed_data: dict) -> tuple:
+        # Imported on first use: ReportLab's platypus is slow to import
+        from .reportlab_backend import cv_to_pdf
+
+        return cv_to_pdf, (processed_data,)
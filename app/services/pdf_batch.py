@@ -0,0 +1,226 @@
+"""
+PDF Batch - Render many CVs in parallel and stream them back as one ZIP
+Entries are written to the archive in completion order, so only the PDFs that
+are rendered but not yet sent are ever held in memory
+"""
+import json
+import logging
+import time
+import zipfile
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from ..config import Config
+from ..utils import json_codec
+from ..utils.helpers import validate_cv_data
+from .pdf_estimator import apply_budget
+
+logger = logging.getLogger(__name__)
+
+
+MANIFEST_NAME = 'manifest.json'
+
+
+def parse_cv_batch(raw: bytes | str) -> tuple[list, None] | tuple[None, str]:
+    """
+    Parse a batch of CVs given as a JSON array or as JSON Lines
+
+    A JSON object with a "cvs" array is accepted too. Lines of a JSONL batch
+    that are not valid JSON become None items, reported per item later.
+
+    Args:
+        raw: Request body or file contents
+
+    Returns:
+        Tuple of (list of CV items, None) or (None, error message)
+    """
+    if isinstance(raw, bytes):
+        try:
+            raw = raw.decode('utf-8-sig')
+        except UnicodeDecodeError:
+            return None, 'Batch must be UTF-8 encoded JSON'
+
+    text = raw.strip()
+    if not text:
+        return None, 'No CV data provided'
+
+    try:
+        data = json_codec.loads(text)
+    except ValueError:
+        data = None
+    else:
+        if isinstance(data, dict) and isinstance(data.get('cvs'), list):
+            return data['cvs'], None
+        if isinstance(data, list):
+            return data, None
+        if isinstance(data, dict):
+            return [data], None
+        return None, 'Batch must be a JSON array or JSON Lines of CV objects'
+
+    items = []
+    for line in text.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            items.append(json_codec.loads(line))
+        except ValueError:
+            items.append(None)
+
+    if not any(item is not None for item in items):
+        return None, 'Batch must be a JSON array or JSON Lines of CV objects'
+    return items, None
+
+
+class _ZipStream:
+    """Write-only file object that hands written bytes back in chunks"""
+
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = b''.join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+class PDFBatchService:
+    """Service for rendering a cohort of CVs into a streamed ZIP archive"""
+
+    def __init__(self, workers: int = 2, max_items: int = 200):
+        self.workers = max(1, workers)
+        self.max_items = max_items
+
+    def check_size(self, items: list) -> str | None:
+        """
+        Check a parsed batch against the item limit
+
+        Args:
+            items: CV items from parse_cv_batch
+
+        Returns:
+            Error message or None if the batch can be rendered
+        """
+        if not items:
+            return 'No CV data provided'
+        if len(items) > self.max_items:
+            return f'Batch has {len(items)} CVs, the limit is {self.max_items}'
+        return None
+
+    def stream_zip(self, app, items: list, workers: int = None):
+        """
+        Render CVs in parallel and yield a ZIP archive chunk by chunk
+
+        Each PDF is added as soon as its render finishes, named with its
+        1-based input position so duplicates never collide. Every item is
+        checked against the PDF budget (PDF_MAX_PAGES, PDF_MAX_RENDER_MS,
+        PDF_BUDGET_ACTION) like a single render. The final entry is
+        manifest.json with the outcome of every item; invalid, rejected or
+        failed items are listed there without failing the batch.
+
+        Args:
+            app: Flask application the renders run under
+            items: CV items from parse_cv_batch
+            workers: Concurrent renders (defaults to the service setting)
+
+        Yields:
+            Bytes of the ZIP archive
+        """
+        from .pdf_service import pdf_service
+
+        workers = max(1, workers or self.workers)
+        results = [None] * len(items)
+        started = time.perf_counter()
+
+        def render(index, cv_data):
+            validation_error = validate_cv_data(cv_data)
+            if validation_error:
+                return index, None, validation_error, {}
+            cv_data, _, reason, notes = apply_budget(
+                cv_data,
+                app.config.get('PDF_MAX_PAGES', 0),
+                app.config.get('PDF_MAX_RENDER_MS', 0),
+                app.config.get('PDF_BUDGET_ACTION', 'warn')
+            )
+            if cv_data is None:
+                return index, None, reason, {}
+            budget = {}
+            if notes:
+                budget['trimmed'] = notes
+            if reason is not None:
+                budget['budget_warning'] = reason
+            try:
+                with app.app_context():
+                    pdf_buffer, result = pdf_service.generate(cv_data)
+            except Exception as e:
+                return index, None, str(e), budget
+            if pdf_buffer is None:
+                return index, None, result, budget
+            return index, pdf_buffer.getvalue(), result, budget
+
+        stream = _ZipStream()
+        archive = zipfile.ZipFile(stream, mode='w')
+        executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='pdf-batch')
+        pending = set()
+        queued = iter(enumerate(items))
+
+        def submit_next() -> None:
+            for index, cv_data in queued:
+                pending.add(executor.submit(render, index, cv_data))
+                return
+
+        try:
+            # Keep a small window in flight so a slow reader cannot make
+            # finished PDFs pile up in memory
+            for _ in range(workers * 2):
+                submit_next()
+
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    pending.discard(future)
+                    index, pdf_bytes, result, budget = future.result()
+                    if pdf_bytes is None:
+                        logger.warning("Batch item %d failed: %s", index + 1, result)
+                        results[index] = {'index': index + 1, 'success': False, 'error': result, **budget}
+                    else:
+                        filename = f"{index + 1:03d}_{result}"
+                        # PDF streams are already compressed; deflating them again
+                        # costs CPU for a few percent at best
+                        archive.writestr(filename, pdf_bytes, compress_type=zipfile.ZIP_STORED)
+                        results[index] = {'index': index + 1, 'success': True, 'filename': filename, **budget}
+                    submit_next()
+                chunk = stream.drain()
+                if chunk:
+                    yield chunk
+
+            failed = sum(1 for item in results if not item['success'])
+            manifest = {
+                'total': len(items),
+                'succeeded': len(items) - failed,
+                'failed': failed,
+                'items': results
+            }
+            archive.writestr(MANIFEST_NAME, json.dumps(manifest, indent=2),
+                             compress_type=zipfile.ZIP_DEFLATED)
+            archive.close()
+            yield stream.drain()
+
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            logger.info("PDF batch: %d CVs, %d failed, %.0f ms", len(items), failed, elapsed_ms)
+        finally:
+            # Client went away or a render raised: stop queued renders
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+# Singleton instance
+pdf_batch_service = PDFBatchService(
+    workers=Config.PDF_BATCH_WORKERS,
+    max_items=Config.PDF_BATCH_MAX_ITEMS
+)
@@ -0,0 +1,159 @@
+"""
+PDF Cache - Two-tier cache for rendered CV PDFs
+A bounded in-process LRU in front of a disk directory shared by all workers
+"""
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+
+from ..metrics import count_pdf_cache_lookup
+
+logger = logging.getLogger(__name__)
+
+
+def canonical_hash(*parts) -> str:
+    """
+    Hash JSON-serializable parts in a canonical form
+
+    Dict key order and whitespace do not affect the result, so the same CV
+    posted twice by different clients maps to the same key.
+
+    Args:
+        *parts: JSON-serializable values (CV data, version strings, ...)
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    digest = hashlib.sha256()
+    for part in parts:
+        encoded = json.dumps(part, sort_keys=True, separators=(',', ':'), ensure_ascii=False, default=str)
+        digest.update(encoded.encode('utf-8'))
+        digest.update(b'\x00')
+    return digest.hexdigest()
+
+
+class PDFCache:
+    """Bounded memory + disk cache of rendered PDF bytes keyed by content hash"""
+
+    def __init__(self, cache_dir: str = None, max_items: int = 64,
+                 max_memory_bytes: int = 32 * 1024 * 1024,
+                 max_disk_bytes: int = 256 * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.max_items = max_items
+        self.max_memory_bytes = max_memory_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self._memory = OrderedDict()
+        self._memory_bytes = 0
+        self._lock = threading.Lock()
+
+        if self.cache_dir:
+            os.makedirs(self.cache_dir, exist_ok=True)
+
+    def get(self, key: str) -> bytes | None:
+        """
+        Look up rendered PDF bytes
+
+        Args:
+            key: Cache key from canonical_hash
+
+        Returns:
+            PDF bytes or None on a miss
+        """
+        with self._lock:
+            data = self._memory.get(key)
+            if data is not None:
+                self._memory.move_to_end(key)
+                count_pdf_cache_lookup('memory_hit')
+                return data
+
+        data = self._read_disk(key)
+        if data is None:
+            count_pdf_cache_lookup('miss')
+            return None
+        count_pdf_cache_lookup('disk_hit')
+        with self._lock:
+            self._remember(key, data)
+        return data
+
+    def put(self, key: str, data: bytes) -> None:
+        """
+        Store rendered PDF bytes in both tiers
+
+        Args:
+            key: Cache key from canonical_hash
+            data: PDF bytes
+        """
+        with self._lock:
+            self._remember(key, data)
+        self._write_disk(key, data)
+
+    def _remember(self, key: str, data: bytes) -> None:
+        """Insert into the memory tier and evict least recently used entries"""
+        if len(data) > self.max_memory_bytes:
+            return
+        previous = self._memory.pop(key, None)
+        if previous is not None:
+            self._memory_bytes -= len(previous)
+        self._memory[key] = data
+        self._memory_bytes += len(data)
+
+        while self._memory and (len(self._memory) > self.max_items
+                                or self._memory_bytes > self.max_memory_bytes):
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= len(evicted)
+
+    def _disk_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.pdf")
+
+    def _read_disk(self, key: str) -> bytes | None:
+        """Read an entry from the shared disk tier"""
+        if not self.cache_dir:
+            return None
+        path = self._disk_path(key)
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+            # Touch so disk pruning evicts least recently used first
+            os.utime(path)
+            return data
+        except OSError:
+            return None
+
+    def _write_disk(self, key: str, data: bytes) -> None:
+        """Atomically write an entry so other workers never see partial files"""
+        if not self.cache_dir:
+            return
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, self._disk_path(key))
+            self._prune_disk()
+        except OSError as e:
+            logger.warning("Could not write PDF cache entry: %s", e)
+
+    def _prune_disk(self) -> None:
+        """Delete least recently used disk entries beyond max_disk_bytes"""
+        entries = []
+        total = 0
+        for entry in os.scandir(self.cache_dir):
+            if entry.name.endswith('.pdf'):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+                total += stat.st_size
+
+        if total <= self.max_disk_bytes:
+            return
+
+        for _, size, path in sorted(entries):
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            if total <= self.max_disk_bytes:
+                break
@@ -0,0 +1,418 @@
+"""
+PDF Estimator - Predicts page count and render time of a CV without rendering
+Adds up line heights from Times font metrics and the CV stylesheet spacing,
+so oversized payloads are caught before xhtml2pdf spends seconds on them
+"""
+import copy
+import math
+
+from reportlab.lib.pagesizes import A4
+
+from .cv_fragments import PLATFORMS
+
+
+PAGE_MARGIN = 0.6 * 72
+PAGE_HEIGHT = A4[1] - 2 * PAGE_MARGIN
+CONTENT_WIDTH = A4[0] - 2 * PAGE_MARGIN
+
+# Entries avoid page breaks, so a page holds slightly less than its height
+PAGE_SLACK = 50
+
+# Fixed block heights in points, from styles.py margins and paddings
+HEADER_HEIGHT = 112
+DREAM_HEIGHT = 82
+SECTION_HEIGHT = 44
+ENTRY_GAP = 10
+LANGUAGE_ROW_HEIGHT = 19
+
+# Render time model for xhtml2pdf on one core, fitted with
+# benchmarks/pdf_estimate.py; only the relative size matters for budgets
+RENDER_BASE_MS = 40
+RENDER_MS_PER_LINE = 0.4
+RENDER_MS_PER_BLOCK = 9
+RENDER_PHOTO_MS = 20
+
+# Sections that may be shortened when a CV is over budget, tallest first
+TRIMMABLE_ENTRIES = ('projects', 'internships', 'experiences', 'responsibilities', 'certifications')
+TRIMMABLE_LISTS = ('achievements', 'community_activities', 'tech_events')
+BULLET_FIELDS = ('internships', 'projects', 'experiences', 'responsibilities')
+
+# Entry sections with bullets and the field an entry needs to be rendered, in CV order
+ENTRY_TITLES = {'experiences': 'company', 'internships': 'company',
+                'responsibilities': 'role', 'projects': 'name'}
+
+# Trimming never goes below this many bullets per entry or items per section
+MIN_BULLETS = 1
+MIN_ENTRIES = 2
+
+
+class _Layout:
+    """Running total of estimated height, text lines and layout blocks, also per section"""
+
+    def __init__(self):
+        # Font metrics load most of ReportLab; only pay for it once a CV is estimated
+        from reportlab.pdfbase.pdfmetrics import stringWidth
+
+        self.string_width = stringWidth
+        self.height = 0.0
+        self.lines = 0
+        self.blocks = 0
+        self.section = None
+        self.section_heights = {}
+
+    def add_height(self, height: float) -> None:
+        self.height += height
+        self.section_heights[self.section] = self.section_heights.get(self.section, 0.0) + height
+
+    def block(self, height: float) -> None:
+        self.add_height(height)
+        self.blocks += 1
+
+    def text(self, value, width: float, leading: float = 12.5, size: float = 10,
+             font: str = 'Times-Roman', spacing: float = 0) -> None:
+        """Add a wrapped paragraph, one per line of the value"""
+        if not value:
+            return
+        lines = 0
+        for paragraph in str(value).split('\n'):
+            # Word wrapping leaves ragged line ends, so fill lines only ~95%
+            lines += max(1, math.ceil(self.string_width(paragraph, font, size) / (width * 0.95)))
+        self.lines += lines
+        self.add_height(lines * leading + spacing)
+
+    def bullets(self, items, width: float = CONTENT_WIDTH - 14) -> None:
+        for item in _as_list(items):
+            self.text(item, width, leading=13, spacing=1)
+
+
+def estimate_cv(cv_data: dict) -> dict:
+    """
+    Predict the rendered size and cost of a CV from its raw data
+
+    Args:
+        cv_data: CV data as posted to /api/generate_pdf
+
+    Returns:
+        Dict with pages, height_pt, lines (wrapped text lines), blocks
+        (sections and entries) and render_ms (estimated xhtml2pdf time)
+    """
+    layout = _layout_cv(cv_data)
+    return _summarize(layout.height, layout.lines, layout.blocks, _has_photo(cv_data))
+
+
+def _summarize(height: float, lines: int, blocks: int, photo: bool) -> dict:
+    """Turn layout totals into an estimate_cv result"""
+    render_ms = (RENDER_BASE_MS + RENDER_MS_PER_LINE * lines + RENDER_MS_PER_BLOCK * blocks
+                 + (RENDER_PHOTO_MS if photo else 0))
+
+    return {
+        'pages': max(1, math.ceil((height - PAGE_SLACK) / PAGE_HEIGHT)),
+        'height_pt': round(height),
+        'lines': lines,
+        'blocks': blocks,
+        'render_ms': round(render_ms)
+    }
+
+
+def _layout_cv(cv_data: dict) -> _Layout:
+    """Lay out a CV's blocks and text; section heights are keyed by CV field"""
+    layout = _Layout()
+    layout.block(HEADER_HEIGHT)
+
+    if cv_data.get('dream_company') or cv_data.get('target_role') or cv_data.get('cohort'):
+        layout.block(DREAM_HEIGHT)
+
+    if cv_data.get('professional_summary'):
+        layout.block(SECTION_HEIGHT)
+        layout.text(cv_data['professional_summary'], CONTENT_WIDTH, leading=13.5)
+    elif cv_data.get('dream_company') or cv_data.get('target_role'):
+        # Generated objective paragraph
+        layout.block(SECTION_HEIGHT + 3 * 13.5)
+
+    _entries(layout, cv_data, 'qualifications', 'degree', lambda qual: layout.block(12))
+
+    skills = [cv_data.get(field) for field in
+              ('prog_languages', 'web_tech', 'databases', 'mobile_tech', 'other_tools', 'planned_skills')]
+    skills = [value for value in skills if value]
+    if skills:
+        layout.block(SECTION_HEIGHT)
+        for value in skills:
+            layout.text(value, CONTENT_WIDTH * 0.65, spacing=6)
+
+    for field, title_field in ENTRY_TITLES.items():
+        layout.section = field
+        _entries(layout, cv_data, field, title_field, lambda item: _entry_body(layout, field, item))
+
+    layout.section = 'certifications'
+    certifications = [cert for cert in _as_list(cv_data.get('certifications'))
+                      if isinstance(cert, dict) and cert.get('title')]
+    if certifications or cv_data.get('planned_certifications'):
+        layout.block(SECTION_HEIGHT)
+        for cert in certifications:
+            _certification(layout, cert)
+        if cv_data.get('planned_certifications'):
+            layout.block(30)
+            layout.text(cv_data['planned_certifications'], CONTENT_WIDTH)
+
+    platforms = sum(1 for field, _ in PLATFORMS if cv_data.get(field))
+    platforms += len(_as_list(cv_data.get('other_platforms')))
+    events = _as_list(cv_data.get('tech_events'))
+    if platforms or events or cv_data.get('community_associations'):
+        layout.section = None
+        layout.block(SECTION_HEIGHT + platforms * 16)
+        layout.section = 'tech_events'
+        layout.bullets(events)
+        layout.section = None
+        layout.text(cv_data.get('community_associations'), CONTENT_WIDTH, spacing=20)
+
+    for field in ('achievements', 'community_activities'):
+        layout.section = field
+        if _as_list(cv_data.get(field)):
+            layout.block(SECTION_HEIGHT)
+            layout.bullets(cv_data[field])
+
+    layout.section = None
+    languages = _as_list(cv_data.get('languages'))
+    if languages:
+        layout.block(SECTION_HEIGHT + (len(languages) + 1) * LANGUAGE_ROW_HEIGHT)
+
+    return layout
+
+
+def over_budget(estimate: dict, max_pages: int, max_render_ms: int) -> str | None:
+    """
+    Describe how an estimate exceeds the budget
+
+    Args:
+        estimate: Result of estimate_cv
+        max_pages: Page budget (0 disables the check)
+        max_render_ms: Render time budget in milliseconds (0 disables the check)
+
+    Returns:
+        Human readable reason, or None if the estimate is within budget
+    """
+    if max_pages and estimate['pages'] > max_pages:
+        return f"CV is estimated at {estimate['pages']} pages, over the {max_pages} page limit"
+    if max_render_ms and estimate['render_ms'] > max_render_ms:
+        return (f"CV is estimated to take {estimate['render_ms']} ms to render, "
+                f"over the {max_render_ms} ms limit")
+    return None
+
+
+def trim_cv(cv_data: dict, max_pages: int, max_render_ms: int) -> tuple[dict, dict, list]:
+    """
+    Shorten a CV until its estimate fits the budget
+
+    Trims the tallest section first: the last bullet of its entry with the
+    most bullets, or once every entry is down to MIN_BULLETS, its last
+    entry. Sections that are not causing the overflow stay intact as long
+    as a taller one can still be shortened. The cuts are planned on bullet
+    and entry heights measured once (_TrimPlan), so trimming costs about
+    two estimates however many bullets are removed.
+
+    Args:
+        cv_data: CV data as posted to /api/generate_pdf
+        max_pages: Page budget (0 disables the check)
+        max_render_ms: Render time budget in milliseconds (0 disables the check)
+
+    Returns:
+        Tuple of (trimmed copy of the CV data, its estimate, list of
+        "field: N removed" notes). The copy may still be over budget if
+        every section is down to MIN_BULLETS bullets and MIN_ENTRIES entries.
+    """
+    trimmed = copy.deepcopy(cv_data)
+    removed = {}
+    photo = _has_photo(trimmed)
+
+    # The confirming estimate only disagrees with the plan through rounding,
+    # in which case the next plan removes the last few items
+    while True:
+        layout = _layout_cv(trimmed)
+        estimate = _summarize(layout.height, layout.lines, layout.blocks, photo)
+        if not over_budget(estimate, max_pages, max_render_ms):
+            break
+        plan = _TrimPlan(trimmed, layout)
+        if not plan.trim(max_pages, max_render_ms, photo):
+            break
+        plan.apply(trimmed, removed)
+
+    notes = [f"{field}: {count} removed" for field, count in removed.items()]
+    return trimmed, estimate, notes
+
+
+def apply_budget(cv_data: dict, max_pages: int, max_render_ms: int,
+                 action: str = 'warn') -> tuple[dict | None, dict, str | None, list]:
+    """
+    Check a CV against the budget and act on an overflow
+
+    Args:
+        cv_data: CV data as posted to /api/generate_pdf
+        max_pages: Page budget (0 disables the check)
+        max_render_ms: Render time budget in milliseconds (0 disables the check)
+        action: 'warn' keeps the CV as it is, 'trim' shortens it with
+            trim_cv, 'reject' refuses it
+
+    Returns:
+        Tuple of (CV data to render, or None if rejected; its estimate;
+        why it is still over budget, or None; trim_cv notes)
+    """
+    estimate = estimate_cv(cv_data)
+    reason = over_budget(estimate, max_pages, max_render_ms)
+    if reason is None:
+        return cv_data, estimate, None, []
+    if action == 'reject':
+        return None, estimate, reason, []
+
+    notes = []
+    if action == 'trim':
+        cv_data, estimate, notes = trim_cv(cv_data, max_pages, max_render_ms)
+        reason = over_budget(estimate, max_pages, max_render_ms)
+    return cv_data, estimate, reason, notes
+
+
+class _TrimPlan:
+    """
+    trim_cv's greedy cuts worked out on measured heights
+
+    Every bullet and entry of the trimmable sections is measured once; a cut
+    subtracts its height, lines and blocks from the layout totals instead of
+    laying the CV out again.
+    """
+
+    def __init__(self, cv_data: dict, layout: _Layout):
+        self.totals = [layout.height, layout.lines, layout.blocks]
+        self.heights = dict(layout.section_heights)
+        self.sections = {field: _measure_section(cv_data, field)
+                         for field in TRIMMABLE_ENTRIES + TRIMMABLE_LISTS}
+        self.removed = {}
+
+    def trim(self, max_pages: int, max_render_ms: int, photo: bool) -> bool:
+        """Cut until the totals fit the budget; False if nothing could be cut"""
+        trimmed = False
+        while over_budget(_summarize(*self.totals, photo), max_pages, max_render_ms):
+            sections = sorted(self.sections, key=lambda field: -self.heights.get(field, 0))
+            for field in sections:
+                if self.heights.get(field) and self._cut(field):
+                    break
+            else:
+                break
+            trimmed = True
+        return trimmed
+
+    def apply(self, cv_data: dict, removed: dict) -> None:
+        """Make the planned cuts in the CV data and add them to removed"""
+        for field, section in self.sections.items():
+            if section['kept'] == len(section['entries']):
+                continue
+            cv_data[field] = [entry['item'] for entry in section['entries'][:section['kept']]]
+        for section in self.sections.values():
+            for entry in section['entries'][:section['kept']]:
+                if entry['kept'] < len(entry['bullets']):
+                    entry['item']['bullets'] = _as_list(entry['item']['bullets'])[:entry['kept']]
+        for key, count in self.removed.items():
+            removed[key] = removed.get(key, 0) + count
+
+    def _cut(self, field: str) -> bool:
+        """Remove one bullet or one entry from a section; False if it is at its minimum"""
+        section = self.sections[field]
+        entries = section['entries'][:section['kept']]
+        if field in BULLET_FIELDS:
+            candidates = [entry for entry in entries if entry['kept'] > MIN_BULLETS]
+            if candidates:
+                # Ties go to the later entry, keeping the first (most relevant) ones whole
+                entry = max(reversed(candidates), key=lambda entry: entry['kept'])
+                entry['kept'] -= 1
+                self._subtract(field, entry['bullets'][entry['kept']], f"{field} bullets")
+                return True
+        if section['kept'] > MIN_ENTRIES:
+            entry = entries[-1]
+            section['kept'] -= 1
+            cost = [sum(values) for values in zip(entry['cost'], *entry['bullets'][:entry['kept']])]
+            self._subtract(field, cost, field)
+            return True
+        return False
+
+    def _subtract(self, field: str, cost, key: str) -> None:
+        for index, value in enumerate(cost):
+            self.totals[index] -= value
+        self.heights[field] -= cost[0]
+        self.removed[key] = self.removed.get(key, 0) + 1
+
+
+def _measure_section(cv_data: dict, field: str) -> dict:
+    """
+    Measure a trimmable section as _layout_cv lays it out
+
+    Returns:
+        Dict with entries (item, cost of the entry without its bullets,
+        cost per bullet, bullets kept) and the number of entries kept;
+        a cost is (height, lines, blocks), zero for items that are not rendered
+    """
+    entries = []
+    for item in _as_list(cv_data.get(field)):
+        bullets = []
+        if field in ENTRY_TITLES:
+            rendered = isinstance(item, dict) and item.get(ENTRY_TITLES[field])
+            if isinstance(item, dict):
+                bullets = [_cost(lambda layout: layout.bullets([bullet])) if rendered else (0, 0, 0)
+                           for bullet in _as_list(item.get('bullets'))]
+
+            def frame(layout, item=item):
+                layout.block(14 + ENTRY_GAP)
+                _entry_body(layout, field, item, bullets=False)
+
+            cost = _cost(frame) if rendered else (0, 0, 0)
+        elif field == 'certifications':
+            rendered = isinstance(item, dict) and item.get('title')
+            cost = _cost(lambda layout: _certification(layout, item)) if rendered else (0, 0, 0)
+        else:
+            cost = _cost(lambda layout: layout.bullets([item]))
+        entries.append({'item': item, 'cost': cost, 'bullets': bullets, 'kept': len(bullets)})
+    return {'entries': entries, 'kept': len(entries)}
+
+
+def _cost(add) -> tuple:
+    """Height, lines and blocks that add puts on an empty layout"""
+    layout = _Layout()
+    add(layout)
+    return layout.height, layout.lines, layout.blocks
+
+
+def _entry_body(layout: _Layout, field: str, item: dict, bullets: bool = True) -> None:
+    """Add an entry's bullets and, for projects, its tech and link lines"""
+    if field == 'projects':
+        layout.text(item.get('tech'), CONTENT_WIDTH - 8, leading=12, size=9.5, spacing=4)
+    if bullets:
+        layout.bullets(item.get('bullets'))
+    if field == 'projects':
+        layout.text(item.get('link'), CONTENT_WIDTH - 8, leading=11.5, size=9, spacing=2)
+
+
+def _certification(layout: _Layout, cert: dict) -> None:
+    layout.text(f"{cert.get('title')} - {cert.get('source') or ''} {cert.get('date') or ''}",
+                CONTENT_WIDTH, spacing=3)
+
+
+def _has_photo(cv_data: dict) -> bool:
+    return bool(cv_data.get('photo_url') or cv_data.get('photo_id'))
+
+
+def _entries(layout: _Layout, cv_data: dict, field: str, title_field: str, body) -> None:
+    """Add a section of entries that have their title field set"""
+    items = [item for item in _as_list(cv_data.get(field))
+             if isinstance(item, dict) and item.get(title_field)]
+    if not items:
+        return
+    layout.block(SECTION_HEIGHT)
+    for item in items:
+        layout.block(14 + ENTRY_GAP)
+        body(item)
+
+
+def _as_list(value) -> list:
+    """Normalize list fields that may arrive as newline separated strings"""
+    if isinstance(value, list):
+        return [item for item in value if item]
+    if isinstance(value, str):
+        return [line.strip() for line in value.split('\n') if line.strip()]
+    return []
@@ -0,0 +1,202 @@
+"""
+PDF Jobs - Asynchronous PDF generation with a shared on-disk result store
+Jobs run on a bounded thread pool in the worker that accepted them; status and
+results live on disk so any gunicorn worker can answer status and download polls
+"""
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from ..config import Config
+
+logger = logging.getLogger(__name__)
+
+
+JOB_ID_RE = re.compile(r'^[0-9a-f]{32}$')
+
+STATUS_QUEUED = 'queued'
+STATUS_RUNNING = 'running'
+STATUS_DONE = 'done'
+STATUS_FAILED = 'failed'
+
+
+class PDFJobService:
+    """Service for queuing PDF renders and serving their results later"""
+
+    def __init__(self, job_dir: str, workers: int = 2, max_pending: int = 32,
+                 ttl: int = 600, cleanup_interval: int = 60):
+        self.job_dir = job_dir
+        self.workers = workers
+        self.ttl = ttl
+        self.cleanup_interval = cleanup_interval
+        self._slots = threading.BoundedSemaphore(workers + max_pending)
+        self._executor = None
+        self._lock = threading.Lock()
+        self._last_cleanup = 0.0
+
+    def submit(self, app, cv_data: dict) -> tuple[str, None] | tuple[None, str]:
+        """
+        Queue a PDF render
+
+        Args:
+            app: Flask application the job renders under
+            cv_data: Dictionary containing all CV information
+
+        Returns:
+            Tuple of (job id, None) or (None, error message) if the queue is full
+        """
+        self._maybe_cleanup()
+
+        if not self._slots.acquire(blocking=False):
+            return None, 'Too many PDF jobs are queued, please retry shortly'
+
+        job_id = uuid.uuid4().hex
+        self._write_status(job_id, {
+            'job_id': job_id,
+            'status': STATUS_QUEUED,
+            'created_at': time.time()
+        })
+
+        try:
+            future = self._get_executor().submit(self._run, app, job_id, cv_data)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+
+        return job_id, None
+
+    def get_status(self, job_id: str) -> dict | None:
+        """
+        Read a job's status record
+
+        Args:
+            job_id: Job id returned by submit
+
+        Returns:
+            Status dictionary or None if the job is unknown or expired
+        """
+        if not JOB_ID_RE.match(job_id or ''):
+            return None
+        try:
+            with open(self._status_path(job_id), 'r', encoding='utf-8') as f:
+                status = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if time.time() - status.get('created_at', 0) > self.ttl:
+            return None
+        return status
+
+    def get_result_path(self, job_id: str) -> str | None:
+        """
+        Get the path of a finished job's PDF
+
+        Args:
+            job_id: Job id returned by submit
+
+        Returns:
+            Path to the PDF file or None if the job is not done
+        """
+        status = self.get_status(job_id)
+        if not status or status['status'] != STATUS_DONE:
+            return None
+        path = self._pdf_path(job_id)
+        return path if os.path.exists(path) else None
+
+    def cleanup(self) -> int:
+        """
+        Delete job files older than the TTL
+
+        Returns:
+            Number of files removed
+        """
+        removed = 0
+        cutoff = time.time() - self.ttl
+        try:
+            entries = list(os.scandir(self.job_dir))
+        except OSError:
+            return 0
+        for entry in entries:
+            try:
+                if entry.stat().st_mtime < cutoff:
+                    os.remove(entry.path)
+                    removed += 1
+            except OSError:
+                continue
+        return removed
+
+    def _run(self, app, job_id: str, cv_data: dict) -> None:
+        """Render one job and record the outcome"""
+        from .pdf_service import pdf_service
+
+        status = self.get_status(job_id) or {'job_id': job_id, 'created_at': time.time()}
+        status['status'] = STATUS_RUNNING
+        status['started_at'] = time.time()
+        self._write_status(job_id, status)
+
+        try:
+            with app.app_context():
+                pdf_buffer, result = pdf_service.generate(cv_data)
+        except Exception as e:
+            pdf_buffer, result = None, str(e)
+
+        status['finished_at'] = time.time()
+        if pdf_buffer is None:
+            logger.error("PDF job %s failed: %s", job_id, result)
+            status['status'] = STATUS_FAILED
+            status['error'] = result
+        else:
+            self._write_atomic(self._pdf_path(job_id), pdf_buffer.getbuffer())
+            status['status'] = STATUS_DONE
+            status['filename'] = result
+        self._write_status(job_id, status)
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                os.makedirs(self.job_dir, exist_ok=True)
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers,
+                    thread_name_prefix='pdf-job'
+                )
+            return self._executor
+
+    def _maybe_cleanup(self) -> None:
+        """Run TTL cleanup at most once per cleanup interval"""
+        now = time.time()
+        if now - self._last_cleanup < self.cleanup_interval:
+            return
+        self._last_cleanup = now
+        self.cleanup()
+
+    def _status_path(self, job_id: str) -> str:
+        return os.path.join(self.job_dir, f"{job_id}.json")
+
+    def _pdf_path(self, job_id: str) -> str:
+        return os.path.join(self.job_dir, f"{job_id}.pdf")
+
+    def _write_status(self, job_id: str, status: dict) -> None:
+        self._write_atomic(self._status_path(job_id), json.dumps(status).encode('utf-8'))
+
+    def _write_atomic(self, path: str, data) -> None:
+        """Write via a temp file so readers in other workers never see partial files"""
+        os.makedirs(self.job_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.job_dir, suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+
+# Singleton instance
+pdf_job_service = PDFJobService(
+    job_dir=Config.PDF_JOB_DIR,
+    workers=Config.PDF_JOB_WORKERS,
+    max_pending=Config.PDF_JOB_QUEUE_SIZE,
+    ttl=Config.PDF_JOB_TTL
+)
@@ -0,0 +1,113 @@
+"""
+PDF Optimizer - Optional size reduction of rendered PDFs
+xhtml2pdf writes page content streams uncompressed and ASCII85-encodes embedded
+images, which makes downloads larger than they need to be on slow connections
+"""
+import base64
+import logging
+import time
+from io import BytesIO
+
+logger = logging.getLogger(__name__)
+
+
+def optimize_pdf(pdf_bytes: bytes) -> tuple[bytes, dict]:
+    """
+    Losslessly shrink a rendered PDF
+
+    Compresses page content streams, stores ASCII85-wrapped images as raw
+    binary, merges identical objects (fonts, repeated images) and drops
+    unreferenced ones. Image data itself is never re-encoded. Uses pypdf,
+    which xhtml2pdf already depends on; PyPDF2 3.x cannot clone a document
+    or merge identical objects.
+
+    Args:
+        pdf_bytes: PDF produced by xhtml2pdf
+
+    Returns:
+        Tuple of (PDF bytes, stats dict with original_size, optimized_size
+        and elapsed_ms). The original bytes are returned if optimizing fails
+        or would not make the file smaller.
+    """
+    started = time.perf_counter()
+    optimized = pdf_bytes
+
+    try:
+        from pypdf import PdfWriter
+
+        writer = PdfWriter(clone_from=BytesIO(pdf_bytes))
+        for page in writer.pages:
+            page.compress_content_streams()
+            _strip_image_ascii85(page)
+        writer.compress_identical_objects(remove_duplicates=True, remove_unreferenced=True)
+
+        output = BytesIO()
+        writer.write(output)
+        if output.tell() < len(pdf_bytes):
+            optimized = output.getvalue()
+    except Exception as e:
+        logger.warning("PDF optimization failed, keeping original: %s", e)
+
+    stats = {
+        'original_size': len(pdf_bytes),
+        'optimized_size': len(optimized),
+        'elapsed_ms': round((time.perf_counter() - started) * 1000, 1)
+    }
+    return optimized, stats
+
+
+def apply_optimization(pdf_bytes: bytes, optimize: bool) -> bytes:
+    """
+    Run optimize_pdf when requested and log the size saving
+
+    Args:
+        pdf_bytes: Rendered PDF
+        optimize: Whether the request asked for optimization
+
+    Returns:
+        Optimized or original PDF bytes
+    """
+    if not optimize:
+        return pdf_bytes
+
+    optimized, stats = optimize_pdf(pdf_bytes)
+    saved = 1 - stats['optimized_size'] / stats['original_size']
+    logger.info("PDF optimized: %d -> %d bytes (-%.1f%%) in %s ms",
+                stats['original_size'], stats['optimized_size'], saved * 100, stats['elapsed_ms'])
+    return optimized
+
+
+def _strip_image_ascii85(page) -> None:
+    """Replace ASCII85 text encoding of a page's image XObjects with raw bytes"""
+    from pypdf.generic import ArrayObject, NameObject, StreamObject
+
+    resources = page.get('/Resources')
+    xobjects = resources.get_object().get('/XObject') if resources else None
+    if not xobjects:
+        return
+
+    for ref in xobjects.get_object().values():
+        stream = ref.get_object()
+        if stream.get('/Subtype') != '/Image':
+            continue
+        filters = stream.get('/Filter')
+        if not isinstance(filters, ArrayObject) or not filters or filters[0] != '/ASCII85Decode':
+            continue
+
+        raw = base64.a85decode(stream._data, adobe=True)
+        if len(raw) >= len(stream._data):
+            # ASCII85 abbreviates zero runs, so flat images can be smaller encoded
+            continue
+        remaining = filters[1:]
+        if len(remaining) == 1:
+            stream[NameObject('/Filter')] = remaining[0]
+        else:
+            stream[NameObject('/Filter')] = ArrayObject(remaining)
+
+        parms = stream.get('/DecodeParms')
+        if isinstance(parms, ArrayObject) and len(parms) == len(filters):
+            stream[NameObject('/DecodeParms')] = ArrayObject(parms[1:])
+
+        # EncodedStreamObject.set_data only accepts Flate streams
+        StreamObject.set_data(stream, raw)
+        stream.decoded_self = None
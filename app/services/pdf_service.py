@@ -4,11 +4,98 @@ PDF Service - Handles CV PDF generation using xhtml2pdf
 import os
 import re
 import base64
+import hashlib
+import logging
+from importlib.metadata import version as package_version
 from io import BytesIO
 from flask import render_template, current_app
-from xhtml2pdf import pisa
+from ..config import Config
+from ..metrics import stage
+from ..tracing import span
+from .cv_fragments import FragmentCache, CV_SECTIONS, SECTIONS_TEMPLATE_DIR
+from .pdf_backends import XHTML2PDFBackend, ReportLabBackend
+from .pdf_cache import PDFCache, canonical_hash
+from .photo_service import photo_service
+from .photo_store import photo_store
+from .render_pool import RenderPool, RenderPoolBusyError, html_to_pdf, link_callback
+from reportlab import Version as reportlab_version
 from .styles import get_cv_styles
 
+logger = logging.getLogger(__name__)
+
+
+TEMPLATES_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'templates')
+TEMPLATE_PATH = os.path.join(TEMPLATES_DIR, 'cv_template.html')
+REPORTLAB_BACKEND_PATH = os.path.join(os.path.dirname(__file__), 'reportlab_backend.py')
+
+# Minimal CV touching every template section, used to warm up rendering state
+WARM_UP_CV_DATA = {
+    'full_name': 'Warm Up',
+    'email': 'warm.up@example.com',
+    'phone': '0000000000',
+    'cohort': 'Data Analyst',
+    'dream_company': 'Example',
+    'target_role': 'Engineer',
+    'qualifications': [{'degree': 'B.Tech', 'institution': 'Example'}],
+    'prog_languages': 'Python',
+    'experiences': [{'company': 'Example', 'role': 'Engineer', 'bullets': ['Work']}],
+    'internships': [{'company': 'Example', 'bullets': ['Work']}],
+    'projects': [{'name': 'Example', 'tech': 'Python', 'bullets': ['Work']}],
+    'certifications': [{'title': 'Example', 'source': 'Example'}],
+    'responsibilities': [{'role': 'Lead', 'bullets': ['Work']}],
+    'leetcode': 'example',
+    'tech_events': ['Example'],
+    'achievements': ['Example'],
+    'community_activities': ['Example'],
+    'languages': [{'name': 'English', 'abilities': ['Speak']}]
+}
+
+
+# Map of problematic Unicode characters to safe ASCII replacements
+UNICODE_REPLACEMENTS = {
+    '\u2022': '-',   # Bullet •
+    '\u2023': '-',   # Triangle bullet
+    '\u2043': '-',   # Hyphen bullet
+    '\u2219': '-',   # Bullet operator
+    '\u25CF': '-',   # Black circle
+    '\u25E6': '-',   # White bullet
+    '\u25AA': '-',   # Black small square
+    '\u25AB': '-',   # White small square
+    '\u2013': '-',   # En dash
+    '\u2014': '--',  # Em dash
+    '\u2018': "'",   # Left single quote
+    '\u2019': "'",   # Right single quote
+    '\u201C': '"',   # Left double quote
+    '\u201D': '"',   # Right double quote
+    '\u2026': '...', # Ellipsis
+    '\u00A0': ' ',   # Non-breaking space
+    '\u200B': '',    # Zero-width space
+    '\u200C': '',    # Zero-width non-joiner
+    '\u200D': '',    # Zero-width joiner
+    '\uFEFF': '',    # BOM
+    '\u2212': '-',   # Minus sign
+    '\u00B7': '-',   # Middle dot
+    '\u2192': '->',  # Right arrow
+    '\u2190': '<-',  # Left arrow
+    '\u2794': '->',  # Heavy arrow
+    '\u25B6': '>',   # Play button
+    '\u25B8': '>',   # Small play button
+    '\u2605': '*',   # Black star
+    '\u2606': '*',   # White star
+    '\u2713': '/',   # Check mark
+    '\u2714': '/',   # Heavy check mark
+    '\u2717': 'X',   # Ballot X
+    '\u2718': 'X',   # Heavy ballot X
+}
+
+# Single-pass matcher for all mapped characters. Measured faster than
+# str.translate, which takes a slow path for multi-character replacements
+_SANITIZE_RE = re.compile('[' + ''.join(UNICODE_REPLACEMENTS) + ']')
+
+
+def _replace_unicode_match(match):
+    return UNICODE_REPLACEMENTS[match.group()]
+
 
 def sanitize_text(text):
     """
@@ -18,135 +105,286 @@ def sanitize_text(text):
     if not isinstance(text, str):
         return text
     
-    # Map of problematic Unicode characters to safe ASCII replacements
-    replacements = {
-        '\u2022': '-',   # Bullet •
-        '\u2023': '-',   # Triangle bullet
-        '\u2043': '-',   # Hyphen bullet
-        '\u2219': '-',   # Bullet operator
-        '\u25CF': '-',   # Black circle
-        '\u25E6': '-',   # White bullet
-        '\u25AA': '-',   # Black small square
-        '\u25AB': '-',   # White small square
-        '\u2013': '-',   # En dash
-        '\u2014': '--',  # Em dash
-        '\u2018': "'",   # Left single quote
-        '\u2019': "'",   # Right single quote
-        '\u201C': '"',   # Left double quote
-        '\u201D': '"',   # Right double quote
-        '\u2026': '...', # Ellipsis
-        '\u00A0': ' ',   # Non-breaking space
-        '\u200B': '',    # Zero-width space
-        '\u200C': '',    # Zero-width non-joiner
-        '\u200D': '',    # Zero-width joiner
-        '\uFEFF': '',    # BOM
-        '\u2212': '-',   # Minus sign
-        '\u00B7': '-',   # Middle dot
-        '\u2192': '->',  # Right arrow
-        '\u2190': '<-',  # Left arrow
-        '\u2794': '->',  # Heavy arrow
-        '\u25B6': '>',   # Play button
-        '\u25B8': '>',   # Small play button
-        '\u2605': '*',   # Black star
-        '\u2606': '*',   # White star
-        '\u2713': '/',   # Check mark
-        '\u2714': '/',   # Heavy check mark
-        '\u2717': 'X',   # Ballot X
-        '\u2718': 'X',   # Heavy ballot X
-    }
-    
-    for unicode_char, replacement in replacements.items():
-        text = text.replace(unicode_char, replacement)
+    # Every replaced character is non-ASCII, so pure ASCII needs no work
+    if text.isascii():
+        return text
     
-    return text
+    sanitized = _SANITIZE_RE.sub(_replace_unicode_match, text)
+    return text if sanitized == text else sanitized
 
 
 def sanitize_data_recursive(data):
-    """Recursively sanitize all string values in a dictionary or list."""
+    """
+    Recursively sanitize all string values in a dictionary or list.
+    
+    Containers are only copied when something inside them changed; otherwise
+    the original object is returned, so ASCII-only CVs are not copied at all
+    and the caller's data is never mutated.
+    """
     if isinstance(data, str):
         return sanitize_text(data)
     elif isinstance(data, dict):
-        return {key: sanitize_data_recursive(value) for key, value in data.items()}
+        sanitized = None
+        for key, value in data.items():
+            new_value = sanitize_data_recursive(value)
+            if new_value is not value:
+                if sanitized is None:
+                    sanitized = dict(data)
+                sanitized[key] = new_value
+        return data if sanitized is None else sanitized
     elif isinstance(data, list):
-        return [sanitize_data_recursive(item) for item in data]
+        sanitized = None
+        for index, item in enumerate(data):
+            new_item = sanitize_data_recursive(item)
+            if new_item is not item:
+                if sanitized is None:
+                    sanitized = list(data)
+                sanitized[index] = new_item
+        return data if sanitized is None else sanitized
     else:
         return data
 
 
-def link_callback(uri, rel):
-    """
-    Convert file:// URIs to absolute paths for xhtml2pdf
-    """
-    if uri.startswith('file:///'):
-        path = uri.replace('file:///', '')
-        return path
-    return uri
-
-
 class PDFService:
     """Service for generating PDF CVs"""
     
     def __init__(self):
         self.styles = get_cv_styles()
+        self.render_version = self._compute_render_version()
+        self.fragment_cache = FragmentCache(max_items=Config.CV_FRAGMENT_CACHE_ITEMS)
+        self.backends = {
+            backend.name: backend
+            for backend in (XHTML2PDFBackend(self._render_html), ReportLabBackend())
+        }
+        self.cache = None
+        if Config.PDF_CACHE_ENABLED:
+            self.cache = PDFCache(
+                cache_dir=Config.PDF_CACHE_DIR,
+                max_items=Config.PDF_CACHE_MEMORY_ITEMS,
+                max_memory_bytes=Config.PDF_CACHE_MEMORY_BYTES,
+                max_disk_bytes=Config.PDF_CACHE_DISK_BYTES
+            )
+        self.render_pool = None
+        if Config.PDF_RENDER_PROCESSES > 0:
+            self.render_pool = RenderPool(
+                processes=Config.PDF_RENDER_PROCESSES,
+                max_pending=Config.PDF_RENDER_QUEUE_SIZE,
+                queue_timeout=Config.PDF_RENDER_QUEUE_TIMEOUT,
+                render_timeout=Config.PDF_RENDER_TIMEOUT
+            )
+    
+    def start_render_pool(self) -> None:
+        """Start and warm the render worker processes, if configured"""
+        if self.render_pool is not None:
+            self.render_pool.start()
+    
+    def cache_key(self, cv_data: dict, optimize: bool = False, backend: str = None,
+                  photo: tuple[bytes, str] = None) -> str:
+        """
+        Get the content hash identifying the PDF rendered for this CV data
+        
+        Also used as the HTTP ETag for PDF responses.
+        
+        Args:
+            cv_data: Dictionary containing all CV information
+            optimize: Whether the PDF is post-processed by optimize_pdf
+            backend: PDF backend name (defaults to Config.PDF_BACKEND)
+            photo: Binary photo sent alongside the CV data, as (bytes, MIME type)
+            
+        Returns:
+            Hex digest of the canonical CV JSON plus template/styles version
+        """
+        parts = [cv_data, self.render_version]
+        if optimize:
+            parts.append('optimized')
+        backend = backend or Config.PDF_BACKEND
+        if backend != XHTML2PDFBackend.name:
+            parts.append(f"backend:{backend}")
+        if photo is not None:
+            parts.append(f"photo:{hashlib.sha256(photo[0]).hexdigest()}")
+        return canonical_hash(*parts)
     
-    def generate(self, cv_data: dict) -> tuple[BytesIO, str] | tuple[None, str]:
+    def generate(self, cv_data: dict, optimize: bool = None, backend: str = None,
+                 photo: tuple[bytes, str] = None) -> tuple[BytesIO, str] | tuple[None, str]:
         """
         Generate a PDF CV from CV data
         
+        Identical CV data is served from the rendered-PDF cache.
+        
         Args:
             cv_data: Dictionary containing all CV information
+            optimize: Losslessly shrink the PDF after rendering
+                (defaults to Config.PDF_OPTIMIZE)
+            backend: PDF backend name, see self.backends
+                (defaults to Config.PDF_BACKEND)
+            photo: Binary photo as (bytes, MIME type), used instead of
+                cv_data's photo_url without passing through base64 JSON
             
         Returns:
             Tuple of (BytesIO buffer, filename) or (None, error message)
         """
+        if optimize is None:
+            optimize = Config.PDF_OPTIMIZE
+        backend = backend or Config.PDF_BACKEND
+        pdf_backend = self.backends.get(backend)
+        if pdf_backend is None:
+            return None, f"Unknown PDF backend: {backend}"
+        
         try:
-            # Preprocess data for template
-            processed_data = self._preprocess_cv_data(cv_data)
+            filename = self._build_filename(cv_data)
             
-            # Sanitize all text to remove problematic Unicode characters
-            processed_data = sanitize_data_recursive(processed_data)
+            cache_key = None
+            if self.cache is not None:
+                with span('pdf_cache_get'):
+                    cache_key = self.cache_key(cv_data, optimize, backend, photo)
+                    cached_pdf = self.cache.get(cache_key)
+                if cached_pdf is not None:
+                    return BytesIO(cached_pdf), filename
             
-            # Render HTML template
-            html_content = render_template(
-                'cv_template.html',
-                data=processed_data,
-                cv_styles=self.styles
-            )
+            render_func, args = pdf_backend.build_task(self._prepare_data(cv_data, photo))
             
-            # Generate PDF with link_callback for image handling
-            result_buffer = BytesIO()
-            pisa_status = pisa.CreatePDF(
-                src=BytesIO(html_content.encode('utf-8')),
-                dest=result_buffer,
-                encoding='utf-8',
-                link_callback=link_callback
-            )
+            # Convert to PDF, in a worker process when the render pool is enabled
+            # (its pisa_create_pdf stage then runs outside this request's trace)
+            with span('pdf_convert'):
+                if self.render_pool is not None:
+                    pdf_bytes = self.render_pool.render(render_func, *args, optimize)
+                else:
+                    pdf_bytes = render_func(*args, optimize)
+            
+            if cache_key is not None:
+                with span('pdf_cache_put'):
+                    self.cache.put(cache_key, pdf_bytes)
             
-            if pisa_status.err:
-                print(f"[ERROR] PDF generation error: {pisa_status.err}")
-                return None, "PDF generation failed"
+            return BytesIO(pdf_bytes), filename
+        
+        except RenderPoolBusyError:
+            # Let routes answer 503 so clients back off and retry
+            raise
+        
+        except TimeoutError:
+            logger.error("PDF generation timed out after %ss", Config.PDF_RENDER_TIMEOUT)
+            return None, "PDF generation timed out"
             
-            result_buffer.seek(0)
+        except RuntimeError as e:
+            logger.error("PDF generation error: %s", e)
+            return None, "PDF generation failed"
             
-            # Generate filename
-            name = cv_data.get('full_name', 'CV')
-            safe_name = "".join(c for c in name if c.isalnum() or c in ' -_').strip()
-            filename = f"{safe_name}_CV.pdf" if safe_name else "CV.pdf"
+        except Exception as e:
+            logger.exception("PDF generation exception: %s", e)
+            return None, str(e)
+    
+    def build_html(self, cv_data: dict) -> str:
+        """
+        Build the exact HTML document that is converted to PDF
+        
+        Args:
+            cv_data: Dictionary containing all CV information
             
-            return result_buffer, filename
+        Returns:
+            Preprocessed, sanitized CV HTML with inlined styles
+        """
+        return self._render_html(self._prepare_data(cv_data))
+    
+    def preview_html(self, cv_data: dict) -> tuple[str, None] | tuple[None, str]:
+        """
+        Render the PDF input HTML without running xhtml2pdf
+        
+        Args:
+            cv_data: Dictionary containing all CV information
             
+        Returns:
+            Tuple of (HTML document, None) or (None, error message)
+        """
+        try:
+            return self.build_html(cv_data), None
         except Exception as e:
-            print(f"[ERROR] PDF generation exception: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("HTML preview exception: %s", e)
             return None, str(e)
     
+    def warm_up(self) -> None:
+        """
+        Pay first-render costs before the first request
+        
+        Compiles the CV template, parses and indexes the CV stylesheet and
+        registers fonts, then renders once with every backend, so user
+        renders reuse that state. Must run inside an application context.
+        """
+        processed_data = self._prepare_data(WARM_UP_CV_DATA)
+        for backend in self.backends.values():
+            render_func, args = backend.build_task(processed_data)
+            render_func(*args)
+    
+    def _prepare_data(self, cv_data: dict, photo: tuple[bytes, str] = None) -> dict:
+        """Preprocess CV data and sanitize it for rendering by any backend"""
+        with stage('preprocess'):
+            # Preprocess data for template
+            processed_data = self._preprocess_cv_data(cv_data)
+            
+            # Sanitize all text to remove problematic Unicode characters
+            with span('sanitize'):
+                processed_data = sanitize_data_recursive(processed_data)
+            
+            # A binary photo is attached after sanitizing: it is not text
+            if photo is not None:
+                processed_data = dict(processed_data)
+                processed_data['photo_data'] = self._photo_data_url(*photo)
+            return processed_data
+    
+    def _photo_data_url(self, image_bytes: bytes, mime_type: str) -> str:
+        """Normalize photo bytes into the data URL embedded in the PDF"""
+        with span('photo'):
+            return photo_service.normalize_image(image_bytes) or \
+                f"data:{mime_type};base64,{base64.b64encode(image_bytes).decode('utf-8')}"
+    
+    def _render_html(self, processed_data: dict) -> str:
+        """Render the CV template with inlined styles, reusing unchanged sections"""
+        with stage('template_render'):
+            with span('template_sections'):
+                fragments = self.fragment_cache.render_sections(
+                    current_app.jinja_env, processed_data, self.render_version
+                )
+            with span('template_page'):
+                return render_template(
+                    'cv_template.html',
+                    data=processed_data,
+                    fragments=fragments,
+                    cv_styles=self.styles
+                )
+    
+    def _build_filename(self, cv_data: dict) -> str:
+        """Build the download filename from the candidate's name"""
+        name = cv_data.get('full_name', 'CV')
+        safe_name = "".join(c for c in name if c.isalnum() or c in ' -_').strip()
+        return f"{safe_name}_CV.pdf" if safe_name else "CV.pdf"
+    
+    def _compute_render_version(self) -> str:
+        """
+        Fingerprint everything besides CV data that affects the rendered PDF
+        
+        Editing the templates, styles or ReportLab layout, or upgrading
+        xhtml2pdf or ReportLab, changes the version and so invalidates every
+        cached PDF and section fragment.
+        """
+        digest = hashlib.sha256()
+        template_paths = [TEMPLATE_PATH, REPORTLAB_BACKEND_PATH] + [
+            os.path.join(TEMPLATES_DIR, SECTIONS_TEMPLATE_DIR, f"{name}.html")
+            for name, _ in CV_SECTIONS
+        ]
+        for path in template_paths:
+            with open(path, 'rb') as f:
+                digest.update(f.read())
+        digest.update(self.styles.encode('utf-8'))
+        digest.update(package_version('xhtml2pdf').encode('utf-8'))
+        digest.update(reportlab_version.encode('utf-8'))
+        return digest.hexdigest()[:16]
+    
     def _preprocess_cv_data(self, cv_data: dict) -> dict:
         """
         Preprocess CV data for template rendering
         
         Handles:
-        - Photo path conversion to base64 data URI
+        - Photo normalization (fit to the photo box, stripped, recompressed)
+          and path conversion to base64 data URI
         - List fields that need to remain as arrays
         - Empty value handling
         - Data normalization
@@ -159,27 +397,37 @@ class PDFService:
         skill_labels = self._get_skill_labels_for_cohort(cohort)
         processed['skill_labels'] = skill_labels
         
-        # Handle photo - check if it's already a base64 data URL
-        if 'photo_url' in processed and processed['photo_url']:
-            photo_url = processed['photo_url']
+        # Handle photo - a photo store id, a base64 data URL or a legacy file path
+        if processed.get('photo_url') or processed.get('photo_id'):
+            photo_url = processed.get('photo_url') or ''
+            
+            stored_id = processed.get('photo_id') or photo_store.resolve_url(photo_url)
             
+            if stored_id:
+                # Uploaded to the photo store: read the bytes directly
+                stored = photo_store.get(stored_id)
+                if stored is not None:
+                    processed['photo_data'] = self._photo_data_url(*stored)
+                else:
+                    logger.warning("Photo %s not found or expired, rendering without photo", stored_id)
             # Check if it's already a base64 data URL (from in-memory upload)
-            if photo_url.startswith('data:image'):
-                # Already base64 encoded, use directly
-                processed['photo_data'] = photo_url
-                print(f"[DEBUG] Using base64 photo data directly")
+            elif photo_url.startswith('data:image'):
+                # Already base64 encoded; shrink to the photo box before embedding
+                with span('photo'):
+                    processed['photo_data'] = photo_service.normalize_data_url(photo_url) or photo_url
             elif photo_url.startswith('/uploads/'):
                 # Legacy: file path - try to read from disk
                 filename = photo_url.replace('/uploads/', '')
                 upload_folder = current_app.config.get('UPLOAD_FOLDER', 'uploads')
                 abs_path = os.path.join(upload_folder, filename)
                 
-                print(f"[DEBUG] Looking for photo at: {abs_path}")
-                
                 if os.path.exists(abs_path):
                     try:
                         with open(abs_path, 'rb') as img_file:
                             img_data = img_file.read()
+                        
+                        photo_data = photo_service.normalize_image(img_data)
+                        if photo_data is None:
                             img_base64 = base64.b64encode(img_data).decode('utf-8')
                             
                             # Determine image type
@@ -191,14 +439,15 @@ class PDFService:
                                 'gif': 'image/gif'
                             }.get(ext, 'image/jpeg')
                             
-                            processed['photo_data'] = f"data:{mime_type};base64,{img_base64}"
-                            print(f"[DEBUG] Photo converted to base64 successfully")
+                            photo_data = f"data:{mime_type};base64,{img_base64}"
+                        
+                        processed['photo_data'] = photo_data
                     except Exception as e:
-                        print(f"[ERROR] Could not read photo file: {e}")
+                        logger.error("Could not read uploaded photo file: %s", e)
                 else:
-                    print(f"[DEBUG] Photo file not found at: {abs_path}")
+                    logger.warning("Uploaded photo file not found, rendering without photo")
             else:
-                print(f"[DEBUG] Unknown photo URL format: {photo_url[:50]}...")
+                logger.warning("Unknown photo URL format, rendering without photo")
         
         # Ensure list fields are lists
         list_fields = [
@@ -0,0 +1,119 @@
+"""
+Photo Service - Normalizes profile photos before PDF embedding
+Decodes an uploaded photo once, fits it to the rendered photo box at print
+resolution, strips metadata and recompresses, caching the result by content hash
+"""
+import base64
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from io import BytesIO
+
+from ..config import Config
+
+logger = logging.getLogger(__name__)
+
+
+# Rendered size of .profile-photo in styles.py (width, height)
+PHOTO_BOX_CM = (2.8, 3.4)
+
+
+class PhotoService:
+    """Service for producing small, print-ready profile photos"""
+
+    def __init__(self, dpi: int = 300, quality: int = 85, max_items: int = 128):
+        self.dpi = dpi
+        self.quality = quality
+        self.max_items = max_items
+        self.size = tuple(round(cm / 2.54 * dpi) for cm in PHOTO_BOX_CM)
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    def normalize_data_url(self, data_url: str) -> str | None:
+        """
+        Normalize a photo given as a base64 data URL
+
+        Args:
+            data_url: data:image/...;base64,... string from the upload endpoint
+
+        Returns:
+            Normalized JPEG data URL, or None if the image could not be decoded
+        """
+        def load():
+            _, _, encoded = data_url.partition(',')
+            return base64.b64decode(encoded)
+
+        return self._normalize(hashlib.sha256(data_url.encode('utf-8')).hexdigest(), load)
+
+    def normalize_image(self, image_bytes: bytes) -> str | None:
+        """
+        Normalize a photo given as raw image bytes
+
+        Args:
+            image_bytes: Encoded PNG/JPEG bytes
+
+        Returns:
+            Normalized JPEG data URL, or None if the image could not be decoded
+        """
+        return self._normalize(hashlib.sha256(image_bytes).hexdigest(), lambda: image_bytes)
+
+    def _normalize(self, key: str, load) -> str | None:
+        """Look up a normalized photo by content hash, building it on a miss"""
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                return cached
+
+        try:
+            jpeg_bytes = self._fit_and_recompress(load())
+        except Exception as e:
+            logger.warning("Could not normalize photo, embedding original: %s", e)
+            return None
+
+        data_url = f"data:image/jpeg;base64,{base64.b64encode(jpeg_bytes).decode('ascii')}"
+        with self._lock:
+            self._cache[key] = data_url
+            while len(self._cache) > self.max_items:
+                self._cache.popitem(last=False)
+        return data_url
+
+    def _fit_and_recompress(self, image_bytes: bytes) -> bytes:
+        """
+        Decode, orient, crop to the photo box and re-encode as a clean JPEG
+
+        The crop matches the template's object-fit: cover. Re-encoding drops
+        EXIF (GPS, camera data) and ICC metadata.
+        """
+        from PIL import Image, ImageOps
+
+        with Image.open(BytesIO(image_bytes)) as image:
+            # Let the JPEG decoder downscale by 1/2-1/8 while decoding; the box
+            # may be rotated by EXIF orientation, so request the longer side
+            longest = max(self.size)
+            image.draft('RGB', (longest, longest))
+            image = ImageOps.exif_transpose(image)
+
+            if image.mode in ('RGBA', 'LA', 'P'):
+                image = image.convert('RGBA')
+                background = Image.new('RGB', image.size, (255, 255, 255))
+                background.paste(image, mask=image.getchannel('A'))
+                image = background
+            elif image.mode != 'RGB':
+                image = image.convert('RGB')
+
+            fitted = ImageOps.fit(image, self.size, method=Image.Resampling.LANCZOS)
+
+        output = BytesIO()
+        fitted.save(output, format='JPEG', quality=self.quality, optimize=True,
+                    dpi=(self.dpi, self.dpi))
+        return output.getvalue()
+
+
+# Singleton instance
+photo_service = PhotoService(
+    dpi=Config.PHOTO_PRINT_DPI,
+    quality=Config.PHOTO_JPEG_QUALITY,
+    max_items=Config.PHOTO_CACHE_ITEMS
+)
@@ -0,0 +1,127 @@
+"""
+Photo Store - Content-addressed store of uploaded profile photos
+Uploads are kept once on disk (shared by all workers) under a short id derived
+from their hash, so clients reference a photo by id instead of posting a
+multi-megabyte base64 data URL with every PDF request
+"""
+import hashlib
+import os
+import re
+import tempfile
+import threading
+import time
+
+from ..config import Config
+
+
+PHOTO_ID_PATTERN = re.compile(r'^[0-9a-f]{24}$')
+
+# Stored file extension per MIME type and back
+PHOTO_EXTENSIONS = {'image/jpeg': 'jpg', 'image/png': 'png'}
+PHOTO_MIME_TYPES = {ext: mime for mime, ext in PHOTO_EXTENSIONS.items()}
+
+# Route prefix of stored photo URLs, as returned by the upload endpoints
+PHOTO_URL_PREFIX = '/api/photos/'
+
+
+class PhotoStore:
+    """Disk store of photo bytes keyed by content hash, expiring unused photos"""
+
+    def __init__(self, store_dir: str, ttl: int = 86400, prune_interval: int = 300):
+        self.store_dir = store_dir
+        self.ttl = ttl
+        self.prune_interval = prune_interval
+        self._last_prune = 0.0
+        self._lock = threading.Lock()
+        os.makedirs(self.store_dir, exist_ok=True)
+
+    def put(self, image_bytes: bytes, mime_type: str) -> str:
+        """
+        Store photo bytes, reusing the existing copy of identical uploads
+
+        Args:
+            image_bytes: Verified PNG/JPEG bytes
+            mime_type: Detected MIME type (image/jpeg or image/png)
+
+        Returns:
+            Short photo id
+        """
+        photo_id = hashlib.sha256(image_bytes).hexdigest()[:24]
+        path = self._path(photo_id, PHOTO_EXTENSIONS.get(mime_type, 'jpg'))
+
+        if os.path.exists(path):
+            # Same content uploaded again: just restart its TTL
+            os.utime(path)
+        else:
+            fd, tmp_path = tempfile.mkstemp(dir=self.store_dir, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                f.write(image_bytes)
+            os.replace(tmp_path, path)
+
+        self._maybe_prune()
+        return photo_id
+
+    def get(self, photo_id: str) -> tuple[bytes, str] | None:
+        """
+        Look up a stored photo and restart its TTL
+
+        Args:
+            photo_id: Id returned by put
+
+        Returns:
+            Tuple of (image bytes, MIME type), or None if unknown or expired
+        """
+        if not photo_id or not PHOTO_ID_PATTERN.match(photo_id):
+            return None
+
+        for ext, mime_type in PHOTO_MIME_TYPES.items():
+            path = self._path(photo_id, ext)
+            try:
+                if time.time() - os.path.getmtime(path) > self.ttl:
+                    return None
+                with open(path, 'rb') as f:
+                    data = f.read()
+                os.utime(path)
+                return data, mime_type
+            except OSError:
+                continue
+        return None
+
+    def resolve_url(self, photo_url: str) -> str | None:
+        """
+        Get the photo id referenced by a photo URL
+
+        Args:
+            photo_url: photo_url value from CV data
+
+        Returns:
+            Photo id if the URL points into this store, else None
+        """
+        if photo_url and photo_url.startswith(PHOTO_URL_PREFIX):
+            return photo_url[len(PHOTO_URL_PREFIX):]
+        return None
+
+    def _path(self, photo_id: str, ext: str) -> str:
+        return os.path.join(self.store_dir, f"{photo_id}.{ext}")
+
+    def _maybe_prune(self) -> None:
+        """Delete expired photos, at most once per prune_interval per worker"""
+        with self._lock:
+            now = time.time()
+            if now - self._last_prune < self.prune_interval:
+                return
+            self._last_prune = now
+
+        for entry in os.scandir(self.store_dir):
+            try:
+                if now - entry.stat().st_mtime > self.ttl:
+                    os.remove(entry.path)
+            except OSError:
+                continue
+
+
+# Singleton instance
+photo_store = PhotoStore(
+    store_dir=Config.PHOTO_STORE_DIR,
+    ttl=Config.PHOTO_STORE_TTL
+)
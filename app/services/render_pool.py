@@ -0,0 +1,253 @@
+"""
+Render Pool - Runs PDF renders in warm worker processes
+pisa.CreatePDF is CPU-bound pure Python; rendering in a process pool keeps it
+off request threads and lets concurrent renders use more than one core
+"""
+import logging
+import queue
+import threading
+import time
+from io import BytesIO
+
+from ..metrics import forget_process, stage
+from ..utils.processes import get_mp_context
+from .pdf_optimizer import apply_optimization
+from .styles import get_cv_styles
+
+logger = logging.getLogger(__name__)
+
+
+_pisa = None
+
+
+class RenderPoolBusyError(RuntimeError):
+    """Raised when the render queue stays full for longer than the queue timeout"""
+
+
+def link_callback(uri, rel):
+    """
+    Convert file:// URIs to absolute paths for xhtml2pdf
+    """
+    if uri.startswith('file:///'):
+        path = uri.replace('file:///', '')
+        return path
+    return uri
+
+
+def html_to_pdf(html_content: str, optimize: bool = False) -> bytes:
+    """
+    Convert rendered CV HTML to PDF bytes
+
+    Args:
+        html_content: Complete HTML document with inlined styles
+        optimize: Shrink the PDF with optimize_pdf after rendering
+
+    Returns:
+        PDF bytes
+
+    Raises:
+        RuntimeError: If xhtml2pdf reports errors
+    """
+    with stage('pisa_create_pdf'):
+        pdf_bytes = _create_pdf(html_content)
+    return apply_optimization(pdf_bytes, optimize)
+
+
+def _create_pdf(html_content: str) -> bytes:
+    result_buffer = BytesIO()
+    pisa_status = _load_pisa().CreatePDF(
+        src=BytesIO(html_content.encode('utf-8')),
+        dest=result_buffer,
+        encoding='utf-8',
+        link_callback=link_callback
+    )
+
+    if pisa_status.err:
+        raise RuntimeError(f"PDF generation failed ({pisa_status.err} errors)")
+    return result_buffer.getvalue()
+
+
+def _load_pisa():
+    """
+    Import xhtml2pdf on first render
+
+    It takes most of the app's import time, so paths that never render a
+    PDF (health checks, LLM endpoints, CLI tools) do not load it. Also
+    makes renders in this process parse the CV stylesheet only once.
+    """
+    global _pisa
+    if _pisa is None:
+        from xhtml2pdf import pisa
+        from .css_cache import install_css_cache
+
+        install_css_cache()
+        _pisa = pisa
+    return _pisa
+
+
+def _init_worker() -> None:
+    """Warm a fresh worker: parse the CV styles and register fonts once"""
+    # Not through html_to_pdf, so warm-up renders stay out of the metrics
+    _create_pdf(f"<html><head><style>{get_cv_styles()}</style></head>"
+                f"<body><div class=\"cv-container\">Warm-up</div></body></html>")
+
+
+def _serve(conn) -> None:
+    """Render process body: warm up, then run tasks from the pipe until it closes"""
+    _init_worker()
+    conn.send(('ready', None))
+    while True:
+        try:
+            render_func, args = conn.recv()
+        except EOFError:
+            return
+        try:
+            result = ('ok', render_func(*args))
+        except Exception as e:
+            result = ('error', e)
+        try:
+            conn.send(result)
+        except Exception as e:
+            # The exception itself could not be pickled
+            conn.send(('error', RuntimeError(f"{type(e).__name__}: {e}")))
+
+
+class _RenderProcess:
+    """One warm render process and the pipe its tasks go through"""
+
+    def __init__(self, context):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(target=_serve, args=(child_conn,), name='pdf-render', daemon=True)
+        self.process.start()
+        child_conn.close()
+        self.ready = False
+
+    def wait_ready(self, timeout: float = None) -> None:
+        """Wait for the warm-up to finish; TimeoutError or EOFError if it does not"""
+        if not self.ready:
+            self._receive(timeout)
+            self.ready = True
+
+    def run(self, timeout: float, render_func, *args):
+        """Run one task; TimeoutError past timeout, EOFError/OSError if the process died"""
+        started = time.monotonic()
+        self.wait_ready(timeout)
+        self.conn.send((render_func, args))
+        status, value = self._receive(max(timeout - (time.monotonic() - started), 0))
+        if status == 'error':
+            raise value
+        return value
+
+    def kill(self) -> None:
+        self.process.kill()
+        self.process.join()
+        self.conn.close()
+        forget_process(self.process.pid)
+
+    def _receive(self, timeout: float):
+        if not self.conn.poll(timeout):
+            raise TimeoutError
+        return self.conn.recv()
+
+
+class RenderPool:
+    """
+    Bounded pool of pre-started processes running PDF renders
+
+    A render that exceeds render_timeout has its process killed and
+    replaced, so runaway renders cannot pin the pool.
+    """
+
+    def __init__(self, processes: int, max_pending: int = 8,
+                 queue_timeout: float = 5.0, render_timeout: float = 30.0):
+        self.processes = processes
+        self.queue_timeout = queue_timeout
+        self.render_timeout = render_timeout
+        # One slot per render either running or waiting for a process
+        self._slots = threading.BoundedSemaphore(processes + max_pending)
+        self._idle = queue.Queue()
+        self._started = False
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        """Start and warm all worker processes ahead of the first request"""
+        workers = self._start_processes()
+        for worker in workers:
+            try:
+                worker.wait_ready(self.render_timeout)
+            except (TimeoutError, EOFError, OSError):
+                logger.error("PDF render process did not warm up, it will be replaced on first use")
+
+    def render(self, render_func, *args) -> bytes:
+        """
+        Run a PDF render function in a worker process
+
+        Args:
+            render_func: Module-level function returning PDF bytes
+                (html_to_pdf, or a PDF backend's render function)
+            *args: Picklable arguments for render_func
+
+        Returns:
+            PDF bytes
+
+        Raises:
+            RenderPoolBusyError: If no queue slot frees up within queue_timeout,
+                or no process within render_timeout
+            TimeoutError: If the render takes longer than render_timeout
+            RuntimeError: If the render process crashed
+        """
+        if not self._slots.acquire(timeout=self.queue_timeout):
+            raise RenderPoolBusyError("PDF renderer is busy, please retry shortly")
+
+        try:
+            self._start_processes()
+            try:
+                worker = self._idle.get(timeout=self.render_timeout)
+            except queue.Empty:
+                raise RenderPoolBusyError("PDF renderer is busy, please retry shortly") from None
+
+            try:
+                return worker.run(self.render_timeout, render_func, *args)
+            except TimeoutError:
+                logger.error("PDF render exceeded %ss, restarting its render process", self.render_timeout)
+                worker = self._replace(worker)
+                raise
+            except (EOFError, OSError):
+                logger.error("PDF render process crashed, restarting it")
+                worker = self._replace(worker)
+                raise RuntimeError("PDF render process crashed") from None
+            finally:
+                self._idle.put(worker)
+        finally:
+            self._slots.release()
+
+    def shutdown(self) -> None:
+        """Stop the idle worker processes"""
+        with self._lock:
+            while True:
+                try:
+                    self._idle.get_nowait().kill()
+                except queue.Empty:
+                    break
+            self._started = False
+
+    def _start_processes(self) -> list:
+        with self._lock:
+            if self._started:
+                return []
+            context = _get_mp_context()
+            workers = [_RenderProcess(context) for _ in range(self.processes)]
+            for worker in workers:
+                self._idle.put(worker)
+            self._started = True
+            return workers
+
+    def _replace(self, worker: _RenderProcess) -> _RenderProcess:
+        """Kill a stuck or crashed process and start a fresh one in its place"""
+        worker.kill()
+        return _RenderProcess(_get_mp_context())
+
+
+def _get_mp_context():
+    """Start method for render processes; the forkserver preloads xhtml2pdf and reportlab"""
+    return get_mp_context(('xhtml2pdf.pisa', __name__))
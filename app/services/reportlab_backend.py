@@ -0,0 +1,484 @@
+"""
+ReportLab Backend - Lays out the DREAM CV directly with ReportLab flowables
+Mirrors cv_sections/ and styles.py without any HTML or CSS parsing, which is
+where xhtml2pdf spends most of its time
+"""
+import base64
+import logging
+from io import BytesIO
+from xml.sax.saxutils import escape
+
+from reportlab.lib import colors
+from reportlab.lib.enums import TA_JUSTIFY, TA_RIGHT, TA_CENTER
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import ParagraphStyle
+from reportlab.lib.units import cm, inch
+from reportlab.platypus import (
+    HRFlowable, Image, KeepTogether, Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
+)
+
+from .cv_fragments import PLATFORMS
+from .pdf_optimizer import apply_optimization
+
+logger = logging.getLogger(__name__)
+
+
+PAGE_MARGIN = 0.6 * inch
+CONTENT_WIDTH = A4[0] - 2 * PAGE_MARGIN
+PHOTO_SIZE = (2.8 * cm, 3.4 * cm)
+
+BLACK = colors.black
+DARK_GREY = colors.HexColor('#333333')
+MID_GREY = colors.HexColor('#555555')
+SEPARATOR_GREY = '#666666'
+DREAM_BACKGROUND = colors.HexColor('#e8f4fc')
+DREAM_BORDER = colors.HexColor('#3498db')
+DREAM_ACCENT = colors.HexColor('#2980b9')
+DREAM_LABEL = '#2c3e50'
+
+DEFAULT_SKILL_LABELS = {
+    'cat1': 'Programming Languages',
+    'cat2': 'Web Technologies',
+    'cat3': 'Databases',
+    'cat4': 'Cloud/Mobile Technologies',
+    'cat5': 'Tools and Platforms'
+}
+
+
+def _style(name: str, **overrides) -> ParagraphStyle:
+    base = {'fontName': 'Times-Roman', 'fontSize': 10, 'leading': 12.5, 'textColor': BLACK}
+    base.update(overrides)
+    return ParagraphStyle(name, **base)
+
+
+STYLES = {
+    'name': _style('name', fontName='Times-Bold', fontSize=20, leading=24, spaceAfter=4),
+    'contact': _style('contact', fontSize=9.5, leading=13.3, spaceAfter=1),
+    'section_header': _style('section_header', fontName='Times-Bold', fontSize=11, leading=14),
+    'dream_header': _style('dream_header', fontName='Times-Bold', fontSize=11, leading=14,
+                           textColor=colors.HexColor(DREAM_LABEL)),
+    'body': _style('body'),
+    'summary': _style('summary', leading=13.5, alignment=TA_JUSTIFY),
+    'bold': _style('bold', fontName='Times-Bold'),
+    'duration': _style('duration', fontName='Times-Italic', alignment=TA_RIGHT),
+    'detail': _style('detail', fontSize=9.5, leading=12, textColor=DARK_GREY, leftIndent=8),
+    'link': _style('link', fontSize=9, leading=11.5, textColor=MID_GREY, leftIndent=8,
+                   spaceBefore=2),
+    'bullet': _style('bullet', leading=13, leftIndent=14, spaceAfter=1),
+    'planned': _style('planned', fontName='Times-Italic', textColor=MID_GREY),
+    'subsection': _style('subsection', fontName='Times-Bold', spaceBefore=8, spaceAfter=3),
+    'table_header': _style('table_header', fontName='Times-Bold', fontSize=9, alignment=TA_CENTER),
+    'table_center': _style('table_center', fontSize=11, leading=13, alignment=TA_CENTER),
+}
+
+
+def cv_to_pdf(data: dict, optimize: bool = False) -> bytes:
+    """
+    Render preprocessed, sanitized CV data straight to PDF
+
+    Args:
+        data: Output of PDFService._preprocess_cv_data after sanitizing
+        optimize: Shrink the PDF with optimize_pdf after rendering
+
+    Returns:
+        PDF bytes
+    """
+    buffer = BytesIO()
+    document = SimpleDocTemplate(
+        buffer,
+        pagesize=A4,
+        leftMargin=PAGE_MARGIN, rightMargin=PAGE_MARGIN,
+        topMargin=PAGE_MARGIN, bottomMargin=PAGE_MARGIN,
+        title=f"DREAM CV - {data.get('full_name') or ''}",
+        creator='DREAM CV Generator'
+    )
+
+    story = _header(data)
+    for section in (_dream, _objective, _education, _skills, _experience, _internships,
+                    _projects, _certifications, _responsibilities, _digital, _achievements,
+                    _extracurricular, _languages):
+        story.extend(section(data))
+
+    document.build(story)
+    return apply_optimization(buffer.getvalue(), optimize)
+
+
+# ===== Building blocks =====
+
+def _text(value) -> str:
+    """Escape a CV value for Paragraph markup"""
+    return escape(str(value)) if value else ''
+
+
+def _rule():
+    return HRFlowable(width='100%', thickness=0.5, color=BLACK, spaceBefore=8, spaceAfter=6)
+
+
+def _section(title: str, content: list) -> list:
+    """Rule, underlined section header and content, like .section in the template"""
+    header = [
+        Paragraph(title, STYLES['section_header']),
+        HRFlowable(width='100%', thickness=0.5, color=BLACK, spaceBefore=3, spaceAfter=5)
+    ]
+    # Keep the header with the first entry so it is never stranded at a page end.
+    # A nested KeepTogether reports an unbounded height, so merge its contents.
+    first = content[:1]
+    if first and isinstance(first[0], KeepTogether):
+        first = first[0]._content
+    return [_rule(), KeepTogether(header + first)] + content[1:] + [Spacer(1, 6)]
+
+
+def _table(rows: list, col_widths: list) -> Table:
+    """Table whose rows may split across pages, so an over-long field flows on like in xhtml2pdf"""
+    return Table(rows, colWidths=col_widths, splitInRow=1)
+
+
+def _two_column(left: str, right: str, left_style='body'):
+    """Title on the left, italic date on the right (.entry-header-table)"""
+    table = _table(
+        [[Paragraph(left, STYLES[left_style]), Paragraph(_text(right), STYLES['duration'])]],
+        [CONTENT_WIDTH * 0.75, CONTENT_WIDTH * 0.25]
+    )
+    table.setStyle(TableStyle([
+        ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+        ('LEFTPADDING', (0, 0), (-1, -1), 0),
+        ('RIGHTPADDING', (0, 0), (-1, -1), 0),
+        ('TOPPADDING', (0, 0), (-1, -1), 0),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 2),
+    ]))
+    return table
+
+
+def _bullets(items, marker: str) -> list:
+    if isinstance(items, str):
+        items = [items]
+    return [Paragraph(f"{marker} {_text(item)}", STYLES['bullet']) for item in items or [] if item]
+
+
+def _label_table(rows: list, label_width: float, padding: float, line_color: str):
+    """Bold label / value rows separated by dotted lines (.skills-table, .digital-table)"""
+    table = _table(rows, [CONTENT_WIDTH * label_width, CONTENT_WIDTH * (1 - label_width)])
+    commands = [
+        ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+        ('LEFTPADDING', (0, 0), (-1, -1), 0),
+        ('RIGHTPADDING', (0, 0), (0, -1), 10),
+        ('TOPPADDING', (0, 0), (-1, -1), padding),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), padding),
+    ]
+    if len(rows) > 1:
+        commands.append(('LINEBELOW', (0, 0), (-1, -2), 0.5, colors.HexColor(line_color), None, (1, 2)))
+    table.setStyle(TableStyle(commands))
+    return table
+
+
+def _entry(flowables: list, last: bool) -> KeepTogether:
+    """Keep an entry on one page (.entry has page-break-inside: avoid)"""
+    if not last:
+        flowables.append(Spacer(1, 10))
+    return KeepTogether(flowables)
+
+
+def _entry_section(data: dict, field: str, title: str, build) -> list:
+    """
+    Section of entries built from a list field
+
+    Like the template, the section appears whenever the list is non-empty,
+    and entries failing their guard (build returns None) are skipped.
+    """
+    items = data.get(field)
+    if not items:
+        return []
+    built = [build(item) for item in items if isinstance(item, dict)]
+    built = [flowables for flowables in built if flowables]
+    entries = [_entry(flowables, index == len(built) - 1) for index, flowables in enumerate(built)]
+    return _section(title, entries or [Spacer(1, 0)])
+
+
+# ===== Sections (cv_sections/*.html) =====
+
+def _header(data: dict) -> list:
+    separator = f' <font color="{SEPARATOR_GREY}">|</font> '
+    left = [Paragraph(_text(data.get('full_name')), STYLES['name'])]
+
+    contact_lines = [
+        separator.join(_text(data.get(field)) for field in ('phone', 'email', 'address') if data.get(field)),
+        separator.join(f"{label}: {_text(data.get(field))}"
+                       for field, label in (('linkedin', 'LinkedIn'), ('github', 'GitHub'))
+                       if data.get(field)),
+        f"Portfolio: {_text(data.get('portfolio'))}" if data.get('portfolio') else ''
+    ]
+    left.extend(Paragraph(line, STYLES['contact']) for line in contact_lines if line)
+
+    photo = _photo(data.get('photo_data'))
+    if photo is None:
+        row, widths = [left], [CONTENT_WIDTH]
+    else:
+        # Splitting a row for an over-long name reads .height of every flowable
+        # in a list cell, which an Image never sets itself
+        photo.height = PHOTO_SIZE[1]
+        row, widths = [left, [photo]], [CONTENT_WIDTH - PHOTO_SIZE[0], PHOTO_SIZE[0]]
+
+    table = _table([row], widths)
+    commands = [
+        ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+        ('LEFTPADDING', (0, 0), (-1, -1), 0),
+        ('RIGHTPADDING', (0, 0), (-1, -1), 0),
+        ('TOPPADDING', (0, 0), (-1, -1), 0),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 0),
+    ]
+    if photo is not None:
+        commands.append(('RIGHTPADDING', (0, 0), (0, 0), 10))
+        commands.append(('BOX', (1, 0), (1, 0), 1, DARK_GREY))
+    table.setStyle(TableStyle(commands))
+    return [table, Spacer(1, 12), _rule()]
+
+
+def _photo(photo_data):
+    """Decode the embedded data URL photo into an Image flowable"""
+    if not photo_data or not photo_data.startswith('data:image'):
+        return None
+    try:
+        _, _, encoded = photo_data.partition(',')
+        return Image(BytesIO(base64.b64decode(encoded)), width=PHOTO_SIZE[0], height=PHOTO_SIZE[1])
+    except Exception as e:
+        logger.warning("Could not embed photo in ReportLab PDF: %s", e)
+        return None
+
+
+def _dream(data: dict) -> list:
+    if not (data.get('dream_company') or data.get('target_role') or data.get('cohort')):
+        return []
+
+    def cell(field, label):
+        if not data.get(field):
+            return ''
+        return Paragraph(f'<font name="Times-Bold" color="{DREAM_LABEL}">{label}:</font> '
+                         f'{_text(data.get(field))}', STYLES['body'])
+
+    rows = [
+        [[Paragraph('DREAM COMPANY TARGET', STYLES['dream_header']),
+          HRFlowable(width='100%', thickness=0.5, color=DREAM_ACCENT, spaceBefore=3)], ''],
+        [cell('cohort', 'Target Cohort'), cell('dream_company', 'Dream Company')],
+        [cell('target_role', 'Target Role'), cell('target_technology', 'Target Technology')]
+    ]
+    commands = [
+        ('SPAN', (0, 0), (1, 0)),
+        ('BACKGROUND', (0, 0), (-1, -1), DREAM_BACKGROUND),
+        ('BOX', (0, 0), (-1, -1), 1, DREAM_BORDER),
+        ('LINEBEFORE', (0, 0), (0, -1), 3, DREAM_ACCENT),
+        ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+        ('LEFTPADDING', (0, 0), (0, -1), 10),
+        ('LEFTPADDING', (1, 0), (1, -1), 0),
+        ('RIGHTPADDING', (0, 0), (0, -1), 8),
+        ('RIGHTPADDING', (1, 0), (1, -1), 21),
+        ('RIGHTPADDING', (0, 0), (-1, 0), 10),
+        ('TOPPADDING', (0, 0), (-1, -1), 2),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 2),
+        ('TOPPADDING', (0, 0), (-1, 0), 8),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 6),
+    ]
+    if data.get('expected_package'):
+        rows.append([cell('expected_package', 'Expected Package'), ''])
+        commands.append(('SPAN', (0, 3), (1, 3)))
+    commands.append(('BOTTOMPADDING', (0, -1), (-1, -1), 10))
+
+    # One flat table rather than a details table inside a box: ReportLab
+    # cannot split a row that holds another table across pages
+    column = (CONTENT_WIDTH - 23) / 2
+    box = _table(rows, [10 + column, CONTENT_WIDTH - 10 - column])
+    box.setStyle(TableStyle(commands))
+    return [box, Spacer(1, 10)]
+
+
+def _objective(data: dict) -> list:
+    if not (data.get('professional_summary') or data.get('dream_company') or data.get('target_role')):
+        return []
+
+    if data.get('professional_summary'):
+        summary = _text(data['professional_summary'])
+    else:
+        summary = f"Aspiring {_text(data.get('target_role') or 'professional')}"
+        if data.get('cohort'):
+            summary += f" under the {_text(data['cohort'])} cohort"
+        if data.get('dream_company'):
+            summary += f", targeting a role at {_text(data['dream_company'])}"
+        summary += (f". Motivated to specialize in {_text(data.get('target_technology') or 'modern technologies')} "
+                    "while building scalable applications aligned with industry standards. Eager to "
+                    "contribute technical skills and innovative thinking to achieve organizational goals.")
+
+    return _section('CAREER OBJECTIVE', [Paragraph(summary, STYLES['summary'])])
+
+
+def _education(data: dict) -> list:
+    def build(qual):
+        if not qual.get('degree'):
+            return None
+        details = ' | '.join(_text(value) for value in
+                             (qual.get('institution'), qual.get('board'), qual.get('score')) if value)
+        return [
+            _two_column(_text(qual['degree']), qual.get('duration') or qual.get('year'), 'bold'),
+            Paragraph(details, STYLES['detail'])
+        ]
+
+    return _entry_section(data, 'qualifications', 'EDUCATION', build)
+
+
+def _skills(data: dict) -> list:
+    labels = data.get('skill_labels') or DEFAULT_SKILL_LABELS
+    rows = []
+    for field, category in (('prog_languages', 'cat1'), ('web_tech', 'cat2'), ('databases', 'cat3'),
+                            ('mobile_tech', 'cat4'), ('other_tools', 'cat5')):
+        if data.get(field):
+            rows.append([Paragraph(f"{_text(labels.get(category))}:", STYLES['bold']),
+                         Paragraph(_text(data[field]), STYLES['body'])])
+    if data.get('planned_skills'):
+        rows.append([Paragraph('Planned Skills:', STYLES['bold']),
+                     Paragraph(_text(data['planned_skills']), STYLES['planned'])])
+
+    if not rows:
+        return []
+    return _section('TECHNICAL SKILLS', [_label_table(rows, 0.35, 3, '#cccccc')])
+
+
+def _experience(data: dict) -> list:
+    def build(exp):
+        if not exp.get('company'):
+            return None
+        title = f"<b>{_text(exp.get('role'))}</b> | {_text(exp['company'])}"
+        return [_two_column(title, exp.get('duration'))] + _bullets(exp.get('bullets'), '-')
+
+    return _entry_section(data, 'experiences', 'WORK EXPERIENCE', build)
+
+
+def _internships(data: dict) -> list:
+    def build(intern):
+        if not intern.get('company'):
+            return None
+        title = f"<b>{_text(intern.get('role') or 'Intern')}</b> | {_text(intern['company'])}"
+        if intern.get('mode'):
+            title += f' <font size="9" color="#555555"><i>({_text(intern["mode"])})</i></font>'
+        return [_two_column(title, intern.get('duration'))] + _bullets(intern.get('bullets'), '&#8226;')
+
+    return _entry_section(data, 'internships', 'INTERNSHIPS', build)
+
+
+def _projects(data: dict) -> list:
+    def build(proj):
+        if not proj.get('name'):
+            return None
+        title = f"<b>{_text(proj['name'])}</b>"
+        if proj.get('role'):
+            title += f' | <font color="#333333"><i>{_text(proj["role"])}</i></font>'
+        flowables = [_two_column(title, proj.get('duration'))]
+        if proj.get('tech'):
+            flowables.append(Paragraph(f"<b>Tech Stack:</b> {_text(proj['tech'])}", STYLES['detail']))
+        flowables.extend(_bullets(proj.get('bullets'), '&#8226;'))
+        if proj.get('link'):
+            flowables.append(Paragraph(f"Link: {_text(proj['link'])}", STYLES['link']))
+        return flowables
+
+    return _entry_section(data, 'projects', 'PROJECTS / APPLICATIONS DEVELOPED', build)
+
+
+def _certifications(data: dict) -> list:
+    if not data.get('certifications'):
+        return []
+
+    content = []
+    for cert in data['certifications']:
+        if not isinstance(cert, dict) or not cert.get('title') or cert.get('is_planned'):
+            continue
+        line = f"<b>{_text(cert['title'])}</b> - {_text(cert.get('source'))}"
+        if cert.get('date'):
+            line += f" [{_text(cert['date'])}]"
+        if cert.get('credential_id'):
+            line += f" | ID: {_text(cert['credential_id'])}"
+        content.append(Paragraph(line, _style('cert', spaceAfter=3)))
+
+    if data.get('planned_certifications'):
+        content.append(HRFlowable(width='100%', thickness=0.5, color=colors.HexColor('#999999'),
+                                  dash=(2, 2), spaceBefore=8, spaceAfter=5))
+        content.append(Paragraph('Planned Certifications (Dream Company Aligned):',
+                                 _style('planned_header', fontName='Times-Bold', fontSize=9.5,
+                                        textColor=DARK_GREY, spaceAfter=3)))
+        content.append(Paragraph(_text(data['planned_certifications']), STYLES['planned']))
+
+    return _section('CERTIFICATIONS AND COURSES', content or [Spacer(1, 0)])
+
+
+def _responsibilities(data: dict) -> list:
+    def build(resp):
+        if not resp.get('role'):
+            return None
+        title = f"<b>{_text(resp['role'])}</b>"
+        if resp.get('organization'):
+            title += f" | {_text(resp['organization'])}"
+        return [_two_column(title, resp.get('duration'))] + _bullets(resp.get('bullets'), '&#8226;')
+
+    return _entry_section(data, 'responsibilities', 'POSITIONS OF RESPONSIBILITY', build)
+
+
+def _digital(data: dict) -> list:
+    rows = [[Paragraph(f"{label}:", STYLES['bold']), Paragraph(_text(data[field]), STYLES['body'])]
+            for field, label in PLATFORMS if data.get(field)]
+    for platform in data.get('other_platforms') or []:
+        if isinstance(platform, dict) and platform.get('name') and platform.get('url'):
+            rows.append([Paragraph(f"{_text(platform['name'])}:", STYLES['bold']),
+                         Paragraph(_text(platform['url']), STYLES['body'])])
+
+    has_platforms = bool(rows) or bool(data.get('other_platforms'))
+    events = data.get('tech_events')
+    communities = data.get('community_associations')
+    if not (has_platforms or events or communities):
+        return []
+
+    content = [_label_table(rows, 0.25, 2, '#dddddd')] if rows else []
+    if events:
+        content.append(Paragraph('Technical Events Participated:', STYLES['subsection']))
+        content.extend(_bullets(events, '-'))
+    if communities:
+        content.append(Paragraph('Community Associations:', STYLES['subsection']))
+        content.append(Paragraph(_text(communities), STYLES['body']))
+
+    return _section('DIGITAL EXISTENCE', content or [Spacer(1, 0)])
+
+
+def _achievements(data: dict) -> list:
+    if not data.get('achievements'):
+        return []
+    return _section('ACHIEVEMENTS', _bullets(data['achievements'], '-') or [Spacer(1, 0)])
+
+
+def _extracurricular(data: dict) -> list:
+    if not data.get('community_activities'):
+        return []
+    return _section('EXTRACURRICULAR ACTIVITIES',
+                    _bullets(data['community_activities'], '-') or [Spacer(1, 0)])
+
+
+def _languages(data: dict) -> list:
+    if not data.get('languages'):
+        return []
+
+    tick = '<font name="ZapfDingbats">4</font>'
+    rows = [[Paragraph(heading, STYLES['table_header']) for heading in ('Language', 'Speak', 'Write', 'Read')]]
+    for lang in data['languages']:
+        if not isinstance(lang, dict) or not lang.get('name'):
+            continue
+        abilities = lang.get('abilities') or []
+        rows.append([Paragraph(_text(lang['name']), STYLES['body'])] + [
+            Paragraph(tick if ability in abilities else '&#8212;', STYLES['table_center'])
+            for ability in ('Speak', 'Write', 'Read')
+        ])
+
+    table = _table(rows, [CONTENT_WIDTH * width for width in (0.4, 0.2, 0.2, 0.2)])
+    table.setStyle(TableStyle([
+        ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#999999')),
+        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#f0f0f0')),
+        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+        ('LEFTPADDING', (0, 0), (-1, -1), 8),
+        ('RIGHTPADDING', (0, 0), (-1, -1), 8),
+        ('TOPPADDING', (0, 0), (-1, -1), 4),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 4),
+    ]))
+    return _section('LANGUAGE PROFICIENCY', [Spacer(1, 3), table])
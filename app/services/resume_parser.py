@@ -1,9 +1,14 @@
 """
 Resume Parser Service - Handles resume parsing with AI
 """
+import logging
+
+from ..tracing import span
 from .llm_service import llm_service
 from .prompts import RESUME_PARSE_PROMPT, RESUME_PARSE_PROMPT_WITH_CONTEXT, RESUME_PARSE_COMPACT_PROMPT, NATURAL_LANGUAGE_PROMPTS
 
+logger = logging.getLogger(__name__)
+
 
 class ResumeParserService:
     """Service for parsing resumes using AI"""
@@ -35,33 +40,32 @@ class ResumeParserService:
                 target_role=dream_context.get('target_role', 'Not specified'),
                 target_technology=dream_context.get('target_technology', 'Not specified')
             )
-            print(f"[DEBUG] Using DREAM context for parsing: {dream_context.get('dream_company')} - {dream_context.get('target_role')}")
+            logger.debug("Parsing with DREAM context: %s - %s",
+                         dream_context.get('dream_company'), dream_context.get('target_role'))
         else:
             prompt = RESUME_PARSE_PROMPT.format(text_sample=text_sample)
-            print("[DEBUG] Parsing without DREAM context")
+            logger.debug("Parsing without DREAM context")
         
         try:
-            print("[DEBUG] Calling LLM for resume parsing...")
             result = self.llm.call(prompt)
             
             if not result:
-                print("[ERROR] LLM returned no result")
+                logger.error("LLM returned no result, trying compact prompt")
                 return self._try_compact_parsing(text_sample)
             
-            print(f"[DEBUG] LLM result length: {len(result)}")
+            logger.debug("LLM result length %d", len(result))
             
             parsed = self.llm.parse_json_response(result)
             
             if parsed:
-                print("[DEBUG] JSON parsing successful")
                 self._log_extraction_stats(parsed)
                 return parsed
             else:
-                print("[WARN] Main prompt failed, trying compact prompt...")
+                logger.warning("Main prompt failed, trying compact prompt")
                 return self._try_compact_parsing(text_sample)
                 
         except Exception as e:
-            print(f"[ERROR] Exception in parse_resume: {e}")
+            logger.exception("Exception in parse_resume: %s", e)
             return self._try_compact_parsing(text_sample)
     
     def _try_compact_parsing(self, text_sample: str) -> dict | None:
@@ -75,31 +79,30 @@ class ResumeParserService:
             Parsed data or None
         """
         try:
-            print("[DEBUG] Attempting compact parsing...")
-            compact_prompt = RESUME_PARSE_COMPACT_PROMPT.format(text_sample=text_sample[:3000])
-            result = self.llm.call(compact_prompt)
-            
-            if result:
-                print(f"[DEBUG] Compact result length: {len(result)}")
-                parsed = self.llm.parse_json_response(result)
-                if parsed:
-                    print("[DEBUG] Compact parsing successful!")
-                    self._log_extraction_stats(parsed)
-                    return parsed
+            with span('compact_fallback'):
+                compact_prompt = RESUME_PARSE_COMPACT_PROMPT.format(text_sample=text_sample[:3000])
+                result = self.llm.call(compact_prompt)
+                
+                if result:
+                    logger.debug("Compact result length %d", len(result))
+                    parsed = self.llm.parse_json_response(result)
+                    if parsed:
+                        self._log_extraction_stats(parsed)
+                        return parsed
             
-            print("[ERROR] Compact parsing also failed")
+            logger.error("Compact parsing also failed")
             return None
             
         except Exception as e:
-            print(f"[ERROR] Compact parsing exception: {e}")
+            logger.exception("Compact parsing exception: %s", e)
             return None
     
     def _log_extraction_stats(self, parsed: dict) -> None:
         """Log extraction statistics for debugging"""
-        print(f"[DEBUG] Extracted qualifications: {len(parsed.get('qualifications', []))}")
-        print(f"[DEBUG] Extracted internships: {len(parsed.get('internships', []))}")
-        print(f"[DEBUG] Extracted projects: {len(parsed.get('projects', []))}")
-        print(f"[DEBUG] Extracted certifications: {len(parsed.get('certifications', []))}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Extracted %d qualifications, %d internships, %d projects, %d certifications",
+                         *(len(parsed.get(key, [])) for key in
+                           ('qualifications', 'internships', 'projects', 'certifications')))
     
     def format_natural_language(self, section_type: str, user_input: str) -> dict | None:
         """
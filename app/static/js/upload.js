@@ -925,7 +925,7 @@ function initPhotoUpload() {
             };
             reader.readAsDataURL(file);
 
-            // Upload the photo (in-memory, returns base64)
+            // Upload the photo (stored server-side, returns a short photo URL)
             const formData = new FormData();
             formData.append('photo', file);
 
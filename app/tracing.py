@@ -0,0 +1,132 @@
+"""
+Tracing - Per-request span trees, Server-Timing headers and slow request logs
+Code marks a step with `with span('name'):`; inside a request the step becomes
+a child of the enclosing span, outside one it costs a context variable lookup
+"""
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from flask import current_app, g, request
+
+logger = logging.getLogger(__name__)
+
+_current_span = ContextVar('current_span', default=None)
+
+
+class Span:
+    """A timed step and the steps inside it"""
+
+    __slots__ = ('name', 'started', 'duration', 'children')
+
+    def __init__(self, name: str):
+        self.name = name
+        self.started = time.perf_counter()
+        self.duration = None
+        self.children = []
+
+    def finish(self) -> None:
+        self.duration = time.perf_counter() - self.started
+
+    @property
+    def duration_ms(self) -> float:
+        duration = self.duration if self.duration is not None else time.perf_counter() - self.started
+        return duration * 1000
+
+    def to_dict(self) -> dict:
+        """Nested {name, ms, children} for structured logs"""
+        entry = {'name': self.name, 'ms': round(self.duration_ms, 1)}
+        if self.children:
+            entry['children'] = [child.to_dict() for child in self.children]
+        return entry
+
+    def format_tree(self, depth: int = 0) -> str:
+        """Indented 'name  12.3 ms' lines, one per span"""
+        lines = [f"{'  ' * depth}{self.name}  {self.duration_ms:.1f} ms"]
+        lines += [child.format_tree(depth + 1) for child in self.children]
+        return '\n'.join(lines)
+
+    def totals(self) -> dict:
+        """Milliseconds per span name below this span, summed over repeats, in first-seen order"""
+        totals = {}
+        stack = list(reversed(self.children))
+        while stack:
+            node = stack.pop()
+            totals[node.name] = totals.get(node.name, 0.0) + node.duration_ms
+            stack.extend(reversed(node.children))
+        return totals
+
+
+@contextmanager
+def span(name: str):
+    """
+    Time a step as a child of the current span
+
+    A no-op outside a traced request. Thread pool tasks are traced when
+    submitted with contextvars.copy_context().run.
+
+    Args:
+        name: Span name, also the Server-Timing metric name
+    """
+    parent = _current_span.get()
+    if parent is None:
+        yield None
+        return
+
+    child = Span(name)
+    parent.children.append(child)
+    token = _current_span.set(child)
+    try:
+        yield child
+    finally:
+        child.finish()
+        _current_span.reset(token)
+
+
+def server_timing(root: Span) -> str:
+    """Server-Timing header value: every span name, then the request total"""
+    metrics = [f"{name};dur={ms:.1f}" for name, ms in root.totals().items()]
+    metrics.append(f"total;dur={root.duration_ms:.1f}")
+    return ', '.join(metrics)
+
+
+def _start_trace() -> None:
+    g.trace = Span('request')
+    _current_span.set(g.trace)
+
+
+def _send_server_timing(response):
+    root = g.get('trace')
+    if root is not None:
+        response.headers['Server-Timing'] = server_timing(root)
+    return response
+
+
+def _finish_trace(exc) -> None:
+    """Log requests slower than SLOW_REQUEST_MS with their span tree"""
+    _current_span.set(None)
+    root = g.pop('trace', None)
+    if root is None:
+        return
+
+    root.finish()
+    threshold_ms = current_app.config.get('SLOW_REQUEST_MS', 0)
+    if threshold_ms and root.duration_ms >= threshold_ms:
+        logger.warning(
+            "Slow request %s %s: %.0f ms\n%s", request.method, request.path, root.duration_ms,
+            root.format_tree(),
+            extra={'duration_ms': round(root.duration_ms, 1), 'spans': root.to_dict()}
+        )
+
+
+def register_tracing(app) -> None:
+    """Trace requests of this app according to the SERVER_TIMING_ENABLED/SLOW_REQUEST_MS settings"""
+    send_header = app.config.get('SERVER_TIMING_ENABLED', True)
+    if not send_header and not app.config.get('SLOW_REQUEST_MS', 0):
+        return
+
+    app.before_request(_start_trace)
+    if send_header:
+        app.after_request(_send_server_timing)
+    app.teardown_request(_finish_trace)
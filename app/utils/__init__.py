@@ -4,14 +4,27 @@ Utils Package - Utility functions and helpers
 from .file_handlers import (
     allowed_file,
     allowed_resume_file,
-    extract_text_from_file
+    extract_text_from_file,
+    read_image_upload
 )
-from .helpers import sanitize_filename, generate_unique_id
+from .file_signatures import (
+    UnsupportedFileError,
+    sniff_file_type,
+    inspect_upload
+)
+from .helpers import sanitize_filename, generate_unique_id, validate_cv_data
+from .json_codec import FastJSONProvider
 
 __all__ = [
     'allowed_file',
     'allowed_resume_file', 
     'extract_text_from_file',
+    'read_image_upload',
+    'UnsupportedFileError',
+    'sniff_file_type',
+    'inspect_upload',
     'sanitize_filename',
-    'generate_unique_id'
+    'generate_unique_id',
+    'validate_cv_data',
+    'FastJSONProvider'
 ]
@@ -2,9 +2,45 @@
 File Handlers - File upload and text extraction utilities
 Uses in-memory processing - files are NOT saved to disk
 """
+import logging
+import multiprocessing.connection
 import os
+import re
+import threading
+import time
+import zipfile
+import xml.etree.ElementTree as ET
 from flask import current_app
 
+from ..config import Config
+from ..metrics import stage
+from ..tracing import span
+from .file_signatures import (
+    IMAGE_MIME_TYPES,
+    REJECTION_MESSAGES,
+    UnsupportedFileError,
+    inspect_upload
+)
+from .processes import get_mp_context
+from .text_quality import score_text_quality
+
+logger = logging.getLogger(__name__)
+
+
+# WordprocessingML element names used by the streaming DOCX extractor
+_W_NS = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+_W_P = _W_NS + 'p'
+_W_T = _W_NS + 't'
+_W_TAB = _W_NS + 'tab'
+_W_BR = _W_NS + 'br'
+_W_CR = _W_NS + 'cr'
+_W_TR = _W_NS + 'tr'
+_W_TC = _W_NS + 'tc'
+_MC_FALLBACK = '{http://schemas.openxmlformats.org/markup-compatibility/2006}Fallback'
+
+_DOCX_HEADER_RE = re.compile(r'^word/header(\d*)\.xml$')
+_DOCX_FOOTER_RE = re.compile(r'^word/footer(\d*)\.xml$')
+
 
 def allowed_file(filename: str) -> bool:
     """
@@ -38,76 +74,398 @@ def allowed_resume_file(filename: str) -> bool:
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in allowed
 
 
+def read_image_upload(file) -> tuple[bytes, str] | tuple[None, str]:
+    """
+    Read an uploaded photo and verify its content really is an allowed image
+    
+    Args:
+        file: FileStorage object from request.files
+        
+    Returns:
+        Tuple of (image bytes, MIME type) or (None, error message)
+    """
+    content = file.read()
+    file_type, reason = inspect_upload(
+        content,
+        'image',
+        allowed=current_app.config.get('ALLOWED_EXTENSIONS', {'png', 'jpg', 'jpeg'}),
+        max_dimension=current_app.config.get('MAX_IMAGE_DIMENSION')
+    )
+    
+    if reason:
+        return None, REJECTION_MESSAGES[reason]
+    
+    return content, IMAGE_MIME_TYPES[file_type]
+
+
 def extract_text_from_file(file) -> str:
     """
     Extract text content from uploaded file
     
-    Supports: PDF, DOCX, DOC, TXT
+    Supports: PDF, DOCX, DOC, TXT. The parser is chosen from the file
+    signature rather than the extension, and files that fail the cheap
+    structural checks are rejected before any parsing.
     
     Args:
         file: FileStorage object from request.files
         
     Returns:
         Extracted text content
+        
+    Raises:
+        UnsupportedFileError: If the content is not a supported resume format
     """
-    filename = file.filename.lower()
     content = file.read()
     
+    with span('inspect_upload'):
+        file_type, reason = inspect_upload(content, 'resume')
+    if reason:
+        logger.warning("Rejected resume upload %r: %s", file.filename, reason)
+        raise UnsupportedFileError(reason)
+    
     try:
-        if filename.endswith('.pdf'):
-            return _extract_from_pdf(content)
-        elif filename.endswith('.docx'):
-            return _extract_from_docx(content)
-        elif filename.endswith('.doc'):
-            return _extract_from_doc(content)
-        elif filename.endswith('.txt'):
-            return content.decode('utf-8', errors='ignore')
-        else:
-            return content.decode('utf-8', errors='ignore')
+        with stage('text_extraction'):
+            if file_type == 'pdf':
+                return _extract_from_pdf(content)
+            elif file_type == 'docx':
+                return _extract_from_docx(content)
+            elif file_type == 'doc':
+                return _extract_from_doc(content)
+            else:
+                return content.decode('utf-8', errors='ignore')
     except Exception as e:
-        print(f"[ERROR] Text extraction error: {e}")
+        logger.error("Text extraction error: %s", e)
         raise
 
 
 def _extract_from_pdf(content: bytes) -> str:
-    """Extract text from PDF content"""
+    """
+    Extract text from PDF content
+    
+    PyPDF2 runs first. If its output scores below PDF_TEXT_QUALITY_THRESHOLD
+    (scanned pages, odd font encodings), the alternative engines run in
+    parallel processes under PDF_EXTRACTION_DEADLINE and the best-scoring
+    text wins.
+    """
+    primary_name, primary_engine = _PDF_ENGINES[0]
+    best_name, best_text, best_score = None, '', -1.0
+    
     try:
-        import PyPDF2
-        from io import BytesIO
-        
-        pdf_reader = PyPDF2.PdfReader(BytesIO(content))
-        text_parts = []
-        
-        for page in pdf_reader.pages:
-            page_text = page.extract_text()
-            if page_text:
-                text_parts.append(page_text)
-        
-        return '\n'.join(text_parts)
+        best_text, best_score, elapsed = _run_pdf_engine(primary_name, primary_engine, content)
+        best_name = primary_name
+        logger.debug("PDF extraction %s: %.0f ms, quality %.2f", primary_name, elapsed, best_score)
+        if best_score >= Config.PDF_TEXT_QUALITY_THRESHOLD:
+            return best_text
     except ImportError:
-        print("[WARNING] PyPDF2 not installed, trying pdfplumber")
-        return _extract_from_pdf_fallback(content)
+        logger.warning("%s not installed, trying alternative PDF extractors", primary_name)
+    except Exception as e:
+        logger.warning("PDF extraction %s failed: %s", primary_name, e)
+    
+    with span('extract_fallback'):
+        results = _run_fallback_engines(content)
+    
+    for name, (status, value) in results:
+        if status == 'missing':
+            continue
+        if status == 'error':
+            logger.warning("PDF extraction %s failed: %s", name, value)
+            continue
+        text, score, elapsed = value
+        logger.debug("PDF extraction %s: %.0f ms, quality %.2f", name, elapsed, score)
+        if score > best_score:
+            best_name, best_text, best_score = name, text, score
+    
+    if best_name is None:
+        raise ImportError("No PDF library available. Install PyPDF2 or pdfplumber.")
+    
+    logger.info("PDF extraction winner: %s (quality %.2f)", best_name, best_score)
+    return best_text
+
+
+def _run_pdf_engine(name: str, engine, content: bytes) -> tuple[str, float, float]:
+    """Run one PDF engine and return (text, quality score, elapsed ms)"""
+    start = time.perf_counter()
+    with span(f'extract_{name}'):
+        text = engine(content)
+    elapsed = (time.perf_counter() - start) * 1000
+    return text, score_text_quality(text), elapsed
 
 
-def _extract_from_pdf_fallback(content: bytes) -> str:
-    """Fallback PDF extraction using pdfplumber"""
+def _run_fallback_engines(content: bytes) -> list:
+    """
+    Run the alternative PDF engines in parallel, one process each
+    
+    An engine still running at PDF_EXTRACTION_DEADLINE is killed, so a
+    pathological PDF cannot hold on to CPU or delay later uploads. Engines
+    are skipped while PDF_EXTRACTION_PROCESSES of them are already running
+    in this worker.
+    
+    Returns:
+        (engine name, (status, value)) pairs of the engines that finished:
+        ('ok', (text, score, elapsed ms)), ('missing', None) when the
+        library is not installed, or ('error', message)
+    """
+    context = get_mp_context((__name__, 'pypdf', 'pdfplumber', 'pdfminer.high_level'))
+    running = {}
+    results = []
+    
     try:
-        import pdfplumber
-        from io import BytesIO
+        for name, _ in _PDF_ENGINES[1:]:
+            if not _engine_slots.acquire(blocking=False):
+                logger.warning("PDF extraction %s skipped, %d engines already running",
+                               name, Config.PDF_EXTRACTION_PROCESSES)
+                continue
+            try:
+                receiver, sender = context.Pipe(duplex=False)
+                process = context.Process(target=_pdf_engine_process, args=(sender, name, content),
+                                          name=f'pdf-extract-{name}', daemon=True)
+                process.start()
+            except BaseException:
+                _engine_slots.release()
+                raise
+            sender.close()
+            running[receiver] = (name, process)
         
-        with pdfplumber.open(BytesIO(content)) as pdf:
-            text_parts = []
-            for page in pdf.pages:
-                text = page.extract_text()
-                if text:
-                    text_parts.append(text)
-            return '\n'.join(text_parts)
+        deadline = time.monotonic() + Config.PDF_EXTRACTION_DEADLINE
+        while running:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            for receiver in multiprocessing.connection.wait(list(running), timeout=remaining):
+                name, process = running.pop(receiver)
+                try:
+                    results.append((name, receiver.recv()))
+                except EOFError:
+                    results.append((name, ('error', f'process exited with code {process.exitcode}')))
+                _stop_engine_process(receiver, process)
+    finally:
+        for receiver, (name, process) in running.items():
+            logger.warning("PDF extraction %s timed out after %ss, process killed",
+                           name, Config.PDF_EXTRACTION_DEADLINE)
+            process.kill()
+            _stop_engine_process(receiver, process)
+    
+    return results
+
+
+def _stop_engine_process(receiver, process) -> None:
+    receiver.close()
+    process.join()
+    _engine_slots.release()
+
+
+def _pdf_engine_process(sender, name: str, content: bytes) -> None:
+    """Engine process body: send back the engine's ('ok' | 'missing' | 'error', value)"""
+    try:
+        result = ('ok', _run_pdf_engine(name, dict(_PDF_ENGINES)[name], content))
     except ImportError:
-        raise ImportError("No PDF library available. Install PyPDF2 or pdfplumber.")
+        result = ('missing', None)
+    except Exception as e:
+        result = ('error', f'{type(e).__name__}: {e}')
+    sender.send(result)
+    sender.close()
+
+
+def _extract_with_pypdf2(content: bytes) -> str:
+    """Extract PDF text using PyPDF2"""
+    import PyPDF2
+    from io import BytesIO
+    
+    pdf_reader = PyPDF2.PdfReader(BytesIO(content))
+    text_parts = []
+    
+    for page in pdf_reader.pages:
+        page_text = page.extract_text()
+        if page_text:
+            text_parts.append(page_text)
+    
+    return '\n'.join(text_parts)
+
+
+def _extract_with_pypdf_layout(content: bytes) -> str:
+    """Extract PDF text using pypdf's layout mode (handles odd glyph spacing)"""
+    import pypdf
+    from io import BytesIO
+    
+    pdf_reader = pypdf.PdfReader(BytesIO(content))
+    text_parts = []
+    
+    for page in pdf_reader.pages:
+        page_text = page.extract_text(extraction_mode='layout')
+        if page_text:
+            text_parts.append(page_text)
+    
+    return '\n'.join(text_parts)
+
+
+def _extract_with_pdfplumber(content: bytes) -> str:
+    """Extract PDF text using pdfplumber"""
+    import pdfplumber
+    from io import BytesIO
+    
+    with pdfplumber.open(BytesIO(content)) as pdf:
+        text_parts = []
+        for page in pdf.pages:
+            text = page.extract_text()
+            if text:
+                text_parts.append(text)
+        return '\n'.join(text_parts)
+
+
+def _extract_with_pdfminer(content: bytes) -> str:
+    """Extract PDF text using pdfminer.six"""
+    from pdfminer.high_level import extract_text
+    from io import BytesIO
+    
+    return extract_text(BytesIO(content))
+
+
+# PDF extraction engines in priority order; the first one is the fast path
+_PDF_ENGINES = [
+    ('PyPDF2', _extract_with_pypdf2),
+    ('pypdf-layout', _extract_with_pypdf_layout),
+    ('pdfplumber', _extract_with_pdfplumber),
+    ('pdfminer', _extract_with_pdfminer),
+]
+
+# Fallback engine processes running at once in this worker
+_engine_slots = threading.BoundedSemaphore(Config.PDF_EXTRACTION_PROCESSES)
 
 
 def _extract_from_docx(content: bytes) -> str:
-    """Extract text from DOCX content"""
+    """
+    Extract text from DOCX content
+    
+    Streams the WordprocessingML parts straight out of the zip archive,
+    which also picks up tables, text boxes, headers and footers. Falls back
+    to python-docx if the package layout is not what we expect.
+    """
+    try:
+        return _extract_from_docx_xml(content)
+    except (KeyError, ET.ParseError) as e:
+        logger.warning("Streaming DOCX extraction failed (%s), using python-docx", e)
+        return _extract_from_docx_document(content)
+
+
+def _extract_from_docx_xml(content: bytes) -> str:
+    """
+    Extract text from DOCX content by iterparsing the XML parts
+    
+    Headers come first (contact details often live there), then the main
+    body, then footers. Identical header/footer lines repeated across
+    sections are only emitted once.
+    
+    Args:
+        content: Raw DOCX bytes
+        
+    Returns:
+        Extracted text, one paragraph or table row per line
+    """
+    from io import BytesIO
+    
+    with zipfile.ZipFile(BytesIO(content)) as archive:
+        names = archive.namelist()
+        headers = _numbered_parts(names, _DOCX_HEADER_RE)
+        footers = _numbered_parts(names, _DOCX_FOOTER_RE)
+        
+        lines = []
+        seen_margin_lines = set()
+        
+        for part in headers + ['word/document.xml'] + footers:
+            with archive.open(part) as stream:
+                part_lines = _iter_docx_part_lines(stream)
+                if part == 'word/document.xml':
+                    lines.extend(part_lines)
+                    continue
+                for line in part_lines:
+                    if line not in seen_margin_lines:
+                        seen_margin_lines.add(line)
+                        lines.append(line)
+    
+    return '\n'.join(lines)
+
+
+def _numbered_parts(names: list, pattern) -> list:
+    """Part names matching pattern in number order, so header10.xml comes after header2.xml"""
+    numbers = {}
+    for name in names:
+        match = pattern.match(name)
+        if match:
+            numbers[name] = int(match.group(1) or 0)
+    return sorted(numbers, key=lambda name: numbers[name])
+
+
+def _iter_docx_part_lines(stream) -> list:
+    """
+    Collect text lines from a single WordprocessingML part in reading order
+    
+    Paragraphs become lines; table rows become one line with cells joined by
+    " | ". Text boxes are emitted where their anchor appears. The
+    mc:Fallback copy of a text box is skipped so it is not read twice.
+    """
+    lines = []
+    paragraphs = []   # text runs of each open <w:p>
+    cells = []        # paragraph texts of each open <w:tc>
+    rows = []         # cell texts of each open <w:tr>
+    fallback_depth = 0
+    
+    def emit(text):
+        if cells:
+            cells[-1].append(text)
+        else:
+            lines.append(text)
+    
+    for event, elem in ET.iterparse(stream, events=('start', 'end')):
+        tag = elem.tag
+        
+        if tag == _MC_FALLBACK:
+            fallback_depth += 1 if event == 'start' else -1
+            if event == 'end':
+                elem.clear()
+            continue
+        if fallback_depth:
+            continue
+        
+        if event == 'start':
+            if tag == _W_P:
+                paragraphs.append([])
+            elif tag == _W_TC:
+                cells.append([])
+            elif tag == _W_TR:
+                rows.append([])
+            continue
+        
+        if tag == _W_T:
+            if paragraphs and elem.text:
+                paragraphs[-1].append(elem.text)
+        elif tag == _W_TAB:
+            if paragraphs:
+                paragraphs[-1].append('\t')
+        elif tag in (_W_BR, _W_CR):
+            if paragraphs:
+                paragraphs[-1].append('\n')
+        elif tag == _W_P:
+            text = ''.join(paragraphs.pop())
+            if text.strip():
+                emit(text)
+            elem.clear()
+        elif tag == _W_TC:
+            cell_text = ' '.join(cells.pop())
+            if rows:
+                rows[-1].append(cell_text)
+            elif cell_text:
+                emit(cell_text)
+        elif tag == _W_TR:
+            row_text = ' | '.join(cell for cell in rows.pop() if cell.strip())
+            if row_text:
+                emit(row_text)
+            elem.clear()
+    
+    return lines
+
+
+def _extract_from_docx_document(content: bytes) -> str:
+    """Extract body paragraph text from DOCX content using python-docx"""
     try:
         from docx import Document
         from io import BytesIO
@@ -0,0 +1,218 @@
+"""
+File Signatures - Content sniffing and structural pre-checks for uploads
+Identifies uploads by their magic bytes instead of trusting the filename,
+so renamed or malformed files are rejected before any heavy parsing or LLM call
+"""
+import struct
+import zipfile
+from io import BytesIO
+
+from ..metrics import count_upload_rejection
+
+
+PDF_MAGIC = b'%PDF-'
+ZIP_MAGIC = b'PK\x03\x04'
+OLE_MAGIC = b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1'
+PNG_MAGIC = b'\x89PNG\r\n\x1a\n'
+JPEG_MAGIC = b'\xff\xd8\xff'
+GIF_MAGICS = (b'GIF87a', b'GIF89a')
+
+IMAGE_MIME_TYPES = {
+    'png': 'image/png',
+    'jpeg': 'image/jpeg',
+    'gif': 'image/gif'
+}
+
+# Types accepted for each upload kind, as returned by sniff_file_type
+RESUME_TYPES = {'pdf', 'docx', 'doc', 'txt'}
+
+# User-facing messages for each rejection reason
+REJECTION_MESSAGES = {
+    'empty_file': 'The uploaded file is empty',
+    'unrecognized_binary': 'Unsupported file type detected. The file content does not match its extension.',
+    'image_as_resume': 'The uploaded file is an image. Please upload a PDF, DOCX, DOC or TXT resume.',
+    'document_as_image': 'Unsupported file format detected. Please use PNG, JPG, or JPEG',
+    'image_type_not_allowed': 'Unsupported file format detected. Please use PNG, JPG, or JPEG',
+    'pdf_missing_xref': 'The PDF file appears to be truncated or corrupted',
+    'docx_missing_document': 'The DOCX file is not a valid Word document',
+    'docx_bad_zip': 'The DOCX file appears to be truncated or corrupted',
+    'image_bad_header': 'The image file appears to be truncated or corrupted',
+    'image_too_large': 'The image dimensions are too large. Please upload a smaller photo.'
+}
+
+class UnsupportedFileError(ValueError):
+    """Raised when an upload fails content sniffing or structural checks"""
+
+    def __init__(self, reason: str):
+        self.reason = reason
+        super().__init__(REJECTION_MESSAGES.get(reason, 'Unsupported file type detected'))
+
+
+def sniff_file_type(content: bytes) -> str | None:
+    """
+    Identify a file by its leading bytes
+
+    Args:
+        content: Raw file bytes
+
+    Returns:
+        One of 'pdf', 'docx', 'doc', 'png', 'jpeg', 'gif', 'txt',
+        or None for unrecognized binary content
+    """
+    head = content[:1024]
+
+    # PDF readers tolerate junk before the header within the first 1 KB
+    if PDF_MAGIC in head:
+        return 'pdf'
+    if head.startswith(ZIP_MAGIC):
+        return 'docx'
+    if head.startswith(OLE_MAGIC):
+        return 'doc'
+    if head.startswith(PNG_MAGIC):
+        return 'png'
+    if head.startswith(JPEG_MAGIC):
+        return 'jpeg'
+    if head.startswith(GIF_MAGICS):
+        return 'gif'
+    if _looks_like_text(content[:8192]):
+        return 'txt'
+    return None
+
+
+def inspect_upload(content: bytes, kind: str, allowed: set = None,
+                   max_dimension: int = None) -> tuple[str, None] | tuple[None, str]:
+    """
+    Sniff and structurally pre-check an uploaded file
+
+    Args:
+        content: Raw file bytes
+        kind: 'image' for photo uploads, 'resume' for resume uploads
+        allowed: Allowed image extensions (e.g. {'png', 'jpg', 'jpeg'})
+        max_dimension: Maximum width/height in pixels for images
+
+    Returns:
+        Tuple of (detected type, None) or (None, rejection reason)
+    """
+    if not content:
+        return _reject('empty_file')
+
+    file_type = sniff_file_type(content)
+
+    if kind == 'image':
+        if file_type not in IMAGE_MIME_TYPES:
+            return _reject('document_as_image' if file_type else 'unrecognized_binary')
+        if allowed is not None and not _image_type_allowed(file_type, allowed):
+            return _reject('image_type_not_allowed')
+        dimensions = get_image_dimensions(content, file_type)
+        if dimensions is None or 0 in dimensions:
+            return _reject('image_bad_header')
+        if max_dimension and max(dimensions) > max_dimension:
+            return _reject('image_too_large')
+        return file_type, None
+
+    if file_type is None:
+        return _reject('unrecognized_binary')
+    if file_type in IMAGE_MIME_TYPES:
+        return _reject('image_as_resume')
+    if file_type == 'pdf' and not _pdf_has_xref(content):
+        return _reject('pdf_missing_xref')
+    if file_type == 'docx':
+        reason = _check_docx_directory(content)
+        if reason:
+            return _reject(reason)
+    return file_type, None
+
+
+def get_image_dimensions(content: bytes, file_type: str) -> tuple[int, int] | None:
+    """
+    Read (width, height) from an image header without decoding pixels
+
+    Args:
+        content: Raw image bytes
+        file_type: 'png', 'jpeg' or 'gif'
+
+    Returns:
+        Tuple of (width, height) or None if the header is malformed
+    """
+    try:
+        if file_type == 'png':
+            if content[12:16] != b'IHDR':
+                return None
+            return struct.unpack('>II', content[16:24])
+        if file_type == 'gif':
+            return struct.unpack('<HH', content[6:10])
+        if file_type == 'jpeg':
+            return _jpeg_dimensions(content)
+    except struct.error:
+        return None
+    return None
+
+
+def _reject(reason: str) -> tuple[None, str]:
+    """Count a rejection and return it in inspect_upload's result shape"""
+    count_upload_rejection(reason)
+    return None, reason
+
+
+def _image_type_allowed(file_type: str, allowed: set) -> bool:
+    """Match a sniffed image type against configured extensions"""
+    if file_type == 'jpeg':
+        return bool({'jpg', 'jpeg'} & allowed)
+    return file_type in allowed
+
+
+def _looks_like_text(sample: bytes) -> bool:
+    """Heuristic check that a byte sample is human-readable text"""
+    if not sample:
+        return False
+    if b'\x00' in sample:
+        return False
+    text = sample.decode('utf-8', errors='replace')
+    printable = sum(1 for c in text if c.isprintable() or c in '\r\n\t')
+    return printable / len(text) >= 0.95
+
+
+def _pdf_has_xref(content: bytes) -> bool:
+    """Check the trailer for a startxref pointer"""
+    return b'startxref' in content[-2048:]
+
+
+def _check_docx_directory(content: bytes) -> str | None:
+    """Read the zip central directory and confirm a Word main document part"""
+    try:
+        with zipfile.ZipFile(BytesIO(content)) as archive:
+            if 'word/document.xml' not in archive.namelist():
+                return 'docx_missing_document'
+    except zipfile.BadZipFile:
+        return 'docx_bad_zip'
+    return None
+
+
+def _jpeg_dimensions(content: bytes) -> tuple[int, int] | None:
+    """Walk JPEG markers until the first start-of-frame segment"""
+    offset = 2
+    length = len(content)
+
+    while offset + 4 <= length:
+        if content[offset] != 0xFF:
+            return None
+        marker = content[offset + 1]
+
+        # Fill bytes and standalone markers carry no length field
+        if marker == 0xFF:
+            offset += 1
+            continue
+        if marker in (0x01,) or 0xD0 <= marker <= 0xD7:
+            offset += 2
+            continue
+
+        segment_length = struct.unpack('>H', content[offset + 2:offset + 4])[0]
+
+        # SOF0-SOF15, excluding DHT (C4), JPG (C8) and DAC (CC)
+        if 0xC0 <= marker <= 0xCF and marker not in (0xC4, 0xC8, 0xCC):
+            height, width = struct.unpack('>HH', content[offset + 5:offset + 9])
+            return width, height
+
+        offset += 2 + segment_length
+
+    return None
@@ -26,6 +26,40 @@ def sanitize_filename(filename: str) -> str:
     return safe_name if safe_name else "file"
 
 
+def validate_cv_data(cv_data: dict) -> str | None:
+    """
+    Validate CV data submitted for PDF generation
+    
+    Args:
+        cv_data: Parsed JSON request body
+        
+    Returns:
+        Error message or None if the data is acceptable
+    """
+    if not isinstance(cv_data, dict):
+        return 'Invalid CV data format'
+    
+    personal_info = cv_data.get('personal_info', {})
+    if not isinstance(personal_info, dict):
+        return 'Invalid CV data format'
+    
+    email = cv_data.get('email', personal_info.get('email', ''))
+    
+    # Basic email validation
+    if email and not isinstance(email, str):
+        return 'Invalid email format'
+    
+    if email and '@' not in email:
+        return 'Invalid email format'
+    
+    # Check for required sections
+    sections = cv_data.get('sections')
+    if sections is not None and not isinstance(sections, (dict, list)):
+        return 'Invalid sections format'
+    
+    return None
+
+
 def generate_unique_id(prefix: str = '') -> str:
     """
     Generate a unique identifier
@@ -0,0 +1,34 @@
+"""
+Processes - Child process start method for threaded server workers
+Render pool processes and PDF extraction engines are started through one
+multiprocessing context, so they share a single forkserver per worker
+"""
+import multiprocessing
+import sys
+
+
+_forkserver_preload = set()
+
+
+def get_mp_context(preload: tuple = ()):
+    """
+    Pick a start method that is safe inside threaded servers
+
+    forkserver children fork from a clean single-threaded server that has
+    already imported the preload modules; Windows only supports spawn.
+    Preload modules of all callers are merged, but only those registered
+    before the forkserver starts are imported by it. Modules that are not
+    installed are skipped.
+
+    Args:
+        preload: Module names for the forkserver to import
+
+    Returns:
+        A multiprocessing context
+    """
+    if sys.platform == 'win32':
+        return multiprocessing.get_context('spawn')
+    _forkserver_preload.update(preload)
+    context = multiprocessing.get_context('forkserver')
+    context.set_forkserver_preload(sorted(_forkserver_preload))
+    return context
@@ -0,0 +1,75 @@
+"""
+Text Quality - Cheap heuristics for judging extracted resume text
+Used to decide whether a PDF extraction is good enough to send to the LLM
+or whether alternative extractors should be tried
+"""
+import re
+
+
+# Common English and resume vocabulary used for the dictionary hit rate
+COMMON_WORDS = frozenset('''
+a about above after all also an and any are as at be been before being between
+both but by can could did do does during each for from had has have he her his
+how i if in into is it its me more most my no not of on one or other our out
+over own same she should so some such than that the their them then there these
+they this those through to too under up us very was we were what when where
+which while who will with would you your
+ability academic achieved achievement achievements activities analysis analyst
+analytics api application applications architecture august b.tech bachelor
+backend based board build built c c++ certification certifications certified
+cgpa class cloud code college communication company computer contact course
+courses css data database databases december degree deployed design designed
+developed developer development docker education email engineer engineering
+english environment event events experience features february framework
+frontend full git github google grade hackathon html implemented improved
+industry institute intern internship internships java javascript january
+july june languages leadership learning linkedin linux machine management march
+may member mobile model models mongodb mysql node november october performance
+phone platform position present process programming project projects python
+react research responsibilities responsible role school science secondary
+september skills software solutions sql stack student system systems team
+technical technologies technology testing tools training university user users
+using web website work worked year
+'''.split())
+
+_WORD_RE = re.compile(r"[A-Za-z][A-Za-z+#.'-]*")
+
+
+def score_text_quality(text: str) -> float:
+    """
+    Score how much extracted text looks like real prose
+
+    Combines three signals, each in the range 0-1:
+    - printable ratio: share of printable characters
+    - word shape: share of tokens with a plausible length (1-20 letters)
+    - dictionary hit rate: share of words found in COMMON_WORDS
+
+    Args:
+        text: Extracted text
+
+    Returns:
+        Quality score between 0.0 (garbage) and 1.0 (clean text)
+    """
+    if not text or not text.strip():
+        return 0.0
+
+    sample = text[:20000]
+    printable = sum(1 for c in sample if c.isprintable() or c in '\r\n\t')
+    printable_ratio = printable / len(sample)
+
+    tokens = sample.split()
+    words = _WORD_RE.findall(sample)
+    if not tokens or not words:
+        return round(0.2 * printable_ratio, 3)
+
+    # Mangled extractions either glue words together or split them into letters
+    plausible = sum(1 for token in tokens if 1 <= len(token) <= 20)
+    single_letters = sum(1 for word in words if len(word) == 1)
+    word_shape = (plausible / len(tokens)) * (1 - single_letters / len(words))
+
+    lowered = [word.lower().strip(".'-") for word in words]
+    hits = sum(1 for word in lowered if word in COMMON_WORDS)
+    # Resumes are terse, so ~35% dictionary hits already means clean text
+    dictionary_rate = min(1.0, hits / len(words) / 0.35)
+
+    return round(0.2 * printable_ratio + 0.3 * word_shape + 0.5 * dictionary_rate, 3)
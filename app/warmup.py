@@ -0,0 +1,77 @@
+"""
+Warm-up - Pays import and first-render costs once at startup
+Under gunicorn.conf.py this runs in the master before it forks, so the four
+workers inherit the imported modules, compiled templates, parsed CV stylesheet
+and registered fonts copy-on-write instead of each building them on a user
+request
+"""
+import importlib
+import logging
+import time
+
+from flask import render_template
+
+# Imported lazily by request code paths (photo handling, resume extraction,
+# PDF optimization, LLM calls, prompts); optional ones are skipped when not
+# installed. xhtml2pdf and ReportLab are loaded by the warm-up renders.
+HEAVY_MODULES = (
+    'PIL.Image',
+    'PIL.ImageOps',
+    'PyPDF2',
+    'pypdf',
+    'pypdf.generic',
+    'pdfplumber',
+    'pdfminer.high_level',
+    'docx',
+    'requests',
+    'app.services.prompts',
+)
+
+logger = logging.getLogger(__name__)
+
+
+def warm_up(app) -> dict:
+    """
+    Import heavy modules, compile every template and render a page and a CV once
+
+    Must not start threads or processes: with preload_app they would not
+    survive the fork into the workers. That rules out resume extraction
+    (thread pool) and the PDF render pool, which each worker starts itself.
+
+    Args:
+        app: Flask application
+
+    Returns:
+        Dict of step -> milliseconds
+    """
+    timings = {}
+
+    started = time.perf_counter()
+    for name in HEAVY_MODULES:
+        try:
+            importlib.import_module(name)
+        except ImportError:
+            continue
+    timings['imports'] = _elapsed_ms(started)
+
+    started = time.perf_counter()
+    for name in app.jinja_env.list_templates():
+        app.jinja_env.get_template(name)
+    with app.test_request_context('/'):
+        render_template('index.html')
+    timings['templates'] = _elapsed_ms(started)
+
+    from .services import pdf_service
+
+    started = time.perf_counter()
+    with app.app_context():
+        pdf_service.warm_up()
+    timings['pdf_render'] = _elapsed_ms(started)
+
+    logger.info("Warm-up done in %d ms (%s)", sum(timings.values()),
+                ', '.join(f'{step} {ms} ms' for step, ms in timings.items()))
+    return timings
+
+
+def _elapsed_ms(started: float) -> int:
+    return round((time.perf_counter() - started) * 1000)
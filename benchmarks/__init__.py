@@ -0,0 +1,5 @@
+"""
+Benchmarks Package - Standalone performance scripts
+
+Run from the repository root, e.g. ``python -m benchmarks.docx_extraction``
+"""
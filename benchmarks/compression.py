@@ -0,0 +1,66 @@
+"""
+Compression Benchmark - wire size and CPU cost of gzip/brotli per response type
+
+Usage:
+    python -m benchmarks.compression [--rounds 20]
+"""
+import argparse
+import gzip
+import json
+import statistics
+import time
+
+from app import create_app
+from app.compression import brotli
+
+from .pdf_backends import make_large_cv
+
+
+def encoders() -> list:
+    """(label, compress function) for the levels worth comparing"""
+    options = [(f'gzip -{level}', lambda data, level=level: gzip.compress(data, level, mtime=0))
+               for level in (1, 6, 9)]
+    if brotli is not None:
+        options += [(f'br q{quality}', lambda data, quality=quality: brotli.compress(data, quality=quality))
+                    for quality in (1, 5, 11)]
+    return options
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--rounds', type=int, default=20)
+    args = parser.parse_args()
+
+    app = create_app()
+    client = app.test_client()
+    identity = {'Accept-Encoding': 'identity'}
+    payloads = [
+        ('index.html', client.get('/', headers=identity).data),
+        ('main.css', client.get('/static/css/main.css', headers=identity).data),
+        ('parse_resume JSON', json.dumps({'success': True, 'data': make_large_cv()}, indent=2).encode('utf-8')),
+        ('preview HTML', client.post('/api/preview_html', json=make_large_cv(), headers=identity).data),
+    ]
+
+    for label, data in payloads:
+        print(f"{label} ({len(data) / 1024:.1f} KB):")
+        for name, compress in encoders():
+            cpu_ms = []
+            for _ in range(args.rounds):
+                started = time.thread_time()
+                compressed = compress(data)
+                cpu_ms.append((time.thread_time() - started) * 1000)
+            print(f"  {name:9s} {len(compressed) / 1024:7.1f} KB  "
+                  f"{len(compressed) / len(data):6.1%}  {statistics.median(cpu_ms):6.2f} ms CPU")
+
+    # What the app actually sends with the configured levels
+    print("\nServed by the app (Accept-Encoding: br, gzip):")
+    for path in ('/', '/static/css/main.css'):
+        response = client.get(path, headers={'Accept-Encoding': 'br, gzip'})
+        print(f"  {path:24s} {response.headers.get('Content-Encoding', 'identity'):8s} "
+              f"{len(response.data) / 1024:7.1f} KB")
+    for encoding, stats in app.extensions['compression'].get_stats().items():
+        print(f"  {encoding}: {stats}")
+
+
+if __name__ == '__main__':
+    main()
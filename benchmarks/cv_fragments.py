@@ -0,0 +1,84 @@
+"""
+CV Fragment Benchmark - HTML render time while editing one bullet at a time
+
+Usage:
+    python -m benchmarks.cv_fragments [--edits 200] [--entries 6]
+"""
+import argparse
+import copy
+import time
+
+from app import create_app
+from app.services import pdf_service
+from app.services.cv_fragments import CV_SECTIONS, FragmentCache
+from app.services.pdf_service import sanitize_data_recursive
+
+from .sample_data import make_cv
+
+
+def build_edits(count: int, entries: int) -> list[dict]:
+    """Successive versions of one CV, each changing a single project bullet"""
+    cv = make_cv()
+    for field, title in [('projects', 'name'), ('experiences', 'company'),
+                         ('internships', 'company'), ('responsibilities', 'role')]:
+        cv[field] = [
+            {title: f'{field} {i}', 'role': 'Engineer', 'tech': 'Python, Flask',
+             'bullets': [f'Built feature {j} of {field} {i}' for j in range(4)]}
+            for i in range(entries)
+        ]
+    versions = []
+    for edit in range(count):
+        cv = copy.deepcopy(cv)
+        cv['projects'][edit % entries]['bullets'][edit % 4] = f'Reworded bullet, revision {edit}'
+        versions.append(cv)
+    return versions
+
+
+def time_renders(render, versions: list[dict]) -> float:
+    """Average milliseconds per render"""
+    started = time.perf_counter()
+    for data in versions:
+        render(data)
+    return (time.perf_counter() - started) * 1000 / len(versions)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--edits', type=int, default=200)
+    parser.add_argument('--entries', type=int, default=6,
+                        help='projects, experiences, internships and responsibilities each')
+    args = parser.parse_args()
+
+    app = create_app()
+    with app.app_context():
+        versions = [sanitize_data_recursive(pdf_service._preprocess_cv_data(cv))
+                    for cv in build_edits(args.edits, args.entries)]
+        env = app.jinja_env
+
+        # Whole-document render, as before the template was split
+        sections = '\n'.join(env.loader.get_source(env, f'cv_sections/{name}.html')[0]
+                             for name, _ in CV_SECTIONS)
+        shell = env.loader.get_source(env, 'cv_template.html')[0]
+        monolith = env.from_string(
+            shell.replace('{% for fragment in fragments %}', sections + '{% for fragment in [] %}')
+        )
+        full_ms = time_renders(
+            lambda data: monolith.render(data=data, fragments=[], cv_styles=pdf_service.styles),
+            versions
+        )
+
+        pdf_service.fragment_cache = FragmentCache()
+        fragment_ms = time_renders(pdf_service._render_html, versions)
+        stats = pdf_service.fragment_cache.get_stats()
+
+    print(f"{args.edits} single-bullet edits, {args.entries} entries per list section:")
+    print(f"  whole template    {full_ms:7.3f} ms/render")
+    print(f"  section fragments {fragment_ms:7.3f} ms/render")
+    print(f"  fragment hit rate {stats['total']['hit_rate']:.1%}")
+    for name, counts in stats.items():
+        if name != 'total':
+            print(f"    {name:<17} {counts['hit_rate']:6.1%}")
+
+
+if __name__ == '__main__':
+    main()
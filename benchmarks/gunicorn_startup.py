@@ -0,0 +1,119 @@
+"""
+Gunicorn Startup Benchmark - cold start, first renders and worker memory with and without preloading
+
+Starts gunicorn twice on a local port: the old command line (every worker
+imports and sets up on its first requests) and gunicorn.conf.py (warmed up once in the
+master, then forked). Reports the time until /health answers, the latency of
+the first PDF renders, and Rss/Pss/private memory per worker from
+/proc/<pid>/smaps_rollup (Linux only). Pss splits shared pages between the
+processes sharing them, so the sum of Pss is the real memory use.
+
+Usage:
+    python -m benchmarks.gunicorn_startup [--workers 4] [--renders 8]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+import urllib.request
+
+from .sample_data import make_cv
+
+PORT = 5099
+
+# gunicorn reads ./gunicorn.conf.py by default; /dev/null gives the old settings
+COMMANDS = {
+    'no preload': ['gunicorn', '-c', '/dev/null', '-w', '{workers}', '-b', f'127.0.0.1:{PORT}', 'app:create_app()'],
+    'gunicorn.conf.py': ['gunicorn', '-c', 'gunicorn.conf.py', '-w', '{workers}', '-b', f'127.0.0.1:{PORT}'],
+}
+
+
+def wait_ready(started: float, timeout: float = 60) -> float:
+    """Poll /health until it answers; return seconds since start"""
+    while time.perf_counter() - started < timeout:
+        try:
+            with urllib.request.urlopen(f'http://127.0.0.1:{PORT}/health', timeout=1):
+                return time.perf_counter() - started
+        except OSError:
+            time.sleep(0.02)
+    raise TimeoutError('gunicorn did not start')
+
+
+def render(index: int) -> float:
+    """POST a unique CV to /api/generate_pdf; return latency in ms"""
+    request = urllib.request.Request(
+        f'http://127.0.0.1:{PORT}/api/generate_pdf',
+        data=json.dumps(make_cv(index)).encode('utf-8'),
+        headers={'Content-Type': 'application/json'}
+    )
+    started = time.perf_counter()
+    with urllib.request.urlopen(request, timeout=60) as response:
+        response.read()
+    return (time.perf_counter() - started) * 1000
+
+
+def memory_kb(pid: int) -> dict:
+    """Rss, Pss and private (unshared) memory of a process in KB"""
+    values = {}
+    with open(f'/proc/{pid}/smaps_rollup') as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == 'kB':
+                values[parts[0].rstrip(':')] = int(parts[1])
+    return {
+        'rss': values['Rss'],
+        'pss': values['Pss'],
+        'private': values['Private_Clean'] + values['Private_Dirty'],
+    }
+
+
+def worker_pids(master_pid: int) -> list:
+    with open(f'/proc/{master_pid}/task/{master_pid}/children') as f:
+        return [int(pid) for pid in f.read().split()]
+
+
+def run(label: str, command: list, args) -> None:
+    env = dict(os.environ, PDF_CACHE_ENABLED='0', PDF_RENDER_PROCESSES='0')
+    started = time.perf_counter()
+    server = subprocess.Popen(command, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        ready = wait_ready(started)
+        # Let the remaining workers finish booting before measuring renders
+        time.sleep(2)
+        renders = [render(index) for index in range(1, args.renders + 1)]
+
+        workers = [memory_kb(pid) for pid in worker_pids(server.pid)]
+        master = memory_kb(server.pid)
+    finally:
+        server.terminate()
+        server.wait()
+
+    print(f"{label}:")
+    print(f"  /health answers after  {ready * 1000:7.0f} ms")
+    print(f"  first render           {renders[0]:7.0f} ms, "
+          f"slowest {max(renders):.0f} ms, median {statistics.median(renders):.0f} ms")
+    print(f"  master                 rss {master['rss'] / 1024:6.1f} MB  pss {master['pss'] / 1024:6.1f} MB")
+    for name in ('rss', 'pss', 'private'):
+        print(f"  per worker {name:8s}    {statistics.mean(w[name] for w in workers) / 1024:6.1f} MB")
+    total = master['pss'] + sum(w['pss'] for w in workers)
+    print(f"  total pss              {total / 1024:6.1f} MB ({len(workers)} workers)\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--renders', type=int, default=8)
+    args = parser.parse_args()
+
+    if not sys.platform.startswith('linux'):
+        parser.error('memory figures need /proc (Linux)')
+
+    for label, command in COMMANDS.items():
+        run(label, [part.format(workers=args.workers) for part in command], args)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+"""
+JSON Codec Benchmark - stdlib json vs the fast JSON provider on real payloads
+
+Usage:
+    python -m benchmarks.json_codec [--rounds 50]
+"""
+import argparse
+import base64
+import json
+import statistics
+import time
+
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+
+from app.utils.json_codec import CODEC_NAME, FastJSONProvider
+
+from .pdf_backends import make_large_cv
+from .pdf_multipart import make_photo
+from .sample_data import make_cv
+
+
+def timed(func, rounds: int) -> float:
+    """Median milliseconds per call"""
+    samples = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--rounds', type=int, default=50)
+    args = parser.parse_args()
+
+    photo_cv = make_cv()
+    photo_cv['photo_url'] = 'data:image/jpeg;base64,' + base64.b64encode(make_photo(8)).decode('ascii')
+    parsed_resume = {'success': True, 'data': make_large_cv()}
+    llm_envelope = json.dumps({
+        'id': 'gen-1', 'model': 'openai/gpt-oss-20b:free',
+        'choices': [{'message': {'role': 'assistant', 'content': json.dumps(make_large_cv(), indent=2)}}]
+    })
+
+    app = Flask(__name__)
+    providers = [('json', DefaultJSONProvider(app)), (CODEC_NAME, FastJSONProvider(app))]
+
+    cases = [
+        ('generate_pdf body with photo (decode)', json.dumps(photo_cv).encode('utf-8'),
+         lambda provider, payload: provider.loads(payload)),
+        ('CV JSON request body (decode)', json.dumps(make_large_cv()).encode('utf-8'),
+         lambda provider, payload: provider.loads(payload)),
+        ('parse_resume response (jsonify)', parsed_resume,
+         lambda provider, payload: provider.response(payload)),
+        ('LLM API response (decode x2)', llm_envelope,
+         lambda provider, payload: provider.loads(
+             provider.loads(payload)['choices'][0]['message']['content'])),
+    ]
+
+    with app.app_context():
+        for label, payload, operation in cases:
+            size = len(payload) if isinstance(payload, (str, bytes)) else len(json.dumps(payload))
+            print(f"{label} ({size / 1024:.0f} KB):")
+            baseline = None
+            for name, provider in providers:
+                elapsed = timed(lambda: operation(provider, payload), args.rounds)
+                baseline = baseline or elapsed
+                print(f"  {name:8s} {elapsed:8.3f} ms  ({baseline / elapsed:4.1f}x)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+"""
+Logging Overhead Benchmark - request-thread cost of a log line, print vs the app logger
+
+Times the calls made on the request thread: the old f-string print, a DEBUG
+record dropped at INFO level, and an INFO record written directly or handed
+to the queue handler from app/log.py (text and JSON formats). Output goes to
+os.devnull, so those figures are CPU cost. The last two cases write to a
+stream that takes 1 ms per write, like a full pipe to a log collector.
+
+Usage:
+    python -m benchmarks.logging_overhead [--lines 20000]
+"""
+import argparse
+import contextlib
+import logging
+import os
+import time
+
+from app.log import JSONFormatter, QueueLogHandler, RequestIdFilter, TEXT_FORMAT
+
+
+class SlowStream:
+    """File-like object whose writes take a millisecond"""
+
+    def write(self, text: str) -> None:
+        time.sleep(0.001)
+
+    def flush(self) -> None:
+        pass
+
+
+def time_calls(emit, lines: int) -> float:
+    """Microseconds per call"""
+    started = time.perf_counter()
+    for index in range(lines):
+        emit(index)
+    return (time.perf_counter() - started) / lines * 1e6
+
+
+def make_logger(name: str, handler: logging.Handler, level: int) -> logging.Logger:
+    logger = logging.getLogger(f'benchmark.{name}')
+    logger.handlers = [handler]
+    logger.setLevel(level)
+    logger.propagate = False
+    return logger
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--lines', type=int, default=20000)
+    args = parser.parse_args()
+
+    model = 'openai/gpt-oss-20b:free'
+    with open(os.devnull, 'w') as devnull:
+        def direct(formatter, stream=devnull):
+            handler = logging.StreamHandler(stream)
+            handler.setFormatter(formatter)
+            handler.addFilter(RequestIdFilter())
+            return handler
+
+        def queued(formatter, stream=devnull):
+            handler = QueueLogHandler(direct(formatter, stream), maxsize=args.lines + 1)
+            handler.addFilter(RequestIdFilter())
+            handler.start()
+            return handler
+
+        with contextlib.redirect_stdout(devnull):
+            results = {'print (before)': time_calls(
+                lambda i: print(f"[DEBUG] Calling OpenRouter API with model: {model} #{i}"), args.lines
+            )}
+
+        cases = {
+            'debug at INFO level': (direct(logging.Formatter(TEXT_FORMAT)), logging.INFO, 'debug'),
+            'info, text, direct': (direct(logging.Formatter(TEXT_FORMAT)), logging.INFO, 'info'),
+            'info, text, queued': (queued(logging.Formatter(TEXT_FORMAT)), logging.INFO, 'info'),
+            'info, json, direct': (direct(JSONFormatter()), logging.INFO, 'info'),
+            'info, json, queued': (queued(JSONFormatter()), logging.INFO, 'info'),
+            'slow stream, direct': (direct(JSONFormatter(), SlowStream()), logging.INFO, 'info'),
+            'slow stream, queued': (queued(JSONFormatter(), SlowStream()), logging.INFO, 'info'),
+        }
+        for label, (handler, level, method) in cases.items():
+            log = getattr(make_logger(label, handler, level), method)
+            lines = args.lines // 20 if label.startswith('slow') else args.lines
+            results[label] = time_calls(lambda i: log("Calling OpenRouter API with model %s #%d", model, i),
+                                        lines)
+            if isinstance(handler, QueueLogHandler):
+                # Drains the queue; not part of the request-thread cost
+                handler.stop()
+
+    for label, micros in results.items():
+        print(f"{label:22s} {micros:6.2f} us per line on the request thread")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+"""
+PDF Backend Benchmark - render time, peak memory and page count per renderer
+
+Usage:
+    python -m benchmarks.pdf_backends [--rounds 5]
+"""
+import argparse
+import statistics
+import time
+import tracemalloc
+from io import BytesIO
+
+from pypdf import PdfReader
+
+from app import create_app
+from app.services import pdf_service
+
+from .pdf_optimize import make_photo_url
+from .sample_data import make_cv
+
+
+def make_large_cv() -> dict:
+    """A multi-page CV: every repeatable section three times as long"""
+    cv = make_cv()
+    for field in ('internships', 'projects', 'certifications', 'achievements'):
+        cv[field] = cv[field] * 3
+    return cv
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--rounds', type=int, default=5)
+    args = parser.parse_args()
+
+    with_photo = make_cv()
+    with_photo['photo_url'] = make_photo_url()
+    cases = [('Typical CV', make_cv()), ('CV with photo', with_photo), ('Large CV', make_large_cv())]
+
+    app = create_app()
+    with app.app_context():
+        for label, cv in cases:
+            print(f"{label}:")
+            processed = pdf_service._prepare_data(cv)
+            for name, backend in sorted(pdf_service.backends.items()):
+                render_ms = []
+                for _ in range(args.rounds):
+                    started = time.perf_counter()
+                    render_func, render_args = backend.build_task(processed)
+                    pdf_bytes = render_func(*render_args)
+                    render_ms.append((time.perf_counter() - started) * 1000)
+
+                # Separate traced render, tracemalloc slows allocation-heavy code
+                tracemalloc.start()
+                render_func, render_args = backend.build_task(processed)
+                render_func(*render_args)
+                peak = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+
+                pages = len(PdfReader(BytesIO(pdf_bytes)).pages)
+                print(f"  {name:10s} {statistics.median(render_ms):8.1f} ms  "
+                      f"peak {peak / 1024 / 1024:6.1f} MiB  "
+                      f"{pages} page(s)  {len(pdf_bytes):8d} bytes")
+
+
+if __name__ == '__main__':
+    main()
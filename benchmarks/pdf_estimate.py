@@ -0,0 +1,84 @@
+"""
+PDF Estimate Benchmark - estimator accuracy and cost against real renders
+
+Usage:
+    python -m benchmarks.pdf_estimate [--cvs 12] [--seed 1]
+"""
+import argparse
+import random
+import statistics
+import time
+from io import BytesIO
+
+from pypdf import PdfReader
+
+from app import create_app
+from app.services import pdf_service
+from app.services.pdf_estimator import estimate_cv
+from app.services.render_pool import html_to_pdf
+
+from .sample_data import make_cv
+
+WORDS = ('built', 'designed', 'scalable', 'REST', 'APIs', 'reduced', 'latency', 'by', '35%',
+         'using', 'React', 'Flask', 'PostgreSQL', 'Docker', 'pipelines', 'for', 'the', 'team',
+         'automated', 'testing', 'deployment', 'dashboards', 'serving', 'daily', 'users')
+
+
+def make_random_cv(rng: random.Random, index: int) -> dict:
+    """A CV with a random number and length of entries and bullets"""
+    def sentence(low, high):
+        return ' '.join(rng.choice(WORDS) for _ in range(rng.randint(low, high))).capitalize()
+
+    def bullets():
+        return [sentence(6, 40) for _ in range(rng.randint(1, 8))]
+
+    cv = make_cv(index)
+    cv['professional_summary'] = sentence(20, 120)
+    cv['projects'] = [{'name': f'Project {i}', 'role': 'Developer', 'tech': sentence(3, 10),
+                       'bullets': bullets(), 'link': f'github.com/jane/project-{i}'}
+                      for i in range(rng.randint(1, 8))]
+    cv['internships'] = [{'company': f'Company {i}', 'role': 'Intern', 'duration': '2024',
+                          'bullets': bullets()} for i in range(rng.randint(0, 5))]
+    cv['achievements'] = [sentence(5, 25) for _ in range(rng.randint(0, 10))]
+    return cv
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--cvs', type=int, default=12)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    cvs = [make_cv()] + [make_random_cv(rng, index) for index in range(1, args.cvs)]
+
+    app = create_app()
+    with app.app_context():
+        html_to_pdf(pdf_service.build_html(cvs[0]))  # warm up
+
+        print(f"{'est pages':>9} {'pages':>6} {'est ms':>7} {'ms':>7} {'lines':>6} {'blocks':>6}")
+        estimate_ms, page_errors, time_errors = [], [], []
+        for cv in cvs:
+            started = time.perf_counter()
+            estimate = estimate_cv(cv)
+            estimate_ms.append((time.perf_counter() - started) * 1000)
+
+            started = time.perf_counter()
+            pdf_bytes = html_to_pdf(pdf_service.build_html(cv))
+            render_ms = (time.perf_counter() - started) * 1000
+            pages = len(PdfReader(BytesIO(pdf_bytes)).pages)
+
+            page_errors.append(estimate['pages'] - pages)
+            time_errors.append(abs(estimate['render_ms'] - render_ms) / render_ms)
+            print(f"{estimate['pages']:9d} {pages:6d} {estimate['render_ms']:7d} {render_ms:7.0f} "
+                  f"{estimate['lines']:6d} {estimate['blocks']:6d}")
+
+    exact = sum(1 for error in page_errors if error == 0)
+    print(f"\nPage count exact for {exact}/{len(cvs)} CVs, "
+          f"within one page for {sum(1 for error in page_errors if abs(error) <= 1)}/{len(cvs)}")
+    print(f"Median render time error {statistics.median(time_errors):.0%}")
+    print(f"Estimator cost {statistics.median(estimate_ms):.2f} ms per CV")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+"""
+PDF Multipart Benchmark - JSON data URL photo vs binary multipart photo part
+
+Usage:
+    python -m benchmarks.pdf_multipart [--requests 20] [--megapixels 8]
+"""
+import argparse
+import base64
+import json
+import os
+import statistics
+import time
+from io import BytesIO
+
+from app import create_app
+from app.services import pdf_service
+
+from .sample_data import make_cv
+
+
+def make_photo(megapixels: float) -> bytes:
+    """A phone-camera sized JPEG: detailed enough that it stays large"""
+    from PIL import Image
+
+    width = int((megapixels * 1e6 * 3 / 4) ** 0.5)
+    height = width * 4 // 3
+    noise = Image.frombytes('RGB', (width // 8, height // 8), os.urandom(width // 8 * height // 8 * 3))
+    buffer = BytesIO()
+    noise.resize((width, height)).save(buffer, format='JPEG', quality=90)
+    return buffer.getvalue()
+
+
+def run(client, label: str, make_request, body_bytes: int, requests: int) -> None:
+    """Post the same CV repeatedly and report median latency and throughput"""
+    elapsed = []
+    for _ in range(requests):
+        kwargs = make_request()
+        started = time.perf_counter()
+        response = client.post('/api/generate_pdf', **kwargs)
+        elapsed.append((time.perf_counter() - started) * 1000)
+        assert response.status_code == 200, response.data[:200]
+
+    median = statistics.median(elapsed)
+    print(f"  {label:28s} median {median:7.1f} ms  {1000 / median:6.1f} req/s  "
+          f"body {body_bytes / 1024:6.0f} KB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--requests', type=int, default=20)
+    parser.add_argument('--megapixels', type=float, default=8)
+    args = parser.parse_args()
+
+    photo = make_photo(args.megapixels)
+    cv = make_cv()
+    json_cv = dict(cv, photo_url='data:image/jpeg;base64,' + base64.b64encode(photo).decode('ascii'))
+    json_body = json.dumps(json_cv).encode('utf-8')
+    form_cv = json.dumps(cv)
+    multipart_bytes = len(photo) + len(form_cv)
+
+    def json_request():
+        return {'data': json_body, 'content_type': 'application/json'}
+
+    def multipart_request():
+        return {'data': {'cv_data': form_cv, 'photo': (BytesIO(photo), 'photo.jpg')},
+                'content_type': 'multipart/form-data'}
+
+    print(f"Photo: {len(photo) / 1024:.0f} KB JPEG ({args.megapixels} MP)")
+    app = create_app()
+    client = app.test_client()
+
+    # Cached renders: what is left is request parsing, hashing and preprocessing
+    print("PDF cache hit (request overhead only):")
+    run(client, 'JSON + base64 data URL', json_request, len(json_body), args.requests)
+    run(client, 'multipart + binary photo', multipart_request, multipart_bytes, args.requests)
+
+    # Uncached renders, with the fast backend so the overhead stays visible
+    print("Uncached renders (reportlab backend):")
+    pdf_service.cache = None
+    app.config['PDF_BACKEND'] = 'reportlab'
+    run(client, 'JSON + base64 data URL', json_request, len(json_body), max(1, args.requests // 4))
+    run(client, 'multipart + binary photo', multipart_request, multipart_bytes, max(1, args.requests // 4))
+
+
+if __name__ == '__main__':
+    main()
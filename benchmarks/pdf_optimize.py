@@ -0,0 +1,61 @@
+"""
+PDF Optimization Benchmark - size and time of the optional post-render pass
+
+Usage:
+    python -m benchmarks.pdf_optimize [--rounds 5]
+"""
+import argparse
+import base64
+import os
+import statistics
+import time
+from io import BytesIO
+
+from app import create_app
+from app.services import pdf_service
+from app.services.pdf_optimizer import optimize_pdf
+from app.services.render_pool import html_to_pdf
+
+from .sample_data import make_cv
+
+
+def make_photo_url() -> str:
+    """A camera-like photo: detailed enough that JPEG cannot flatten it"""
+    from PIL import Image
+
+    image = Image.frombytes('RGB', (120, 150), os.urandom(120 * 150 * 3)).resize((1200, 1500))
+    buffer = BytesIO()
+    image.save(buffer, format='JPEG', quality=90)
+    return 'data:image/jpeg;base64,' + base64.b64encode(buffer.getvalue()).decode('ascii')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--rounds', type=int, default=5)
+    args = parser.parse_args()
+
+    with_photo = make_cv()
+    with_photo['photo_url'] = make_photo_url()
+    cases = [('CV without photo', make_cv()), ('CV with photo', with_photo)]
+
+    app = create_app()
+    with app.app_context():
+        for label, cv in cases:
+            html_content = pdf_service.build_html(cv)
+            render_ms, optimize_ms = [], []
+            for _ in range(args.rounds):
+                started = time.perf_counter()
+                pdf_bytes = html_to_pdf(html_content)
+                render_ms.append((time.perf_counter() - started) * 1000)
+                optimized, stats = optimize_pdf(pdf_bytes)
+                optimize_ms.append(stats['elapsed_ms'])
+
+            saved = 1 - stats['optimized_size'] / stats['original_size']
+            print(f"{label}:")
+            print(f"  render   {statistics.median(render_ms):8.1f} ms")
+            print(f"  optimize {statistics.median(optimize_ms):8.1f} ms")
+            print(f"  size     {stats['original_size']:8d} -> {stats['optimized_size']} bytes (-{saved:.1%})")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+"""
+PDF Render Pool Benchmark - request-thread rendering vs warm process pool
+
+Renders unique CVs from several client threads and reports throughput.
+Process-pool throughput should scale with cores up to --processes.
+
+Usage:
+    python -m benchmarks.pdf_render_pool [--renders 24] [--threads 4] [--processes 4]
+"""
+import argparse
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from app import create_app
+from app.services.pdf_service import PDFService
+from app.services.render_pool import RenderPool
+
+from .sample_data import make_cv
+
+
+def run(app, service: PDFService, renders: int, threads: int) -> float:
+    """Render `renders` unique CVs from `threads` threads; return renders/second"""
+    def render_one(index):
+        with app.app_context():
+            pdf_buffer, result = service.generate(make_cv(index))
+            assert pdf_buffer is not None, result
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        list(executor.map(render_one, range(1, renders + 1)))
+    return renders / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--renders', type=int, default=24)
+    parser.add_argument('--threads', type=int, default=4)
+    parser.add_argument('--processes', type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    app = create_app()
+    print(f"{args.renders} renders from {args.threads} threads, {os.cpu_count()} CPUs")
+
+    inline = PDFService()
+    inline.cache = None
+    inline.render_pool = None
+    print(f"request thread        {run(app, inline, args.renders, args.threads):6.2f} renders/s")
+
+    pooled = PDFService()
+    pooled.cache = None
+    pooled.render_pool = RenderPool(processes=args.processes, max_pending=args.threads)
+    start = time.perf_counter()
+    pooled.start_render_pool()
+    print(f"pool start-up         {(time.perf_counter() - start) * 1000:6.0f} ms ({args.processes} processes)")
+    try:
+        print(f"process pool          {run(app, pooled, args.renders, args.threads):6.2f} renders/s")
+    finally:
+        pooled.render_pool.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+"""
+Warm PDF State Benchmark - per-render cost with and without the parsed-CSS cache
+
+Usage:
+    python -m benchmarks.pdf_warm_state [--rounds 10]
+"""
+import argparse
+import re
+import time
+
+from xhtml2pdf.context import pisaContext
+
+from app import create_app
+from app.services import css_cache
+from app.services.pdf_service import PDFService
+
+from .sample_data import make_cv
+
+
+_VOLATILE_RE = re.compile(rb'/(CreationDate|ModDate) \([^)]*\)|/ID\s*\[[^\]]*\]')
+
+
+def render_all(app, service: PDFService, rounds: int) -> tuple[float, list]:
+    """Render `rounds` unique CVs; return (mean ms, normalized PDF bytes)"""
+    outputs = []
+    with app.app_context():
+        start = time.perf_counter()
+        for index in range(1, rounds + 1):
+            pdf_buffer, result = service.generate(make_cv(index))
+            assert pdf_buffer is not None, result
+            outputs.append(_VOLATILE_RE.sub(b'', pdf_buffer.getvalue()))
+    return (time.perf_counter() - start) / rounds * 1000, outputs
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--rounds', type=int, default=10)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    app = create_app()
+    print(f"create_app with warm-up: {(time.perf_counter() - start) * 1000:.0f} ms")
+
+    service = PDFService()
+    service.cache = None
+    service.render_pool = None
+
+    pisaContext.parseCSS = css_cache._original_parse_css
+    cold, cold_outputs = render_all(app, service, args.rounds)
+    css_cache.install_css_cache()
+    warm, warm_outputs = render_all(app, service, args.rounds)
+
+    print(f"parse CSS every render  {cold:7.0f} ms/render")
+    print(f"cached, indexed CSS     {warm:7.0f} ms/render  ({(1 - warm / cold) * 100:.0f}% faster)")
+    print(f"identical PDFs: {cold_outputs == warm_outputs}")
+
+
+if __name__ == '__main__':
+    main()
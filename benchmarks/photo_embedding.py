@@ -0,0 +1,73 @@
+"""
+Photo Embedding Benchmark - original phone photo vs normalized photo in the PDF
+
+Usage:
+    python -m benchmarks.photo_embedding [--width 4000] [--height 3000]
+"""
+import argparse
+import base64
+import importlib
+import os
+import time
+from io import BytesIO
+
+from PIL import Image
+
+from app import create_app
+from app.services.pdf_service import PDFService
+from app.services.photo_service import PhotoService
+
+from .sample_data import make_cv
+
+
+def build_phone_photo(width: int, height: int) -> str:
+    """Build a noisy JPEG with EXIF orientation, as a data URL"""
+    image = Image.frombytes('RGB', (width, height), os.urandom(width * height * 3))
+    exif = Image.Exif()
+    exif[0x0112] = 6  # Orientation: rotate 90 CW
+    buffer = BytesIO()
+    image.save(buffer, format='JPEG', quality=92, exif=exif)
+    return f"data:image/jpeg;base64,{base64.b64encode(buffer.getvalue()).decode('ascii')}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--width', type=int, default=4000)
+    parser.add_argument('--height', type=int, default=3000)
+    args = parser.parse_args()
+
+    app = create_app()
+    photo_url = build_phone_photo(args.width, args.height)
+    print(f"Photo: {args.width}x{args.height} JPEG, {len(photo_url) * 3 / 4 / 1024 / 1024:.1f} MB")
+
+    photos = PhotoService()
+    start = time.perf_counter()
+    normalized = photos.normalize_data_url(photo_url)
+    first = (time.perf_counter() - start) * 1000
+    start = time.perf_counter()
+    photos.normalize_data_url(photo_url)
+    cached = (time.perf_counter() - start) * 1000
+    print(f"normalize: {first:.0f} ms first, {cached:.1f} ms cached, "
+          f"{len(normalized) * 3 / 4 / 1024:.0f} KB at {photos.size[0]}x{photos.size[1]}")
+
+    # The package re-exports the pdf_service singleton under the module's name
+    pdf_service_module = importlib.import_module('app.services.pdf_service')
+    embed_original = PhotoService()
+    embed_original.normalize_data_url = lambda data_url: None
+
+    for label, photo_service in [('original photo', embed_original), ('normalized photo', photos)]:
+        pdf_service_module.photo_service = photo_service
+        service = PDFService()
+        service.cache = None
+        service.render_pool = None
+        cv = make_cv()
+        cv['photo_url'] = photo_url
+        with app.app_context():
+            start = time.perf_counter()
+            pdf_buffer, _ = service.generate(cv)
+            elapsed = (time.perf_counter() - start) * 1000
+        print(f"{label:<18} render {elapsed:7.0f} ms  PDF {len(pdf_buffer.getvalue()) / 1024:8.0f} KB")
+
+
+if __name__ == '__main__':
+    main()
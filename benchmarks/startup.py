@@ -0,0 +1,83 @@
+"""
+Startup Benchmark - import time of the app on paths that never render a PDF, and of the gunicorn master
+
+Runs each scenario in a fresh interpreter under `python -X importtime`, with
+the environment's settings (PDF_WARM_UP defaults on), and reports the median
+import time, wall time and module count. Fails (exit 1) when a scenario that
+should stay lazy loads one of the heavy PDF/HTTP dependencies, which are
+meant to load on first use, or exceeds --max-ms. The preloading gunicorn
+master is reported for comparison: it warms up, so it loads them by design.
+
+Usage:
+    python -m benchmarks.startup [--rounds 5] [--max-ms 0]
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+
+# Loaded lazily on first render, first LLM call or first photo upload
+HEAVY_MODULES = ('xhtml2pdf', 'reportlab.platypus', 'reportlab.pdfbase.pdfmetrics', 'html5lib',
+                 'PIL', 'pypdf', 'PyPDF2', 'docx', 'requests', 'fontTools')
+
+# label: (code, whether heavy modules must stay unloaded)
+SCENARIOS = {
+    'import app.services': ('import app.services', True),
+    'create_app()': ('from app import create_app\ncreate_app()', True),
+    'GET /health': ('from app import create_app\ncreate_app().test_client().get("/health")', True),
+    'gunicorn master': ('from app import create_app\ncreate_app(preload=True)', False),
+}
+
+WALL_TIME = 'import time\n_started = time.perf_counter()\n{code}\nprint((time.perf_counter() - _started) * 1000)'
+
+
+def run(code: str) -> dict:
+    """Run code in a fresh interpreter; return import ms, wall ms and imported module names"""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', WALL_TIME.format(code=code)],
+        capture_output=True, text=True, check=True
+    )
+
+    total_us = 0
+    modules = set()
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        modules.add(name.strip())
+        if not name[1:].startswith(' '):
+            # Top-level import: its cumulative time includes everything below it
+            total_us += int(cumulative)
+
+    wall_ms = float(result.stdout.strip().splitlines()[-1])
+    return {'import_ms': total_us / 1000, 'wall_ms': wall_ms, 'modules': modules}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--rounds', type=int, default=5)
+    parser.add_argument('--max-ms', type=float, default=0,
+                        help='Fail when a scenario imports for longer (0 disables)')
+    args = parser.parse_args()
+
+    failed = False
+    for label, (code, lazy) in SCENARIOS.items():
+        runs = [run(code) for _ in range(args.rounds)]
+        import_ms = statistics.median(r['import_ms'] for r in runs)
+        wall_ms = statistics.median(r['wall_ms'] for r in runs)
+        heavy = sorted(name for name in HEAVY_MODULES if name in runs[0]['modules'])
+
+        print(f"{label:22s} imports {import_ms:6.0f} ms  wall {wall_ms:6.0f} ms  "
+              f"{len(runs[0]['modules']):5d} modules")
+        if heavy and lazy:
+            print(f"  loads heavy modules: {', '.join(heavy)}")
+            failed = True
+        if lazy and args.max_ms and import_ms > args.max_ms:
+            print(f"  over the {args.max_ms:.0f} ms budget")
+            failed = True
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
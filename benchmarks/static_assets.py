@@ -0,0 +1,86 @@
+"""
+Static Assets Benchmark - first-load requests and bytes of the main page, source files vs built bundles
+
+Follows what a browser fetches for / (stylesheets, scripts, icons, CSS
+@imports and the Font Awesome fonts) through the test client and adds up
+wire bytes with Accept-Encoding: br, gzip. Every local woff2 referenced
+from the CSS is counted, which is an upper bound: browsers only fetch a
+font when a glyph of it is on screen.
+
+Usage:
+    python -m benchmarks.static_assets
+"""
+import argparse
+import re
+import tempfile
+from urllib.parse import urljoin
+
+from app import create_app
+from app.assets import AssetBuilder
+
+PAGE_ASSET = re.compile(r'<(?:link|script)[^>]+(?:href|src)="(/(?:static|assets)/[^"]+)"')
+CSS_IMPORT = re.compile(r'@import\s+(?:url\()?\s*[\'"]?([^\'")\s]+)')
+CSS_FONT = re.compile(r'url\(\s*[\'"]?([^\'")]+\.woff2)')
+
+
+def crawl(client) -> list:
+    """Fetch the page and its local assets, returning (path, response) pairs"""
+    headers = {'Accept-Encoding': 'br, gzip'}
+    fetched = [('/', client.get('/', headers=headers))]
+    html = client.get('/', headers={'Accept-Encoding': 'identity'}).get_data(as_text=True)
+    queue = PAGE_ASSET.findall(html)
+    seen = set()
+
+    while queue:
+        path = queue.pop(0)
+        if path in seen or not path.startswith('/'):
+            continue
+        seen.add(path)
+        response = client.get(path, headers=headers)
+        fetched.append((path, response))
+        if response.status_code == 200 and response.mimetype == 'text/css':
+            css = client.get(path, headers={'Accept-Encoding': 'identity'}).get_data(as_text=True)
+            queue += [urljoin(path, target) for target in CSS_IMPORT.findall(css) + CSS_FONT.findall(css)]
+    return fetched
+
+
+def report(label: str, fetched: list) -> None:
+    found = [(path, response) for path, response in fetched if response.status_code == 200]
+    wire = sum(len(response.data) for _, response in found)
+    revalidated = [path for path, response in found if not response.cache_control.max_age]
+
+    print(f"{label}:")
+    for path, response in found:
+        print(f"  {path[:56]:56s} {response.headers.get('Content-Encoding', '-'):5s} "
+              f"{len(response.data) / 1024:7.1f} KB  {response.headers.get('Cache-Control', '')}")
+    print(f"  {len(found)} requests, {wire / 1024:.1f} KB on the wire; "
+          f"repeat visit revalidates {len(revalidated)} of them\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.parse_args()
+
+    app = create_app()
+    client = app.test_client()
+    assets = app.extensions['assets']
+
+    assets.bundled = False
+    report('Source files', crawl(client))
+
+    with tempfile.TemporaryDirectory() as dist_dir:
+        template_folder = app.jinja_loader.searchpath[0]
+        manifest = AssetBuilder(app.static_folder, template_folder, dist_dir).build()
+        assets.bundled = True
+        assets.dist_dir = dist_dir
+        report('Built bundles', crawl(client))
+
+        print("Build output:")
+        for filename, sizes in sorted(manifest['files'].items()):
+            compressed = '  '.join(f"{encoding} {sizes[encoding] / 1024:6.1f} KB"
+                                   for encoding in ('gzip', 'br') if sizes.get(encoding))
+            print(f"  {filename:40s} {sizes['size'] / 1024:7.1f} KB  {compressed}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,51 @@
+"""
+Gunicorn settings - one warmed-up app in the master, shared by forked workers
+Run with: gunicorn -c gunicorn.conf.py
+"""
+import gc
+import os
+import tempfile
+
+# create_app runs once in the master (imports, templates, CSS, fonts and a
+# dummy render, see app/warmup.py); workers inherit it copy-on-write
+wsgi_app = 'app:create_app(preload=True)'
+preload_app = True
+
+bind = f"0.0.0.0:{os.getenv('PORT', '5000')}"
+workers = int(os.getenv('WEB_CONCURRENCY', 4))
+
+# Workers and their render processes write metric samples to one file each;
+# /metrics sums the files, so any worker reports for all of them (app/metrics.py).
+# Set before the app (and prometheus_client) is imported.
+os.environ.setdefault('PROMETHEUS_MULTIPROC_DIR', os.path.join(tempfile.gettempdir(), 'dreamcv-metrics'))
+os.makedirs(os.environ['PROMETHEUS_MULTIPROC_DIR'], exist_ok=True)
+
+
+def on_starting(server):
+    """Drop metric files of earlier runs and of the master's warm-up renders"""
+    directory = os.environ['PROMETHEUS_MULTIPROC_DIR']
+    for name in os.listdir(directory):
+        if name.endswith('.db'):
+            os.remove(os.path.join(directory, name))
+
+
+def pre_fork(server, worker):
+    """Freeze the warmed-up objects so worker GC passes do not copy their pages"""
+    gc.freeze()
+
+
+def post_fork(server, worker):
+    """Start this worker's log writer thread, PDF render pool and forkserver after the fork"""
+    from app.log import start_log_listener
+    from app.services import pdf_service
+    start_log_listener()
+    pdf_service.start_render_pool()
+
+
+def child_exit(server, worker):
+    """Stop counting a dead worker in the in-flight gauges"""
+    try:
+        from prometheus_client import multiprocess
+    except ImportError:
+        return
+    multiprocess.mark_process_dead(worker.pid)
@@ -0,0 +1,17 @@
+"""
+Shared fixtures - an app built from TestingConfig and its test client
+"""
+import pytest
+
+from app import create_app
+from app.config import TestingConfig
+
+
+@pytest.fixture
+def app():
+    return create_app(TestingConfig)
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
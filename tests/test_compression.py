@@ -0,0 +1,14 @@
+"""
+Compression - runs after the other after_request hooks, so the compressed
+response still carries their headers
+"""
+
+
+def test_compressed_response_keeps_hook_headers(app, client):
+    response = client.get('/', headers={'Accept-Encoding': 'gzip'})
+
+    assert response.status_code == 200
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert 'Server-Timing' in response.headers
+    assert 'X-Request-ID' in response.headers
+    assert app.after_request_funcs[None][0] is app.extensions['compression']
@@ -0,0 +1,25 @@
+"""
+DOCX extraction - header and footer parts are read in their numbered order
+"""
+import zipfile
+from io import BytesIO
+
+from app.utils.file_handlers import _extract_from_docx_xml
+
+
+def _part(text: str) -> str:
+    return ('<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+            f'<w:body><w:p><w:r><w:t>{text}</w:t></w:r></w:p></w:body></w:document>')
+
+
+def test_reads_headers_and_footers_in_number_order():
+    buffer = BytesIO()
+    with zipfile.ZipFile(buffer, 'w') as archive:
+        archive.writestr('word/document.xml', _part('Body'))
+        for number in (10, 2, 1):
+            archive.writestr(f'word/header{number}.xml', _part(f'Header {number}'))
+            archive.writestr(f'word/footer{number}.xml', _part(f'Footer {number}'))
+
+    assert _extract_from_docx_xml(buffer.getvalue()).split('\n') == [
+        'Header 1', 'Header 2', 'Header 10', 'Body', 'Footer 1', 'Footer 2', 'Footer 10'
+    ]
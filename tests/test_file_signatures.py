@@ -0,0 +1,19 @@
+"""
+inspect_upload - rejections are counted per reason in the Prometheus registry
+"""
+from prometheus_client import REGISTRY
+
+from app.utils.file_signatures import inspect_upload
+
+
+def _rejections(reason: str) -> float:
+    return REGISTRY.get_sample_value('dreamcv_upload_rejections_total', {'reason': reason}) or 0.0
+
+
+def test_counts_rejections_by_reason():
+    before = _rejections('image_as_resume')
+
+    file_type, reason = inspect_upload(b'\x89PNG\r\n\x1a\n' + b'\x00' * 32, 'resume')
+
+    assert (file_type, reason) == (None, 'image_as_resume')
+    assert _rejections('image_as_resume') == before + 1
@@ -0,0 +1,28 @@
+"""
+validate_cv_data - rejects malformed CV data with a message instead of raising
+"""
+import pytest
+
+from app.utils.helpers import validate_cv_data
+
+
+@pytest.mark.parametrize('personal_info', ['jane@example.com', ['jane@example.com'], None, 42])
+def test_rejects_personal_info_that_is_not_an_object(personal_info):
+    assert validate_cv_data({'personal_info': personal_info}) == 'Invalid CV data format'
+
+
+def test_checks_email_inside_personal_info():
+    assert validate_cv_data({'personal_info': {'email': 'jane.example.com'}}) == 'Invalid email format'
+    assert validate_cv_data({'personal_info': {'email': 'jane@example.com'}}) is None
+
+
+def test_accepts_cv_without_personal_info():
+    assert validate_cv_data({'name': 'Jane Doe', 'email': 'jane@example.com'}) is None
+
+
+@pytest.mark.parametrize('path', ['/api/generate_pdf', '/api/preview_html', '/api/pdf/jobs'])
+def test_pdf_routes_reject_personal_info_string(client, path):
+    response = client.post(path, json={'name': 'Jane Doe', 'personal_info': 'jane@example.com'})
+
+    assert response.status_code == 400
+    assert response.get_json() == {'success': False, 'error': 'Invalid CV data format'}
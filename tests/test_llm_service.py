@@ -0,0 +1,47 @@
+"""
+LLMService.call - failures of the OpenRouter API return None
+"""
+from unittest import mock
+
+import requests
+
+from app.services import llm_service
+from app.services.llm_service import LLMService
+
+
+def _response(status: int, body: bytes) -> requests.Response:
+    response = requests.Response()
+    response.status_code = status
+    response._content = body
+    return response
+
+
+def _service() -> LLMService:
+    service = LLMService()
+    service.api_key = 'test-key'
+    return service
+
+
+def test_call_returns_message_content():
+    body = b'{"choices": [{"message": {"content": "Formatted"}}]}'
+    with mock.patch('requests.post', return_value=_response(200, body)):
+        assert _service().call('prompt') == 'Formatted'
+
+
+def test_call_returns_none_for_non_json_body():
+    with mock.patch('requests.post', return_value=_response(200, b'<html>Bad gateway</html>')):
+        assert _service().call('prompt') is None
+
+
+def test_call_returns_none_for_truncated_body():
+    with mock.patch('requests.post', return_value=_response(200, b'{"choices": [{"mess')):
+        assert _service().call('prompt') is None
+
+
+def test_format_section_keeps_content_for_non_json_body(client):
+    with mock.patch.object(llm_service, 'api_key', 'test-key'), \
+            mock.patch('requests.post', return_value=_response(200, b'<html>Bad gateway</html>')):
+        response = client.post('/api/format_section', json={'section': 'Skills', 'content': 'python'})
+
+    assert response.status_code == 200
+    assert response.get_json() == {'success': True, 'formatted': 'python'}
@@ -0,0 +1,63 @@
+"""
+PDF backends - every backend renders what the default xhtml2pdf backend renders
+"""
+from io import BytesIO
+
+import pytest
+from pypdf import PdfReader
+
+from app.services import pdf_service
+from benchmarks.pdf_backends import make_large_cv
+from benchmarks.pdf_optimize import make_photo_url
+from benchmarks.sample_data import make_cv
+
+
+def _with_photo() -> dict:
+    cv = make_cv()
+    cv['photo_url'] = make_photo_url()
+    return cv
+
+
+def _render(backend: str, processed: dict) -> PdfReader:
+    render_func, render_args = pdf_service.backends[backend].build_task(processed)
+    return PdfReader(BytesIO(render_func(*render_args)))
+
+
+# The CVs benchmarks/pdf_backends.py compares the backends on
+@pytest.mark.parametrize('make', [make_cv, _with_photo, make_large_cv], ids=['typical', 'photo', 'large'])
+def test_reportlab_matches_xhtml2pdf_page_count(app, make):
+    with app.app_context():
+        processed = pdf_service._prepare_data(make())
+        reportlab = _render('reportlab', processed)
+        xhtml2pdf = _render('xhtml2pdf', processed)
+
+    assert len(reportlab.pages) == len(xhtml2pdf.pages)
+    assert 'Jane Student' in reportlab.pages[0].extract_text()
+
+
+def _long_field(field: str, value: str) -> dict:
+    cv = make_cv()
+    if field == 'duration':
+        cv['projects'][0]['duration'] = value
+    else:
+        cv[field] = value
+    return cv
+
+
+# Each value is taller than a page in the cell it is laid out in
+LONG_FIELDS = [
+    ('prog_languages', 'Python, ' * 800),
+    ('duration', '2024 ' * 300),
+    ('full_name', 'Jane ' * 800),
+    ('target_technology', 'Cloud ' * 900),
+    ('leetcode', 'leetcode ' * 1500),
+]
+
+
+@pytest.mark.parametrize('backend', ['xhtml2pdf', 'reportlab'])
+@pytest.mark.parametrize('field, value', LONG_FIELDS, ids=[field for field, _ in LONG_FIELDS])
+def test_renders_fields_taller_than_a_page(client, backend, field, value):
+    response = client.post(f'/api/generate_pdf?backend={backend}', json=_long_field(field, value))
+
+    assert response.status_code == 200
+    assert response.mimetype == 'application/pdf'
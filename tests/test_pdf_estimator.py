@@ -0,0 +1,60 @@
+"""
+PDF budget - trimming shortens the sections causing the overflow, and the
+budget applies to queued jobs as well as direct renders
+"""
+import time
+
+from app.services.pdf_estimator import apply_budget, estimate_cv, trim_cv
+from benchmarks.sample_data import make_cv
+
+
+def _long_projects_cv() -> dict:
+    cv = make_cv()
+    cv['projects'] = [{'name': f'Project {i}', 'tech': 'Python',
+                       'bullets': ['Long bullet point text ' * 10] * 6} for i in range(6)]
+    return cv
+
+
+def test_trim_shortens_the_tallest_section_first():
+    cv = _long_projects_cv()
+    assert estimate_cv(cv)['pages'] > 2
+
+    trimmed, estimate, reason, notes = apply_budget(cv, 2, 0, 'trim')
+
+    assert estimate['pages'] <= 2 and reason is None
+    assert notes and all(note.startswith('projects') for note in notes)
+    assert trimmed['internships'] == cv['internships']
+    assert trimmed['achievements'] == cv['achievements']
+    assert len(cv['projects'][0]['bullets']) == 6  # the posted data is left alone
+
+
+def test_trim_is_linear_in_the_number_of_bullets():
+    cv = make_cv()
+    cv['projects'] = [{'name': 'Project', 'tech': 'Python',
+                       'bullets': ['Long bullet point text ' * 5] * 5000}]
+
+    started = time.perf_counter()
+    trimmed, estimate, notes = trim_cv(cv, 2, 0)
+
+    assert time.perf_counter() - started < 2
+    assert estimate['pages'] <= 2
+    assert notes == [f"projects bullets: {5000 - len(trimmed['projects'][0]['bullets'])} removed"]
+
+
+def test_reject_and_warn_leave_the_cv_untouched():
+    cv = _long_projects_cv()
+
+    rejected, _, reason, _ = apply_budget(cv, 2, 0, 'reject')
+    assert rejected is None and 'page limit' in reason
+
+    kept, _, reason, notes = apply_budget(cv, 2, 0, 'warn')
+    assert kept is cv and reason and notes == []
+
+
+def test_pdf_jobs_reject_cv_over_budget(app, client):
+    app.config.update(PDF_MAX_PAGES=2, PDF_BUDGET_ACTION='reject')
+
+    response = client.post('/api/pdf/jobs', json=_long_projects_cv())
+
+    assert response.status_code == 413
+    assert response.get_json()['success'] is False
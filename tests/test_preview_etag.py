@@ -0,0 +1,20 @@
+"""
+ETags - the HTML preview and the PDF of the same CV never share a validator
+"""
+from benchmarks.sample_data import make_cv
+
+
+def test_preview_etag_differs_from_pdf_etag(client):
+    cv = make_cv()
+
+    preview = client.post('/api/preview_html', json=cv)
+    pdf = client.post('/api/generate_pdf', json=cv)
+
+    assert preview.status_code == pdf.status_code == 200
+    assert preview.headers['ETag'] != pdf.headers['ETag']
+
+    # Each validator only matches its own representation
+    assert client.post('/api/preview_html', json=cv,
+                       headers={'If-None-Match': preview.headers['ETag']}).status_code == 304
+    assert client.post('/api/generate_pdf', json=cv,
+                       headers={'If-None-Match': preview.headers['ETag']}).status_code == 200